@@ -0,0 +1,58 @@
+import asyncio
+import importlib.util
+import os
+import ssl
+import statistics
+import time
+
+import pytest
+
+CERTIFICATE = os.path.join(os.path.dirname(__file__), "..", "tests", "ksenia_lares", "panel.pem")
+
+
+if importlib.util.find_spec("pytest_benchmark") is None:
+
+    class _Benchmark:
+        """Stand-in for the pytest-benchmark fixture, timing with `time.perf_counter`."""
+
+        def __init__(self, name):
+            self.name = name
+
+        def __call__(self, function, *args, **kwargs):
+            return self.pedantic(function, args, kwargs, rounds=20)
+
+        def pedantic(self, function, args=(), kwargs=None, setup=None, rounds=1, iterations=1, warmup_rounds=0):
+            kwargs = kwargs or {}
+            for _ in range(warmup_rounds):
+                function(*args, **kwargs)
+
+            timings = []
+            for _ in range(rounds):
+                if setup is not None:
+                    args, kwargs = setup() or (args, kwargs)
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    result = function(*args, **kwargs)
+                timings.append((time.perf_counter() - start) / iterations)
+
+            print(f"\n{self.name}: min {min(timings) * 1e6:.1f}us median {statistics.median(timings) * 1e6:.1f}us")
+            return result
+
+    @pytest.fixture
+    def benchmark(request):
+        return _Benchmark(request.node.name)
+
+
+@pytest.fixture(scope="module")
+def run():
+    """Run coroutines to completion on a loop kept for the whole module."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def server_ssl_context():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(CERTIFICATE)
+    return context
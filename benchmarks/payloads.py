@@ -0,0 +1,128 @@
+"""Realistic panel payloads of configurable size for the benchmarks."""
+
+import json
+
+from ksenia_lares.lares4_api import crc16
+
+# Zone counts of the 16IP, 48IP and 128IP models, and of a large Lares 4.0 installation
+ZONE_COUNTS = (16, 48, 128, 644)
+
+
+def zones_status(count):
+    return [
+        {"ID": str(i), "STA": "A" if i % 7 == 0 else "R", "BYP": "NO", "T": "N", "A": "Y" if i % 31 == 0 else "N",
+         "OHM": "NA", "VAS": "F", "LBL": f"Zone {i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+def partitions_status(count):
+    return [{"ID": str(i), "ARM": "D", "T": "N", "AST": "OK", "TST": "N"} for i in range(1, max(count // 8, 1) + 1)]
+
+
+def outputs(count):
+    return [
+        {"ID": str(i), "DES": f"Output {i}", "CNV": "H", "CAT": "ROLL" if i % 4 == 0 else "LIGHT", "MOD": "M"}
+        for i in range(1, count + 1)
+    ]
+
+
+def outputs_status(count):
+    return [
+        {"ID": str(i), "STA": "ON" if i % 2 else "OFF", **({"POS": "40", "TPOS": "100"} if i % 4 == 0 else {})}
+        for i in range(1, count + 1)
+    ]
+
+
+def peripherals(count):
+    return [{"ID": str(i), "TYP": "DOMUS", "DES": f"Domus {i}"} for i in range(1, max(count // 4, 1) + 1)]
+
+
+def peripherals_status(count):
+    return [
+        {"ID": str(i), "TYP": "DOMUS", "STA": "OK", "BUS": "1", "LINK": {"TYPE": "BUS", "SN": f"{i:08X}", "BUS": "1"},
+         "DOMUS": {"TEM": "21.5", "HUM": "45.0", "LHT": "120.0"}}
+        for i in range(1, max(count // 4, 1) + 1)
+    ]
+
+
+def temperatures_status(count):
+    return [
+        {"ID": str(i), "TEMP": "20.5", "THERM": {"ACT_SEA": "WIN", "ACT_MODEL": "MAN_TMR", "OUT_STATUS": "OFF",
+                                                 "TEMP_THR": {"VAL": "01:30"}}}
+        for i in range(1, max(count // 8, 1) + 1)
+    ]
+
+
+def systems_status(count):
+    return [
+        {"ID": "1", "INFO": ["OK"], "TAMPER": [], "TAMPER_MEM": [], "ALARM": [str(i) for i in range(1, count // 31 + 1)],
+         "ALARM_MEM": [], "FAULT": [], "FAULT_MEM": [], "ARM": {"D": "Disarmed", "S": "D"},
+         "TEMP": {"IN": "21.5", "OUT": "NA"},
+         "TIME": {"GMT": "1700000000", "TZ": "1", "TZM": "0", "DAWN": "07:10", "DUSK": "17:45"}}
+    ]
+
+
+def scenarios(count):
+    return [
+        {"ID": str(i), "DES": f"Scenario {i}", "PIN": "P", "CAT": "ARM"}
+        for i in range(1, max(count // 4, 1) + 1)
+    ]
+
+
+READERS = {
+    "read_zones_status": zones_status,
+    "read_partitions_status": partitions_status,
+    "read_outputs": outputs,
+    "read_outputs_status": outputs_status,
+    "read_peripherals": peripherals,
+    "read_peripherals_status": peripherals_status,
+    "read_temperatures_status": temperatures_status,
+    "read_systems_status": systems_status,
+    "read_scenarios": scenarios,
+}
+
+
+def realtime_frame(sender, count):
+    """Encoded CHANGES frame updating `count` zones, with a valid CRC."""
+    frame = {
+        "SENDER": "panel",
+        "RECEIVER": "",
+        "CMD": "REALTIME",
+        "ID": "1",
+        "PAYLOAD_TYPE": "CHANGES",
+        "PAYLOAD": {sender: {"STATUS_ZONES": zones_status(count)}},
+        "TIMESTAMP": "1700000000",
+        "CRC_16": "0x0000",
+    }
+    frame["CRC_16"] = crc16(json.dumps(frame))
+    return json.dumps(frame)
+
+
+def response_frame(command, payload):
+    """Encoded response to a decoded command, with a valid CRC."""
+    frame = {
+        "SENDER": "panel",
+        "RECEIVER": command["SENDER"],
+        "CMD": f"{command['CMD']}_RES",
+        "ID": command["ID"],
+        "PAYLOAD_TYPE": command["PAYLOAD_TYPE"],
+        "PAYLOAD": payload,
+        "TIMESTAMP": command["TIMESTAMP"],
+        "CRC_16": "0x0000",
+    }
+    frame["CRC_16"] = crc16(json.dumps(frame))
+    return json.dumps(frame)
+
+
+def ip_zones_status(count):
+    zones = "".join(
+        f"<zone><status>{'ALARM' if i % 31 == 0 else 'NORMAL'}</status><bypass>UN_BYPASS</bypass></zone>"
+        for i in range(count)
+    )
+    return f"<?xml version='1.0' encoding='UTF-8'?><zonesStatus>{zones}</zonesStatus>"
+
+
+def ip_zones_description(count):
+    zones = "".join(f"<zone>Zone {i}</zone>" for i in range(count))
+    return f"<?xml version='1.0' encoding='UTF-8'?><zonesDescription>{zones}</zonesDescription>"
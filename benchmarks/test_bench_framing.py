@@ -0,0 +1,41 @@
+import pytest
+
+import payloads
+from ksenia_lares.codec import CODECS
+from ksenia_lares.lares4_api import CommandFactory, crc16, crc16_bytes, verify_crc16
+
+READ_PAYLOAD = {"ID_LOGIN": True, "ID_READ": "1", "TYPES": ["STATUS_ZONES", "STATUS_PARTITIONS", "STATUS_OUTPUTS"]}
+
+
+@pytest.fixture
+def factory():
+    factory = CommandFactory("abc", "123456")
+    factory.set_login_id("7")
+    return factory
+
+
+@pytest.mark.parametrize("zones", [16, 644])
+def test_crc16(benchmark, zones):
+    frame = payloads.realtime_frame("abc", zones)
+    benchmark(crc16, frame)
+
+
+@pytest.mark.parametrize("zones", [16, 644])
+def test_crc16_bytes(benchmark, zones):
+    frame = payloads.realtime_frame("abc", zones).encode("utf-8")
+    benchmark(crc16_bytes, frame)
+
+
+@pytest.mark.parametrize("zones", [16, 644])
+def test_verify_crc16(benchmark, zones):
+    frame = payloads.realtime_frame("abc", zones)
+    assert benchmark(verify_crc16, frame)
+
+
+def test_build_command(benchmark, factory):
+    benchmark(factory.build_command, "READ", "MULTI_TYPES", READ_PAYLOAD)
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_encode_command(benchmark, factory, codec):
+    benchmark(factory.encode_command, "READ", "MULTI_TYPES", READ_PAYLOAD, CODECS[codec]())
@@ -0,0 +1,66 @@
+import asyncio
+
+import aiohttp
+import pytest
+from lxml import etree
+
+import payloads
+from ksenia_lares import IpAPI
+from ksenia_lares.ip_api import ZONES_DESCRIPTION, ZONES_STATUS
+from ksenia_lares.ip_simulator import IpSimulator, SimulatedIpPanel
+from ksenia_lares.types_ip import ZoneBypass, ZoneStatus
+
+MODELS = {"16IP": 16, "48IP": 48, "128IP": 128}
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_parse_zones(benchmark, model):
+    status = payloads.ip_zones_status(MODELS[model]).encode("utf-8")
+    descriptions = payloads.ip_zones_description(MODELS[model]).encode("utf-8")
+
+    def parse():
+        names = [zone.text for zone in ZONES_DESCRIPTION(etree.fromstring(descriptions))]
+        return [
+            (index, names[index], ZoneStatus(zone.findtext("status")), ZoneBypass(zone.findtext("bypass")))
+            for index, zone in enumerate(ZONES_STATUS(etree.fromstring(status)))
+        ]
+
+    assert len(benchmark(parse)) == MODELS[model]
+
+
+@pytest.fixture(scope="module")
+def simulator(run):
+    simulator = IpSimulator([SimulatedIpPanel(model) for model in MODELS], port=0)
+    run(simulator.start())
+    yield simulator
+    run(simulator.stop())
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_get_zones(benchmark, run, simulator, model):
+    api = IpAPI(simulator.configs(model=model)[list(MODELS).index(model)])
+
+    zones = benchmark(lambda: run(api.get_zones()))
+
+    assert len(zones) == MODELS[model]
+    run(api.close())
+
+
+async def _session():
+    return aiohttp.ClientSession()
+
+
+@pytest.mark.parametrize("panels", [10, 100])
+def test_poll_fleet(benchmark, run, panels):
+    """Poll the zones of a fleet of 128IP panels concurrently over one session."""
+    simulator = IpSimulator([SimulatedIpPanel("128IP") for _ in range(panels)], port=0)
+    run(simulator.start())
+    session = run(_session())
+    apis = [IpAPI(config, session=session) for config in simulator.configs(model="128IP")]
+
+    async def poll():
+        return await asyncio.gather(*(api.get_zones() for api in apis))
+
+    assert len(benchmark(lambda: run(poll()))) == panels
+    run(session.close())
+    run(simulator.stop())
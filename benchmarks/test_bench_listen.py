@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from aiohttp import web
+
+import payloads
+from ksenia_lares.lares4_api import Lares4API, get_ssl_context
+from ksenia_lares.types_lares4 import EventType
+
+FRAMES = 1000
+
+
+@pytest.mark.parametrize("typed", [False, True], ids=["raw", "typed"])
+def test_dispatch_changes(benchmark, typed):
+    api = Lares4API({"url": "127.0.0.1", "pin": "123456", "sender": "abc"})
+    received = []
+    api.event_listeners[EventType.ZONES] = [received.append]
+    if typed:
+        api._typed_listeners.add((EventType.ZONES, received.append))
+    api._update_dispatch(EventType.ZONES)
+    changes = {"STATUS_ZONES": payloads.zones_status(16)}
+
+    benchmark(api._dispatch_changes, changes)
+
+    assert received
+
+
+@pytest.fixture(scope="module")
+def panel(run, server_ssl_context):
+    """
+    Websocket servers pushing realtime zone changes to every client, then closing.
+
+    Changes are pushed once the REALTIME registration is answered, and for
+    typed listeners the READ seeding their state, keyed by `typed`.
+    """
+    frames = [payloads.realtime_frame("abc", 4) for _ in range(FRAMES)]
+
+    def websocket(commands):
+        async def handler(request):
+            ws = web.WebSocketResponse(protocols=["KS_WSOCK"])
+            await ws.prepare(request)
+            for _ in range(commands):
+                command = json.loads((await ws.receive()).data)
+                await ws.send_str(
+                    payloads.response_frame(command, {"RESULT": "OK", "STATUS_ZONES": payloads.zones_status(4)})
+                )
+            for frame in frames:
+                await ws.send_str(frame)
+            await ws.close()
+            return ws
+
+        return handler
+
+    ports = {}
+    runners = []
+    for typed in (False, True):
+        app = web.Application()
+        app.router.add_get("/KseniaWsock", websocket(2 if typed else 1))
+        runner = web.AppRunner(app)
+        run(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=server_ssl_context)
+        run(site.start())
+        ports[typed] = runner.addresses[0][1]
+        runners.append(runner)
+    yield ports
+    for runner in runners:
+        run(runner.cleanup())
+
+
+@pytest.mark.parametrize("typed", [False, True], ids=["raw", "typed"])
+def test_listen_throughput(benchmark, run, panel, typed):
+    """Time to receive, decode and dispatch `FRAMES` realtime frames over TLS."""
+    received = []
+
+    async def session():
+        api = Lares4API({"url": f"127.0.0.1:{panel[typed]}", "pin": "123456", "sender": "abc"}, verify_crc=True)
+        await api.add_event_listener(EventType.ZONES, received.append, typed=typed)
+        await api.connect(ssl_context=get_ssl_context())
+        await api.listen()
+        await api.close()
+
+    benchmark.pedantic(lambda: run(session()), rounds=5)
+
+    assert received and len(received) % FRAMES == 0
@@ -0,0 +1,12 @@
+import pytest
+
+import payloads
+from ksenia_lares import readers
+
+
+@pytest.mark.parametrize("count", payloads.ZONE_COUNTS)
+@pytest.mark.parametrize("reader", sorted(payloads.READERS))
+def test_reader(benchmark, reader, count):
+    payload = payloads.READERS[reader](count)
+    result = benchmark(getattr(readers, reader), payload)
+    assert len(result) == len(payload)
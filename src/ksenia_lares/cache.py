@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from .types_ip import AlarmInfo
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _load_json(path: str) -> Optional[Any]:
+    """Load a JSON file, None if it is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Ignoring unreadable cache %s: %s", path, err)
+        return None
+
+
+def _save_json(path: str, data: Any) -> None:
+    """Atomically replace a JSON file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+DEFAULT_FLUSH_DELAY = 5
+
+
+class _JsonFile(ABC):
+    """
+    Batched writes of a cache to a JSON file.
+
+    Changes made on a running event loop mark the cache dirty and schedule a
+    single write `flush_delay` seconds later, run in the default executor, so
+    a burst of changes costs one write and never blocks the loop. Without a
+    running loop changes are written immediately. Call `flush()` before
+    exiting to write pending changes.
+    """
+
+    def __init__(self, path: str, flush_delay: float) -> None:
+        self.path = path
+        self.flush_delay = flush_delay
+        self._version = 0
+        self._saved_version = 0
+        self._written_version = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @abstractmethod
+    def _data(self) -> Any:
+        """Get the JSON-serializable content of the file."""
+
+    def _changed(self) -> None:
+        self._version += 1
+        if self._timer is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._timer = loop.call_later(self.flush_delay, self._flush_in_executor, loop)
+
+    def _flush_in_executor(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        if self._version == self._saved_version:
+            return
+
+        self._saved_version = version = self._version
+        future = loop.run_in_executor(None, self._write, version, self._data())
+        future.add_done_callback(self._written)
+
+    def _written(self, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            _LOGGER.warning("Cannot write cache %s: %s", self.path, future.exception())
+            self._saved_version = 0
+
+    def _write(self, version: int, data: Any) -> None:
+        # Writes may finish out of order, never replace a newer file with an older one
+        with self._lock:
+            if version > self._written_version:
+                _save_json(self.path, data)
+                self._written_version = version
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._version != self._saved_version:
+            self._saved_version = version = self._version
+            self._write(version, self._data())
+
+
+@dataclass
+class CacheEntry:
+    """Cached description document."""
+
+    descriptions: List[Optional[str]]
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class DescriptionCache:
+    """
+    In-memory cache for description documents.
+
+    Entries are keyed by host and document path. Entries older than `ttl`
+    are reported as stale, so the caller can revalidate them against the panel.
+    A single cache can be shared by many `IpAPI` instances.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (Optional[float]): Seconds after which entries are stale, never when None.
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, CacheEntry] = {}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, fresh or stale."""
+        return self._entries.get(key)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check if an entry is younger than the TTL."""
+        return self.ttl is None or time.time() - entry.stored_at < self.ttl
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry."""
+        self._entries[key] = entry
+
+    def flush(self) -> None:
+        """Persist pending changes, nothing to do for the in-memory cache."""
+
+    def invalidate(self, prefix: str = "") -> None:
+        """
+        Remove entries.
+
+        Args:
+            prefix (str): Only remove keys starting with this prefix, all entries by default.
+        """
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class JsonFileCache(_JsonFile, DescriptionCache):
+    """
+    Description cache persisted to a JSON file, so it survives restarts.
+
+    Writes are batched, see `flush()`.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, flush_delay: float = DEFAULT_FLUSH_DELAY) -> None:
+        """
+        Initialize the cache and load existing entries from disk.
+
+        Args:
+            path (str): Path of the JSON file.
+            ttl (Optional[float]): Seconds after which entries are stale, never when None.
+            flush_delay (float): Seconds to collect changes before writing them.
+        """
+        DescriptionCache.__init__(self, ttl)
+        _JsonFile.__init__(self, path, flush_delay)
+        self._load()
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        super().set(key, entry)
+        self._changed()
+
+    def invalidate(self, prefix: str = "") -> None:
+        super().invalidate(prefix)
+        self._changed()
+
+    def _load(self) -> None:
+        data = _load_json(self.path)
+        if data is not None:
+            self._entries = {key: CacheEntry(**value) for key, value in data.items()}
+
+    def _data(self) -> Any:
+        return {key: asdict(entry) for key, entry in self._entries.items()}
+
+
+class InfoCache:
+    """In-memory cache for the general info of panels, keyed by host."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, AlarmInfo] = {}
+
+    def get(self, key: str) -> Optional[AlarmInfo]:
+        """Get the info of a panel."""
+        return self._entries.get(key)
+
+    def set(self, key: str, info: AlarmInfo) -> None:
+        """Store the info of a panel."""
+        self._entries[key] = info
+
+    def flush(self) -> None:
+        """Persist pending changes, nothing to do for the in-memory cache."""
+
+    def invalidate(self, prefix: str = "") -> None:
+        """
+        Remove entries.
+
+        Args:
+            prefix (str): Only remove keys starting with this prefix, all entries by default.
+        """
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class JsonFileInfoCache(_JsonFile, InfoCache):
+    """
+    Panel info cache persisted to a JSON file, so startup can skip `info()`.
+
+    Writes are batched, see `flush()`.
+    """
+
+    def __init__(self, path: str, flush_delay: float = DEFAULT_FLUSH_DELAY) -> None:
+        """
+        Initialize the cache and load existing entries from disk.
+
+        Args:
+            path (str): Path of the JSON file.
+            flush_delay (float): Seconds to collect changes before writing them.
+        """
+        InfoCache.__init__(self)
+        _JsonFile.__init__(self, path, flush_delay)
+        self._entries = _load_json(path) or {}
+
+    def set(self, key: str, info: AlarmInfo) -> None:
+        super().set(key, info)
+        self._changed()
+
+    def invalidate(self, prefix: str = "") -> None:
+        super().invalidate(prefix)
+        self._changed()
+
+    def _data(self) -> Any:
+        return dict(self._entries)
@@ -0,0 +1,80 @@
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JsonCodec:
+    """JSON codec based on the standard library."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize to UTF-8 encoded JSON."""
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: str | bytes) -> Any:
+        """Deserialize JSON text or bytes."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec based on `orjson`."""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """JSON codec based on `ujson`."""
+
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: str | bytes) -> Any:
+        return ujson.loads(data)
+
+
+CODECS = {
+    codec.name: codec
+    for codec, module in ((OrjsonCodec, orjson), (UjsonCodec, ujson), (JsonCodec, json))
+    if module is not None
+}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Get a JSON codec.
+
+    Args:
+        name (Optional[str]): `orjson`, `ujson` or `json`. Defaults to the fastest
+            installed one, falling back to the standard library.
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If the requested codec is not installed.
+    """
+    if name is None:
+        return next(iter(CODECS.values()))()
+
+    if name not in CODECS:
+        raise ValueError(f"JSON codec {name} is not available")
+
+    return CODECS[name]()
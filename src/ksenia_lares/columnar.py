@@ -0,0 +1,332 @@
+import operator
+from array import array
+from functools import reduce
+from itertools import compress
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+NO_POSITION = -1
+ALARM_STATUSES = ("ALARM",)
+NORMAL_ALARMS = (None, "N")
+
+_ARROW_TYPES = {"B": "uint8", "H": "uint16", "h": "int16", "I": "uint32"}
+
+
+class Table:
+    """
+    Array-backed columns of entity state, one row per entity.
+
+    Numeric columns are `array.array`s. String columns are dictionary
+    encoded: the array holds a one byte code and `categories[name]` maps the
+    codes back to values, code 0 being None. Rows are tagged with the panel
+    they come from, encoded the same way in the `panel` column. Columns
+    support the buffer protocol, so NumPy and Arrow can wrap them without
+    copying.
+
+    While views from `buffers`, `to_numpy_column` or `to_arrow` are alive
+    the table is frozen: adding rows raises `BufferError` and leaves the
+    table unchanged. Release the views, or copy them, before adding rows.
+    """
+
+    schema: Dict[str, str] = {}
+    categorical: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.panels: List[Hashable] = []
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in {"panel": "H", **self.schema}.items()
+        }
+        self.categories: Dict[str, List[Optional[str]]] = {name: [None] for name in self.categorical}
+        self._panel_codes: Dict[Hashable, int] = {}
+        self._codes: Dict[str, Dict[Optional[str], int]] = {name: {None: 0} for name in self.categorical}
+
+    def __len__(self) -> int:
+        return len(self.columns["panel"])
+
+    @classmethod
+    def concat(cls, tables: Iterable["Table"]) -> "Table":
+        """Merge tables, for example one per panel of a fleet, into a new table."""
+        result = cls()
+        for table in tables:
+            result.extend(table)
+        return result
+
+    def extend(self, other: "Table") -> None:
+        """Append the rows of another table of the same kind."""
+        staged: Dict[str, Dict[Any, int]] = {}
+        panels = [self._stage("panel", panel, staged) for panel in other.panels]
+        values = {"panel": [panels[code] for code in other.columns["panel"]]}
+
+        for name in self.schema:
+            if name in self.categorical:
+                codes = [self._stage(name, value, staged) for value in other.categories[name]]
+                values[name] = [codes[code] for code in other.columns[name]]
+            else:
+                values[name] = other.columns[name]
+
+        self._extend_columns(values, staged)
+
+    def encode(self, name: str, value: Optional[str]) -> int:
+        """Get the code of a value of a string column, adding it if new."""
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            if code > 0xFF:
+                raise ValueError(f"Too many distinct values in column {name}")
+            self.categories[name].append(value)
+        return code
+
+    def _stage(self, name: str, value: Any, staged: Dict[str, Dict[Any, int]]) -> int:
+        """Get the code of a panel or string value, new values are kept in `staged` until the rows are added."""
+        known = self._panel_codes if name == "panel" else self._codes[name]
+        code = known.get(value)
+        if code is None:
+            added = staged.setdefault(name, {})
+            code = added.get(value)
+            if code is None:
+                code = added[value] = len(known) + len(added)
+                if name != "panel" and code > 0xFF:
+                    raise ValueError(f"Too many distinct values in column {name}")
+        return code
+
+    def _add_rows(self, panel: Hashable, rows: Iterable[Dict[str, Any]]) -> None:
+        """Append rows of a panel, all of them or none."""
+        staged: Dict[str, Dict[Any, int]] = {}
+        values: Dict[str, List[Any]] = {name: [] for name in self.columns}
+        for row in rows:
+            values["panel"].append(self._stage("panel", panel, staged))
+            for name in self.schema:
+                value = row[name]
+                values[name].append(self._stage(name, value, staged) if name in self.categorical else value)
+
+        self._extend_columns(values, staged)
+
+    def _extend_columns(self, values: Dict[str, Sequence[Any]], staged: Dict[str, Dict[Any, int]]) -> None:
+        """
+        Extend every column, then add the staged panels and string values.
+
+        If any column cannot grow, the columns are truncated back and the
+        staged values dropped, so the table is left unchanged.
+        """
+        sizes = {name: len(column) for name, column in self.columns.items()}
+        try:
+            for name, column in self.columns.items():
+                column.extend(values[name])
+        except Exception as err:
+            for name, column in self.columns.items():
+                if len(column) != sizes[name]:
+                    del column[sizes[name]:]
+            if isinstance(err, BufferError):
+                raise BufferError(f"Table is frozen while views of its columns exist, {err}") from err
+            raise
+
+        for name, added in staged.items():
+            if name == "panel":
+                self._panel_codes.update(added)
+                self.panels.extend(added)
+            else:
+                self._codes[name].update(added)
+                self.categories[name].extend(added)
+
+    def isin(self, name: str, values: Iterable[Any], invert: bool = False) -> Sequence[bool]:
+        """
+        Check which rows have one of the given values in a column.
+
+        Args:
+            name (str): Column name, `panel` matches panel keys.
+            values (Iterable[Any]): Decoded values to look for.
+            invert (bool): Match rows without any of the values instead.
+
+        Returns:
+            Sequence[bool]: A boolean mask, a NumPy array when NumPy is installed.
+        """
+        codes = self._codes_of(name, values)
+        column = self.columns[name]
+
+        if numpy is not None:
+            return numpy.isin(self.to_numpy_column(name), list(codes), invert=invert)
+
+        if invert:
+            return [code not in codes for code in column]
+        return list(map(codes.__contains__, column))
+
+    def _codes_of(self, name: str, values: Iterable[Any]) -> set:
+        if name == "panel":
+            return {self._panel_codes[value] for value in values if value in self._panel_codes}
+        if name in self.categorical:
+            codes = self._codes[name]
+            return {codes[value] for value in values if value in codes}
+        return set(values)
+
+    def where(self, *masks: Sequence[bool], match_any: bool = False) -> List[int]:
+        """
+        Get the rows matching masks from `isin`.
+
+        Args:
+            *masks (Sequence[bool]): Masks to combine.
+            match_any (bool): Match rows of any mask instead of all of them.
+
+        Returns:
+            List[int]: Matching row indices.
+        """
+        if not masks:
+            return list(range(len(self)))
+
+        if numpy is not None:
+            combine = numpy.logical_or if match_any else numpy.logical_and
+            return numpy.flatnonzero(combine.reduce(masks)).tolist()
+
+        combine = operator.or_ if match_any else operator.and_
+        mask = reduce(lambda left, right: map(combine, left, right), masks)
+        return list(compress(range(len(self)), mask))
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """Decode rows to dictionaries, all rows by default."""
+        if rows is None:
+            rows = range(len(self))
+
+        records = []
+        for row in rows:
+            record = {"panel": self.panels[self.columns["panel"][row]]}
+            for name in self.schema:
+                value = self.columns[name][row]
+                record[name] = self.categories[name][value] if name in self.categorical else value
+            records.append(record)
+        return records
+
+    def buffers(self) -> Dict[str, memoryview]:
+        """Zero-copy views of the columns."""
+        return {name: memoryview(column) for name, column in self.columns.items()}
+
+    def to_numpy_column(self, name: str):
+        """Wrap a column in a NumPy array without copying, the table is frozen while it is alive."""
+        if numpy is None:
+            raise ImportError("NumPy is required, install numpy")
+        column = self.columns[name]
+        return numpy.frombuffer(column, dtype=column.typecode) if len(column) else numpy.empty(0, column.typecode)
+
+    def to_numpy(self):
+        """Copy the table to a NumPy structured array, string columns keep their codes."""
+        if numpy is None:
+            raise ImportError("NumPy is required, install numpy")
+        result = numpy.empty(len(self), dtype=[(name, column.typecode) for name, column in self.columns.items()])
+        for name in self.columns:
+            result[name] = self.to_numpy_column(name)
+        return result
+
+    def to_arrow(self):
+        """
+        Export the table to a `pyarrow.Table`.
+
+        Numeric columns and the codes of string columns share memory with the
+        table, which is frozen while the Arrow table is alive. String columns
+        become Arrow dictionary arrays.
+        """
+        if pyarrow is None:
+            raise ImportError("PyArrow is required, install pyarrow")
+
+        arrays = {}
+        for name, column in self.columns.items():
+            codes = pyarrow.Array.from_buffers(
+                pyarrow.type_for_alias(_ARROW_TYPES[column.typecode]),
+                len(column),
+                [None, pyarrow.py_buffer(column)],
+            )
+            if name == "panel":
+                dictionary = pyarrow.array(map(str, self.panels), pyarrow.string())
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(codes, dictionary)
+            elif name in self.categorical:
+                dictionary = pyarrow.array(self.categories[name], pyarrow.string())
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(codes, dictionary)
+            else:
+                arrays[name] = codes
+        return pyarrow.table(arrays)
+
+
+class ZoneTable(Table):
+    """Columnar zone state, from zones of both the IP and the Lares 4 API."""
+
+    schema = {"id": "I", "status": "B", "bypass": "B", "tamper": "B", "alarm": "B"}
+    categorical = ("status", "bypass", "tamper", "alarm")
+
+    @classmethod
+    def from_zones(cls, zones: Iterable, panel: Hashable = None) -> "ZoneTable":
+        """Build a table from the zones of one panel."""
+        table = cls()
+        table.add(zones, panel)
+        return table
+
+    def add(self, zones: Iterable, panel: Hashable = None) -> None:
+        """
+        Append zones of a panel.
+
+        Args:
+            zones (Iterable): Zones from `get_zones()`.
+            panel (Hashable): Key of the panel, for example its host.
+        """
+        self._add_rows(
+            panel,
+            (
+                {
+                    "id": zone.id,
+                    "status": zone.status.value,
+                    "bypass": zone.bypass.value,
+                    "tamper": getattr(zone, "tamper", None),
+                    "alarm": getattr(zone, "alarm", None),
+                }
+                for zone in zones
+            ),
+        )
+
+    def in_alarm(self) -> List[int]:
+        """Get the rows of zones in alarm."""
+        return self.where(
+            self.isin("status", ALARM_STATUSES),
+            self.isin("alarm", NORMAL_ALARMS, invert=True),
+            match_any=True,
+        )
+
+
+class OutputTable(Table):
+    """Columnar output state of the Lares 4 API, `NO_POSITION` for outputs without one."""
+
+    schema = {"id": "I", "status": "B", "position": "h", "target_position": "h"}
+    categorical = ("status",)
+
+    @classmethod
+    def from_outputs(cls, outputs: Iterable, panel: Hashable = None) -> "OutputTable":
+        """Build a table from the outputs status of one panel."""
+        table = cls()
+        table.add(outputs, panel)
+        return table
+
+    def add(self, outputs: Iterable, panel: Hashable = None) -> None:
+        """
+        Append outputs status of a panel.
+
+        Args:
+            outputs (Iterable): Outputs status from `get_outputs_status()`.
+            panel (Hashable): Key of the panel, for example its host.
+        """
+        self._add_rows(
+            panel,
+            (
+                {
+                    "id": output.id,
+                    "status": output.status,
+                    "position": NO_POSITION if output.position is None else output.position,
+                    "target_position": NO_POSITION if output.target_position is None else output.target_position,
+                }
+                for output in outputs
+            ),
+        )
@@ -0,0 +1,10 @@
+import sys
+
+
+def intern(value):
+    """Intern strings repeated across many objects, so snapshots share one copy."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def intern_all(values) -> tuple:
+    return tuple(intern(value) for value in values)
@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+import time
+from functools import partial
+from typing import List, Mapping, NamedTuple, Optional, Tuple
 from getmac import get_mac_address
 import aiohttp
 from lxml import etree
@@ -10,6 +14,7 @@ from .types_ip import (
     Partition,
     PartitionStatus,
     Scenario,
+    Snapshot,
     Zone as ZoneIP,
     ZoneBypass,
     ZoneStatus,
@@ -18,23 +23,76 @@ from .types_lares4 import (
     Zone as ZoneLares4
 )
 from .base_api import BaseApi
+from .cache import CacheEntry, DescriptionCache, InfoCache
+from .metrics import NOOP_METRICS, Metrics
+from .interning import intern
+from .tracing import redact
 
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_TIMEOUT = 10
+DEFAULT_LIMIT_PER_HOST = 4
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+DEFAULT_DNS_CACHE_TTL = 300
+CHUNK_SIZE = 4096
+
+# XPath expressions are compiled once per document type instead of per request
+GENERAL_INFO = etree.XPath("/generalInfo")
+ZONES_STATUS = etree.XPath("/zonesStatus/zone")
+ZONES_DESCRIPTION = etree.XPath("/zonesDescription/zone")
+PARTITIONS_STATUS = etree.XPath("/partitionsStatus/partition")
+PARTITIONS_DESCRIPTION = etree.XPath("/partitionsDescription/partition")
+SCENARIOS_OPTIONS = etree.XPath("/scenariosOptions/scenario")
+SCENARIOS_DESCRIPTION = etree.XPath("/scenariosDescription/scenario")
+COMMAND_RESULT = etree.XPath("/cmd")
+
+
+class _Document(NamedTuple):
+    # A copy of the response headers, case-insensitive as panels differ in the case of e.g. `ETag`
+    headers: Mapping[str, str]
+    content: Optional[etree.ElementBase]
+    digest: Optional[bytes]
+
 
 class IpAPI(BaseApi):
     """Implementation for the IP range of Kseni Lares (Lare 16 IP, 48 IP & 128 IP)."""
 
-    def __init__(self, data: dict) -> None:
+    def __init__(
+        self,
+        data: dict,
+        session: Optional[aiohttp.ClientSession] = None,
+        description_cache: Optional[DescriptionCache] = None,
+        info_cache: Optional[InfoCache] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         """
         Initialize the API with the necessary connection details.
 
+        The HTTP session is created on the first request and kept open, so
+        subsequent requests reuse the same keep-alive connections. Call
+        `close()` or use the API as an async context manager to release it.
+
         Args:
             data (dict): A dictionary containing the following keys:
                 - username (str): The username for authentication.
                 - password (str): The password for authentication.
                 - host (str): The hostname or IP address of the API.
                 - port (int): The port number of the API.
+                - timeout (float, optional): Total timeout per request in seconds.
+                - limit_per_host (int, optional): Maximum open connections to the panel.
+                - keepalive_timeout (float, optional): Seconds to keep idle connections open.
+                - dns_cache_ttl (int, optional): Seconds to cache resolved host names.
+                - model (str, optional): Known model (128IP, 48IP or 16IP), skips detection.
+                - resolve_mac (bool, optional): Look up the MAC address in `info()`, default True.
+            session (Optional[aiohttp.ClientSession]): Existing session to use instead
+                of creating one. A shared session is not closed by `close()`.
+            description_cache (Optional[DescriptionCache]): Cache for zone, partition and
+                scenario descriptions, can be shared and persisted. Defaults to an
+                in-memory cache without expiry.
+            info_cache (Optional[InfoCache]): Cache for the general info of the panel,
+                used to resolve the model without calling `info()`.
+            metrics (Optional[Metrics]): Sink for request metrics, labelled with
+                `host:port` and the document path. Disabled by default.
 
         Raises:
             ValueError: If any required parameter is missing or invalid.
@@ -48,8 +106,41 @@ class IpAPI(BaseApi):
         self._ip = data["host"]
         self._port = data["port"]
         self._host = f"http://{self._ip}:{self._port}"
-        self._model = None
-        self._description_cache = {}
+        self._panel = f"{self._ip}:{self._port}"
+        self._model = data.get("model")
+        self._resolve_mac = data.get("resolve_mac", True)
+        self._info_cache = info_cache if info_cache is not None else InfoCache()
+        self._model_lock = asyncio.Lock()
+        self._description_cache = (
+            description_cache if description_cache is not None else DescriptionCache()
+        )
+
+        self._timeout = aiohttp.ClientTimeout(total=data.get("timeout", DEFAULT_TIMEOUT))
+        self._limit_per_host = data.get("limit_per_host", DEFAULT_LIMIT_PER_HOST)
+        self._keepalive_timeout = data.get("keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT)
+        self._dns_cache_ttl = data.get("dns_cache_ttl", DEFAULT_DNS_CACHE_TTL)
+        self._session = session
+        self._owns_session = session is None
+        self._metrics = metrics if metrics is not None else NOOP_METRICS
+
+    @property
+    def host(self) -> str:
+        """Base URL of the panel, e.g. `http://192.168.1.2:80`."""
+        return self._host
+
+    async def __aenter__(self) -> "IpAPI":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Write pending cache changes and close the HTTP session, if it was created by this instance."""
+        self._description_cache.flush()
+        self._info_cache.flush()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def info(self) -> AlarmInfo:
         """
@@ -58,21 +149,32 @@ class IpAPI(BaseApi):
         Returns:
             AlarmInfo: General information about the alarm system.
         """
-        response = await self._get("info/generalInfo.xml")
-        mac = get_mac_address(ip=self._ip)
+        response, mac = await asyncio.gather(
+            self._get("info/generalInfo.xml"), self._get_mac_address()
+        )
 
+        general_info = GENERAL_INFO(response)[0]
         info: AlarmInfo = {
             "mac": mac,
             "host": f"{self._ip}:{self._port}",
-            "name": response.xpath("/generalInfo/productName")[0].text,
-            "info": response.xpath("/generalInfo/info1")[0].text,
-            "version": response.xpath("/generalInfo/productHighRevision")[0].text,
-            "revision": response.xpath("/generalInfo/productLowRevision")[0].text,
-            "build": response.xpath("/generalInfo/productBuildRevision")[0].text,
+            "name": general_info.findtext("productName"),
+            "info": general_info.findtext("info1"),
+            "version": general_info.findtext("productHighRevision"),
+            "revision": general_info.findtext("productLowRevision"),
+            "build": general_info.findtext("productBuildRevision"),
         }
 
+        self._info_cache.set(info["host"], info)
         return info
 
+    async def _get_mac_address(self) -> Optional[str]:
+        """Look up the MAC address, the ARP lookup blocks so it runs in an executor."""
+        if not self._resolve_mac:
+            return None
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(get_mac_address, ip=self._ip))
+
     async def get_zones(self) -> List[ZoneIP]:
         """
         Get status of all zones.
@@ -80,21 +182,49 @@ class IpAPI(BaseApi):
         Returns:
             List[Zone]: List of the zones in the alarm system.
         """
+        _, zones = await self._read_zones(None)
+        return zones
+
+    async def get_zones_if_changed(
+        self, digest: Optional[bytes] = None
+    ) -> Tuple[bytes, Optional[List[ZoneIP]]]:
+        """
+        Get status of all zones, unless the status document is unchanged.
+
+        The raw document is hashed before parsing, so an unchanged document
+        costs neither parsing nor object construction.
+
+        Args:
+            digest (Optional[bytes]): Digest returned by the previous call, if any.
+
+        Returns:
+            Tuple[bytes, Optional[List[Zone]]]: Digest of the status document and
+                the zones, None if the digest did not change.
+        """
+        return await self._read_zones(digest or b"")
+
+    async def _read_zones(
+        self, digest: Optional[bytes]
+    ) -> Tuple[Optional[bytes], Optional[List[ZoneIP]]]:
         model = await self.get_model()
-        response = await self._get(f"zones/zonesStatus{model}.xml")
-        zones = response.xpath("/zonesStatus/zone")
-        descriptions: List[str] = await self._get_descriptions(
-            f"zones/zonesDescription{model}.xml", "/zonesDescription/zone"
+        document, descriptions = await asyncio.gather(
+            self._fetch(f"zones/zonesStatus{model}.xml", digest=digest),
+            self._get_descriptions(
+                f"zones/zonesDescription{model}.xml", ZONES_DESCRIPTION
+            ),
         )
 
-        return [
+        if document.content is None:
+            return document.digest, None
+
+        return document.digest, [
             ZoneIP(
                 id=index,
                 description=descriptions[index],
-                status=ZoneStatus(zone.find("status").text),
-                bypass=ZoneBypass(zone.find("bypass").text),
+                status=ZoneStatus(zone.findtext("status")),
+                bypass=ZoneBypass(zone.findtext("bypass")),
             )
-            for index, zone in enumerate(zones)
+            for index, zone in enumerate(ZONES_STATUS(document.content))
         ]
 
     async def get_partitions(self) -> List[Partition]:
@@ -104,21 +234,46 @@ class IpAPI(BaseApi):
         Returns:
             List[Partition]: List of the partitions in the alarm system.
         """
+        _, partitions = await self._read_partitions(None)
+        return partitions
+
+    async def get_partitions_if_changed(
+        self, digest: Optional[bytes] = None
+    ) -> Tuple[bytes, Optional[List[Partition]]]:
+        """
+        Get status of partitions, unless the status document is unchanged.
+
+        Args:
+            digest (Optional[bytes]): Digest returned by the previous call, if any.
+
+        Returns:
+            Tuple[bytes, Optional[List[Partition]]]: Digest of the status document
+                and the partitions, None if the digest did not change.
+        """
+        return await self._read_partitions(digest or b"")
+
+    async def _read_partitions(
+        self, digest: Optional[bytes]
+    ) -> Tuple[Optional[bytes], Optional[List[Partition]]]:
         model = await self.get_model()
-        response = await self._get(f"partitions/partitionsStatus{model}.xml")
-        partitions = response.xpath("/partitionsStatus/partition")
-        descriptions: List[str] = await self._get_descriptions(
-            f"partitions/partitionsDescription{model}.xml",
-            "/partitionsDescription/partition",
+        document, descriptions = await asyncio.gather(
+            self._fetch(f"partitions/partitionsStatus{model}.xml", digest=digest),
+            self._get_descriptions(
+                f"partitions/partitionsDescription{model}.xml",
+                PARTITIONS_DESCRIPTION,
+            ),
         )
 
-        return [
+        if document.content is None:
+            return document.digest, None
+
+        return document.digest, [
             Partition(
                 id=index,
                 description=descriptions[index],
                 status=PartitionStatus(partition.text),
             )
-            for index, partition in enumerate(partitions)
+            for index, partition in enumerate(PARTITIONS_STATUS(document.content))
         ]
 
     async def get_scenarios(self) -> List[Scenario]:
@@ -128,23 +283,42 @@ class IpAPI(BaseApi):
         Returns:
             List[Scenario]: List of the scenarios in the alarm system.
         """
-        response = await self._get("scenarios/scenariosOptions.xml")
-        scenarios = response.xpath("/scenariosOptions/scenario")
-        descriptions: List[str] = await self._get_descriptions(
-            "scenarios/scenariosDescription.xml",
-            "/scenariosDescription/scenario",
+        response, descriptions = await asyncio.gather(
+            self._get("scenarios/scenariosOptions.xml"),
+            self._get_descriptions(
+                "scenarios/scenariosDescription.xml",
+                SCENARIOS_DESCRIPTION,
+            ),
         )
+        scenarios = SCENARIOS_OPTIONS(response)
 
         return [
             Scenario(
                 id=index,
                 description=descriptions[index],
-                enabled=scenario.find("abil").text.upper() == "TRUE",
-                no_pin=scenario.find("nopin").text.upper() == "TRUE",
+                enabled=scenario.findtext("abil").upper() == "TRUE",
+                no_pin=scenario.findtext("nopin").upper() == "TRUE",
             )
             for index, scenario in enumerate(scenarios)
         ]
 
+    async def get_all(self) -> Snapshot:
+        """
+        Get zones, partitions and scenarios at once.
+
+        All documents are requested concurrently and the model is only
+        resolved once.
+
+        Returns:
+            Snapshot: Zones, partitions and scenarios of the alarm system.
+        """
+        await self.get_model()
+        zones, partitions, scenarios = await asyncio.gather(
+            self.get_zones(), self.get_partitions(), self.get_scenarios()
+        )
+
+        return Snapshot(zones=zones, partitions=partitions, scenarios=scenarios)
+
     async def activate_scenario(
         self, scenario: int | Scenario, pin: Optional[str]
     ) -> bool:
@@ -208,15 +382,18 @@ class IpAPI(BaseApi):
         Returns:
             str: The model of the alarm system (128IP, 48IP or 16IP)
         """
-        if self._model is None:
-            info = await self.info()
-
-            if info["name"].endswith("128IP"):
-                self._model = "128IP"
-            elif info["name"].endswith("48IP"):
-                self._model = "48IP"
-            else:
-                self._model = "16IP"
+        async with self._model_lock:
+            if self._model is None:
+                info = self._info_cache.get(f"{self._ip}:{self._port}")
+                if info is None:
+                    info = await self.info()
+
+                if info["name"].endswith("128IP"):
+                    self._model = "128IP"
+                elif info["name"].endswith("48IP"):
+                    self._model = "48IP"
+                else:
+                    self._model = "16IP"
 
         return self._model
 
@@ -240,12 +417,12 @@ class IpAPI(BaseApi):
 
         if pin is not None:
             path += f"&pin={pin}"
-            _LOGGER.debug("Sending command %s", path.replace(pin, "PIN"))
-        else:
-            _LOGGER.debug("Sending command %s", path)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Host %s: Sending command %s", self._host, redact(path))
 
         response = await self._get(path)
-        cmd = response.xpath("/cmd")
+        cmd = COMMAND_RESULT(response)
 
         if cmd is None or cmd[0].text != "cmdSent":
             _LOGGER.error("Command send failed: %s", response)
@@ -253,42 +430,152 @@ class IpAPI(BaseApi):
 
         return True
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=self._dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            self._owns_session = True
+
+        return self._session
+
     async def _get(self, path) -> etree.ElementBase:
         """Generic send method."""
+        document = await self._fetch(path)
+        return document.content
+
+    async def _fetch(
+        self, path: str, headers: Optional[dict] = None, digest: Optional[bytes] = None
+    ) -> "_Document":
+        """
+        Get and parse a document.
+
+        Args:
+            path (str): Path of the document below `/xml/`.
+            headers (Optional[dict]): Extra request headers, e.g. for revalidation.
+            digest (Optional[bytes]): When given, the body is hashed while it is parsed
+                and the document is only returned if its digest differs. Pass `b""`
+                to hash without a previous digest.
+
+        Returns:
+            _Document: Response headers, parsed document and digest of the body.
+                The document is None if the panel answered 304 Not Modified or the
+                digest is unchanged.
+        """
         url = f"{self._host}/xml/{path}"
+        metrics = self._metrics
+        if metrics.enabled:
+            # The query is left out, it is unbounded and may hold the PIN
+            endpoint = path.partition("?")[0]
+            metrics.request_started(self._panel, endpoint)
+            started = time.perf_counter()
+        error = None
 
         try:
-            async with aiohttp.ClientSession(auth=self._auth) as session:
-                async with session.get(url=url) as response:
-                    if response.status != 200:
-                        raise aiohttp.ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=response.status,
-                            message=f"Request failed with status {response.status}: {await response.text()}",
-                        )
-
-                    xml = await response.text()
-                    content: etree.ElementBase = etree.fromstring(xml, parser=None)
-                    return content
+            session = self._get_session()
+            async with session.get(url=url, auth=self._auth, headers=headers) as response:
+                if response.status == 304:
+                    return _Document(response.headers.copy(), None, digest)
+
+                if response.status != 200:
+                    raise aiohttp.ClientResponseError(
+                        request_info=response.request_info,
+                        history=response.history,
+                        status=response.status,
+                        message=f"Request failed with status {response.status}: {await response.text()}",
+                    )
+
+                # Feed the body to the parser as it arrives, without building a string,
+                # hashing it alongside when the caller polls by digest
+                parser = etree.XMLParser()
+                hasher = hashlib.blake2b(digest_size=16) if digest is not None else None
+                size, parse_seconds = 0, 0.0
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    parse_started = time.perf_counter()
+                    parser.feed(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    parse_seconds += time.perf_counter() - parse_started
+                    size += len(chunk)
+                content: Optional[etree.ElementBase] = parser.close()
+                if metrics.enabled:
+                    metrics.received(self._panel, endpoint, size, parse_seconds)
+
+                if hasher is None:
+                    return _Document(response.headers.copy(), content, None)
+                body_digest = hasher.digest()
+                return _Document(response.headers.copy(), content if body_digest != digest else None, body_digest)
 
         except aiohttp.ClientConnectorError as conn_err:
+            error = "connection"
             _LOGGER.warning("Host %s: Connection error %s", self._host, str(conn_err))
             raise ConnectionError(
                 "Connector error while getting information from Lares alarm."
             )
+        except asyncio.TimeoutError:
+            error = "timeout"
+            _LOGGER.warning("Host %s: Request timed out", self._host)
+            raise ConnectionError(
+                "Timeout while getting information from Lares alarm."
+            )
+        except aiohttp.ClientResponseError as e:
+            error = f"http_{e.status}"
+            _LOGGER.warning("Host %s: Request failed with status %s", self._host, e.status)
+            raise e
         except BaseException as e:
+            error = type(e).__name__
             _LOGGER.warning("Host %s: Unknown exception occurred", self._host)
             raise e
+        finally:
+            if metrics.enabled:
+                metrics.request_finished(self._panel, endpoint, time.perf_counter() - started, error)
 
-    async def _get_descriptions(self, path: str, element: str) -> List[str]:
-        """Get descriptions"""
-        if path in self._description_cache:
-            return self._description_cache[path]
+    async def _get_descriptions(self, path: str, element: etree.XPath) -> List[str]:
+        """
+        Get descriptions, from the cache while fresh.
 
-        response = await self._get(path)
-        content = response.xpath(element)
-        descriptions: List[str] = [item.text for item in content]
+        Stale entries are revalidated with `If-None-Match`/`If-Modified-Since`
+        when the panel sent an `ETag` or `Last-Modified` header, and are only
+        downloaded again when changed.
+        """
+        key = f"{self._ip}:{self._port}/{path}"
+        cached = self._description_cache.get(key)
+        if cached is not None and self._description_cache.is_fresh(cached):
+            return cached.descriptions
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        document = await self._fetch(path, headers or None)
+        response_headers, response = document.headers, document.content
+        if response is None:
+            entry = CacheEntry(
+                descriptions=cached.descriptions,
+                stored_at=time.time(),
+                etag=response_headers.get("ETag", cached.etag),
+                last_modified=response_headers.get("Last-Modified", cached.last_modified),
+            )
+        else:
+            entry = CacheEntry(
+                descriptions=[intern(item.text) for item in element(response)],
+                stored_at=time.time(),
+                etag=response_headers.get("ETag"),
+                last_modified=response_headers.get("Last-Modified"),
+            )
+
+        self._description_cache.set(key, entry)
+        return entry.descriptions
 
-        self._description_cache[path] = descriptions
-        return descriptions
+    def invalidate_descriptions(self) -> None:
+        """Drop the cached descriptions of this panel, e.g. after zones were renamed."""
+        self._description_cache.invalidate(f"{self._ip}:{self._port}/")
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import random
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+import aiohttp
+from lxml import etree
+
+from .ip_api import IpAPI
+from .types_ip import Change, Partition, PartitionStatus, Zone, ZoneStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTIVE_PARTITION_STATUSES = (
+    PartitionStatus.ARMING,
+    PartitionStatus.PENDING,
+    PartitionStatus.ALARM,
+)
+
+T = TypeVar("T", Zone, Partition)
+
+
+def diff(previous: Sequence[T], current: Sequence[T]) -> List[Change]:
+    """
+    Compare two lists of zones or partitions by ID.
+
+    Args:
+        previous (Sequence): Items of the previous poll.
+        current (Sequence): Items of the current poll.
+
+    Returns:
+        List[Change]: One change for every new or modified item.
+    """
+    known = {item.id: item for item in previous}
+    return [
+        Change(previous=known.get(item.id), current=item)
+        for item in current
+        if known.get(item.id) != item
+    ]
+
+
+class IpPoller:
+    """
+    Poll an `IpAPI` and report only what changed.
+
+    The IP range has no push channel, so the poller keeps the state of the
+    previous poll. Status documents are hashed, so unchanged documents are
+    not diffed. Only status documents are polled: a renamed zone or partition
+    is reported with the next status change of the panel, once its cached
+    descriptions were refreshed.
+    """
+
+    def __init__(self, api: IpAPI) -> None:
+        """
+        Initialize the poller.
+
+        Args:
+            api (IpAPI): API of the panel to poll.
+        """
+        self.api = api
+        self.zones: List[Zone] = []
+        self.partitions: List[Partition] = []
+        self._zones_digest: Optional[bytes] = None
+        self._partitions_digest: Optional[bytes] = None
+        self._listeners: List[Callable[[Change], None]] = []
+
+    def add_listener(self, listener: Callable[[Change], None]) -> None:
+        """Add a listener, called with every change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Change], None]) -> None:
+        """Remove a listener."""
+        self._listeners.remove(listener)
+
+    async def poll(self) -> List[Change]:
+        """
+        Poll zones and partitions once and notify listeners of changes.
+
+        Returns:
+            List[Change]: Changes since the previous poll, everything on the first poll.
+        """
+        (zones_digest, zones), (partitions_digest, partitions) = await asyncio.gather(
+            self.api.get_zones_if_changed(self._zones_digest),
+            self.api.get_partitions_if_changed(self._partitions_digest),
+        )
+
+        changes: List[Change] = []
+        if zones is not None:
+            changes += diff(self.zones, zones)
+            self.zones = zones
+        if partitions is not None:
+            changes += diff(self.partitions, partitions)
+            self.partitions = partitions
+
+        self._zones_digest = zones_digest
+        self._partitions_digest = partitions_digest
+
+        for change in changes:
+            for listener in self._listeners:
+                listener(change)
+
+        return changes
+
+
+class PollScheduler:
+    """
+    Poll many panels with adaptive intervals.
+
+    Each panel is polled by its own `IpPoller`:
+    - every `active_interval` while a partition is arming, pending or in alarm,
+      or a zone is in alarm,
+    - every `idle_interval` while all partitions are disarmed and nothing changed,
+    - every `interval` otherwise.
+
+    Intervals are randomized by `jitter` to avoid synchronized bursts, the
+    number of polls in flight is capped by `max_concurrency`, and panels that
+    fail to connect, time out or return malformed XML are retried with
+    exponential backoff. Other errors are logged and stop polling the panel.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5,
+        active_interval: float = 1,
+        idle_interval: float = 30,
+        max_backoff: float = 300,
+        jitter: float = 0.1,
+        max_concurrency: int = 10,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            interval (float): Seconds between polls of a panel in normal state.
+            active_interval (float): Seconds between polls while a panel is active.
+            idle_interval (float): Seconds between polls while a panel is disarmed and idle.
+            max_backoff (float): Maximum seconds between retries of an unreachable panel.
+            jitter (float): Relative random variation of every interval.
+            max_concurrency (int): Maximum number of polls in flight.
+        """
+        self.interval = interval
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[IpPoller, Optional[asyncio.Task]] = {}
+        self._running = False
+
+    def add(self, api: IpAPI) -> IpPoller:
+        """
+        Add a panel, it is polled right away if the scheduler is running.
+
+        Args:
+            api (IpAPI): API of the panel.
+
+        Returns:
+            IpPoller: Poller of the panel, to add change listeners.
+        """
+        poller = IpPoller(api)
+        self._tasks[poller] = None
+        if self._running:
+            self._tasks[poller] = asyncio.create_task(self._run_panel(poller))
+        return poller
+
+    async def remove(self, poller: IpPoller) -> None:
+        """Stop polling a panel."""
+        task = self._tasks.pop(poller)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def start(self) -> None:
+        """Start polling all panels."""
+        self._running = True
+        for poller, task in self._tasks.items():
+            if task is None:
+                self._tasks[poller] = asyncio.create_task(self._run_panel(poller))
+
+    async def stop(self) -> None:
+        """Stop polling all panels."""
+        self._running = False
+        tasks = [task for task in self._tasks.values() if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = dict.fromkeys(self._tasks)
+
+    def next_interval(self, poller: IpPoller, changes: List[Change]) -> float:
+        """
+        Get the interval until the next poll of a panel.
+
+        Args:
+            poller (IpPoller): Poller of the panel, with the state of the last poll.
+            changes (List[Change]): Changes found by the last poll.
+
+        Returns:
+            float: Seconds until the next poll, before jitter.
+        """
+        if any(partition.status in ACTIVE_PARTITION_STATUSES for partition in poller.partitions) or any(
+            zone.status == ZoneStatus.ALARM for zone in poller.zones
+        ):
+            return self.active_interval
+
+        if not changes and all(
+            partition.status == PartitionStatus.DISARMED for partition in poller.partitions
+        ):
+            return self.idle_interval
+
+        return self.interval
+
+    def backoff_interval(self, failures: int) -> float:
+        """Get the interval until the next try after consecutive connection failures."""
+        return min(self.interval * 2 ** failures, self.max_backoff)
+
+    def _with_jitter(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run_panel(self, poller: IpPoller) -> None:
+        failures = 0
+
+        # Spread the first polls over one interval
+        await asyncio.sleep(random.uniform(0, self.interval))
+
+        while True:
+            try:
+                async with self._semaphore:
+                    changes = await poller.poll()
+                failures = 0
+                delay = self.next_interval(poller, changes)
+            except (ConnectionError, asyncio.TimeoutError, aiohttp.ClientError, etree.XMLSyntaxError) as err:
+                # Truncated documents are retried like connection failures
+                failures += 1
+                delay = self.backoff_interval(failures)
+                _LOGGER.warning(
+                    "Host %s: Poll failed (%s), retrying in %.0f seconds",
+                    poller.api.host,
+                    err,
+                    delay,
+                )
+            except Exception:
+                _LOGGER.exception("Host %s: Polling stopped by unexpected error", poller.api.host)
+                raise
+
+            await asyncio.sleep(self._with_jitter(delay))
@@ -0,0 +1,383 @@
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+import aiohttp
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8000
+DEFAULT_PIN = "123456"
+
+# Zones, partitions and scenarios of each model
+MODELS = {
+    "16IP": (16, 4, 16),
+    "48IP": (48, 8, 32),
+    "128IP": (128, 16, 64),
+}
+
+
+def _document(root: str, elements: List[str]) -> bytes:
+    return f'<?xml version="1.0" encoding="UTF-8"?><{root}>{"".join(elements)}</{root}>'.encode("utf-8")
+
+
+class SimulatedIpPanel:
+    """In-memory state of a simulated Lares 16IP, 48IP or 128IP panel."""
+
+    def __init__(self, model: str = "128IP", pin: str = DEFAULT_PIN, seed: Optional[int] = None) -> None:
+        """
+        Initialize the panel.
+
+        Args:
+            model (str): 16IP, 48IP or 128IP, sets the number of zones, partitions and scenarios.
+            pin (str): PIN accepted for commands.
+            seed (Optional[int]): Seed of the random changes.
+
+        Raises:
+            ValueError: If the model is unknown.
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown model {model}, expected one of {', '.join(MODELS)}")
+
+        zones, partitions, scenarios = MODELS[model]
+        self.model = model
+        self.pin = pin
+        self.random = random.Random(seed)
+        self.zones = [
+            {"description": f"Zone {i + 1}", "status": "NORMAL", "bypass": "UN_BYPASS"} for i in range(zones)
+        ]
+        self.partitions = [{"description": f"Partition {i + 1}", "status": "DISARMED"} for i in range(partitions)]
+        self.scenarios = [
+            {"description": f"Scenario {i + 1}", "enabled": True, "no_pin": i == 0} for i in range(scenarios)
+        ]
+        self._zones_status_path = f"zones/zonesStatus{model}.xml"
+        self._renderers: Dict[str, Callable[[], bytes]] = {
+            "info/generalInfo.xml": self._render_info,
+            self._zones_status_path: self._render_zones_status,
+            f"zones/zonesDescription{model}.xml": self._render_zones_description,
+            f"partitions/partitionsStatus{model}.xml": self._render_partitions_status,
+            f"partitions/partitionsDescription{model}.xml": self._render_partitions_description,
+            "scenarios/scenariosOptions.xml": self._render_scenarios_options,
+            "scenarios/scenariosDescription.xml": self._render_scenarios_description,
+        }
+        self._rendered: Dict[str, bytes] = {}
+
+    def documents(self) -> Dict[str, bytes]:
+        """Render the XML documents of the panel, keyed by path below `/xml/`."""
+        return {path: self.document(path) for path in self._renderers}
+
+    def document(self, path: str) -> Optional[bytes]:
+        """
+        Render a single XML document, None if the path is unknown.
+
+        Bodies are cached until `random_changes` or `execute` change the panel,
+        call `invalidate()` after changing `zones`, `partitions` or `scenarios` directly.
+        """
+        body = self._rendered.get(path)
+        if body is None:
+            render = self._renderers.get(path)
+            if render is None:
+                return None
+            body = self._rendered[path] = render()
+        return body
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop the cached body of a document, of all documents by default."""
+        if path is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(path, None)
+
+    def _render_info(self) -> bytes:
+        return _document(
+            "generalInfo",
+            [
+                f"<productName>LARES {self.model}</productName>",
+                "<info1>Simulated panel</info1>",
+                "<productHighRevision>1</productHighRevision>",
+                "<productLowRevision>104</productLowRevision>",
+                "<productBuildRevision>2</productBuildRevision>",
+            ],
+        )
+
+    def _render_zones_status(self) -> bytes:
+        return _document(
+            "zonesStatus",
+            [f"<zone><status>{zone['status']}</status><bypass>{zone['bypass']}</bypass></zone>" for zone in self.zones],
+        )
+
+    def _render_zones_description(self) -> bytes:
+        return _document("zonesDescription", [f"<zone>{escape(zone['description'])}</zone>" for zone in self.zones])
+
+    def _render_partitions_status(self) -> bytes:
+        return _document(
+            "partitionsStatus", [f"<partition>{partition['status']}</partition>" for partition in self.partitions]
+        )
+
+    def _render_partitions_description(self) -> bytes:
+        return _document(
+            "partitionsDescription",
+            [f"<partition>{escape(partition['description'])}</partition>" for partition in self.partitions],
+        )
+
+    def _render_scenarios_options(self) -> bytes:
+        return _document(
+            "scenariosOptions",
+            [
+                f"<scenario><abil>{str(scenario['enabled']).upper()}</abil>"
+                f"<nopin>{str(scenario['no_pin']).upper()}</nopin></scenario>"
+                for scenario in self.scenarios
+            ],
+        )
+
+    def _render_scenarios_description(self) -> bytes:
+        return _document(
+            "scenariosDescription",
+            [f"<scenario>{escape(scenario['description'])}</scenario>" for scenario in self.scenarios],
+        )
+
+    def random_changes(self, count: int = 1) -> None:
+        """Toggle the alarm status of `count` random zones."""
+        for zone in self.random.choices(self.zones, k=count):
+            zone["status"] = "ALARM" if zone["status"] == "NORMAL" else "NORMAL"
+        self.invalidate(self._zones_status_path)
+
+    def execute(self, command: str, query: Dict[str, str]) -> bool:
+        """
+        Execute a command of `cmd/cmdOk.xml`.
+
+        Returns:
+            bool: True if the command was accepted.
+        """
+        if command == "setMacro":
+            index = int(query.get("macroId", -1))
+            if not 0 <= index < len(self.scenarios):
+                return False
+            scenario = self.scenarios[index]
+            return scenario["enabled"] and (scenario["no_pin"] or query.get("pin") == self.pin)
+
+        if command == "setByPassZone":
+            index = int(query.get("zoneId", 0)) - 1
+            if not 0 <= index < len(self.zones) or query.get("pin") != self.pin:
+                return False
+            self.zones[index]["bypass"] = "BYPASS" if query.get("zoneValue") == "1" else "UN_BYPASS"
+            self.invalidate(self._zones_status_path)
+            return True
+
+        return False
+
+
+class IpSimulator:
+    """
+    HTTP server serving the XML interface of Lares IP panels.
+
+    Every panel listens on its own port, on consecutive ports from `port`
+    or on free ports when `port` is 0, all served by a single aiohttp
+    application. Requests need basic auth. Latency and server errors can
+    be injected, and zones change randomly at `change_rate`. Description
+    documents carry an `ETag` and answer revalidations with 304.
+    """
+
+    def __init__(
+        self,
+        panels: Optional[List[SimulatedIpPanel]] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        username: str = "admin",
+        password: str = "admin",
+        latency: float = 0,
+        error_rate: float = 0,
+        change_rate: float = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the simulator.
+
+        Args:
+            panels (Optional[List[SimulatedIpPanel]]): Panels to serve, one 128IP panel when None.
+            host (str): Address to listen on.
+            port (int): Port of the first panel, 0 for free ports.
+            username (str): Basic auth user name.
+            password (str): Basic auth password.
+            latency (float): Seconds to wait before each response.
+            error_rate (float): Fraction of requests answered with 500 Internal Server Error.
+            change_rate (float): Random zone changes per second, spread over the panels.
+            seed (Optional[int]): Seed of the error injection and the random changes.
+        """
+        self.panels = panels or [SimulatedIpPanel()]
+        self.host = host
+        self.port = port
+        self.ports: List[int] = []
+        self.latency = latency
+        self.error_rate = error_rate
+        self.change_rate = change_rate
+        self.username = username
+        self.password = password
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self._auth = aiohttp.BasicAuth(username, password).encode()
+        self._random = random.Random(seed)
+        self._panel_by_port: Dict[int, SimulatedIpPanel] = {}
+        # ETags by port and document, reused while the panel returns the same cached body
+        self._etags: Dict[Tuple[int, str], Tuple[bytes, str]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._generator: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start serving all panels, `ports` lists their ports."""
+        app = web.Application()
+        app.router.add_get("/xml/{path:.+}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+
+        for index, panel in enumerate(self.panels):
+            site = web.TCPSite(self._runner, self.host, self.port + index if self.port else 0, backlog=1024)
+            await site.start()
+            port = self._runner.addresses[-1][1]
+            self.ports.append(port)
+            self._panel_by_port[port] = panel
+
+        if self.change_rate > 0:
+            self._generator = asyncio.create_task(self._generate())
+
+    async def stop(self) -> None:
+        """Stop the change generator and the server."""
+        if self._generator is not None:
+            self._generator.cancel()
+            await asyncio.gather(self._generator, return_exceptions=True)
+            self._generator = None
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.ports = []
+            self._panel_by_port = {}
+            self._etags = {}
+
+    async def __aenter__(self) -> "IpSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def configs(self, **kwargs) -> List[dict]:
+        """
+        Get `IpAPI` configurations for all panels.
+
+        Args:
+            **kwargs: Further configuration keys, e.g. `timeout`.
+        """
+        return [
+            {
+                "host": self.host,
+                "port": port,
+                "username": self.username,
+                "password": self.password,
+                "resolve_mac": False,
+                **kwargs,
+            }
+            for port in self.ports
+        ]
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        port = request.transport.get_extra_info("sockname")[1]
+        panel = self._panel_by_port[port]
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if request.headers.get("Authorization") != self._auth:
+            return web.Response(status=401, headers={"WWW-Authenticate": 'Basic realm="Lares"'})
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="Simulated error")
+
+        path = request.match_info["path"]
+        if path == "cmd/cmdOk.xml":
+            if not panel.execute(request.query.get("cmd", ""), request.query):
+                raise web.HTTPFound(request.query.get("redirectPage", "/xml/cmd/cmdError.xml"))
+            return web.Response(body=_document("cmd", ["cmdSent"]), content_type="text/xml")
+        if path == "cmd/cmdError.xml":
+            return web.Response(body=_document("cmd", ["cmdError"]), content_type="text/xml")
+
+        body = panel.document(path)
+        if body is None:
+            raise web.HTTPNotFound()
+
+        if "Description" not in path:
+            return web.Response(body=body, content_type="text/xml")
+
+        cached = self._etags.get((port, path))
+        if cached is not None and cached[0] is body:
+            etag = cached[1]
+        else:
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            self._etags[port, path] = (body, etag)
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="text/xml", headers={"ETag": etag})
+
+    async def _generate(self) -> None:
+        """Apply random zone changes at `change_rate`."""
+        interval = 1 / self.change_rate
+        while True:
+            await asyncio.sleep(interval)
+            self._random.choice(self.panels).random_changes()
+
+
+async def serve(simulator: IpSimulator) -> None:
+    """Run a simulator until cancelled."""
+    async with simulator:
+        _LOGGER.info(
+            "Simulating %d Lares IP panels on %s, ports %d-%d",
+            len(simulator.panels), simulator.host, simulator.ports[0], simulator.ports[-1],
+        )
+        await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point, `python -m ksenia_lares.ip_simulator --help`."""
+    parser = argparse.ArgumentParser(description="Simulate Lares IP panels for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port of the first panel")
+    parser.add_argument("--panels", type=int, default=1, help="number of panels, on consecutive ports")
+    parser.add_argument("--model", choices=MODELS, default="128IP")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--pin", default=DEFAULT_PIN)
+    parser.add_argument("--latency", type=float, default=0, help="seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests failing with 500")
+    parser.add_argument("--change-rate", type=float, default=0, help="random zone changes per second")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = IpSimulator(
+        [SimulatedIpPanel(args.model, args.pin, args.seed) for _ in range(args.panels)],
+        host=args.host,
+        port=args.port,
+        username=args.username,
+        password=args.password,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(serve(simulator))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
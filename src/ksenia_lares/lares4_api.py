@@ -1,81 +1,190 @@
-import datetime
-from operator import ge
+import binascii
+import functools
 import aiohttp
 import json
+import re
 import ssl
 import time
 import asyncio
+import inspect
+import logging
+
+from typing import Any, Callable, List
+
+from .codec import JsonCodec, get_codec
+from .lares4_events import Coalescer, EventQueue, OverflowPolicy
+from .metrics import NOOP_METRICS, Metrics
+from .readers import get_reader, read_raw
+from .tracing import TraceBuffer, redact
+from .types_lares4 import (
+    BusPeripheral,
+    BusPeripheralStatus,
+    EventType,
+    Model,
+    Output,
+    OutputStatus,
+    ReadType,
+    Snapshot,
+    SystemStatus,
+    TemperatureStatus,
+    Zone,
+    ZoneBypass,
+    Partition,
+    Scenario,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_COMMAND_TIMEOUT = 10
+
+SNAPSHOT_FIELDS = {
+    ReadType.OUTPUTS: "outputs",
+    ReadType.PERIPHERALS: "peripherals",
+    ReadType.SCENARIOS: "scenarios",
+    ReadType.STATUS_OUTPUTS: "outputs_status",
+    ReadType.STATUS_SYSTEMS: "systems_status",
+    ReadType.STATUS_PERIPHERALS: "peripherals_status",
+    ReadType.STATUS_TEMPERATURES: "temperatures_status",
+    ReadType.STATUS_ZONES: "zones",
+    ReadType.STATUS_PARTITIONS: "partitions",
+}
+
+CRC16_FIELD = b'"CRC_16"'
+CRC16_INIT = 0x1D0F
+CRC16_PLACEHOLDER = "0x0000"
+_CRC16_VALUE = re.compile(rb'"CRC_16"\s*:\s*"(0x[0-9a-fA-F]{4})"')
+
+
+def crc16_bytes(data: bytes) -> str:
+    """
+    Compute the CRC-16 of an encoded frame.
+
+    The checksum covers every byte up to and including the `"CRC_16"` key.
+    The panel shifts message bits straight into a 0xFFFF register without
+    augmenting zero bytes, which is the same as the direct CCITT algorithm
+    seeded with 0x1D0F over all but the last two bytes, XORed with those two
+    bytes. That lets us use the table-driven `binascii.crc_hqx`.
+
+    Args:
+        data (bytes): UTF-8 encoded JSON frame containing a `CRC_16` key.
+
+    Returns:
+        str: The checksum formatted as `0x` followed by four hex digits.
+
+    Raises:
+        ValueError: If the frame does not contain a `CRC_16` key.
+    """
+    end = data.rfind(CRC16_FIELD)
+    if end < 0:
+        raise ValueError("Frame does not contain a CRC_16 field")
+
+    end += len(CRC16_FIELD)
+    crc = binascii.crc_hqx(data[: end - 2], CRC16_INIT) ^ int.from_bytes(data[end - 2 : end], "big")
+    return f"0x{crc:04x}"
+
+
+def crc16(e: str) -> str:
+    """Compute the CRC-16 of a JSON frame given as text."""
+    return crc16_bytes(e.encode("utf-8"))
+
+
+def verify_crc16(frame: str | bytes) -> bool:
+    """
+    Check the `CRC_16` value of an inbound frame.
+
+    Args:
+        frame (str | bytes): Raw JSON frame as received from the panel.
+
+    Returns:
+        bool: True if the frame carries a CRC_16 matching its content.
+    """
+    data = frame.encode("utf-8") if isinstance(frame, str) else frame
+    match = _CRC16_VALUE.search(data)
+    if match is None:
+        return False
+    return crc16_bytes(data) == match.group(1).decode("ascii").lower()
 
-from typing import Callable, List
 
-import ksenia_lares
-from ksenia_lares.readers import read_outputs, read_outputs_status, read_partitions_status, read_peripherals, read_peripherals_status, read_scenarios, read_systems_status, read_temperatures_status, read_zones_status
-import ksenia_lares.readers
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    SSL context that resumes the TLS session of the last connection to a host.
 
-from .types_lares4 import BusPeripheral, BusPeripheralStatus, BusPeripheralType, DomusStatus, EventType, LinkStatus, Model, Output, OutputStatus, ReadCallable, ReadType, SystemArmStatus, SystemStatus, SystemTemperatureStatus, SystemTimeStatus, TemperatureStatus, ThermostatMode, ThermostatSeason, ThermostatStatus, Zone, ZoneBypass, ZoneStatus, Partition, Scenario
+    asyncio has no way to pass a session to a new connection, so the context
+    remembers the SSL object of the last connection per host name and hands
+    its session to the next one. Reconnects then skip the full handshake,
+    which is slow on the embedded CPU of the panels.
+    """
 
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> None:
+        super().__init__()
+        self._last_connections: dict[str, ssl.SSLObject] = {}
 
-def u(e):
-    t = []
-    for n in range(0, len(e)):
-        r = ord(e[n])
-        if r < 128:
-            t.append(r)
-        else:
-            if r < 2048:
-                t.append(192 | r >> 6)
-                t.append(128 | 63 & r)
-            else:
-                if r < 55296 or r >= 57344:
-                    t.append(224 | r >> 12)
-                    t.append(128 | r >> 6 & 63)
-                    t.append(128 | 63 & r)
-                else:
-                    n = n + 1
-                    r = 65536 + ((1023 & r) << 10 | 1023 & ord(e[n]))
-                    t.append(240 | r >> 18)
-                    t.append(128 | r >> 12 & 63)
-                    t.append(128 | r >> 6 & 63)
-                    t.append(128 | 63 & r)
-        n = n + 1
-
-    return t
-
-def crc16(e):
-    i = u(e)
-    l = e.rfind('"CRC_16"') + len('"CRC_16"') + (len(i) - len(e))
-    r = 65535
-    s = 0
-    while s < l:
-        t = 128
-        o = i[s]
-        while t:
-            if 32768 & r:
-                n = 1
-            else:
-                n = 0
-            r <<= 1
-            r &= 65535
-            if o & t:
-                r = r + 1
-            if n:
-                r = r ^ 4129
-            t >>= 1
-        s = s + 1
-    return "0x" + format(r, "04x")
-
-def get_ssl_context():
-    ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
-    ctx.options |= ssl.OP_LEGACY_SERVER_CONNECT
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side and server_hostname in self._last_connections:
+            session = self._last_connections[server_hostname].session
+
+        sslobj = super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session
+        )
+        if not server_side and server_hostname is not None:
+            self._last_connections[server_hostname] = sslobj
+        return sslobj
+
+
+@functools.lru_cache(maxsize=None)
+def get_ssl_context(verify: bool = False, cafile: str | None = None) -> ssl.SSLContext:
+    """
+    Get the SSL context for connecting to panels.
+
+    Contexts are built once per configuration and shared, so connects do not
+    reload certificates and can resume TLS sessions.
+
+    Args:
+        verify (bool): Verify the panel certificate against the system CAs and host name.
+        cafile (str | None): Pinned panel certificate(s) in PEM format, only these are
+            trusted. The host name is not checked, as panels are usually reached by IP.
+
+    Returns:
+        ssl.SSLContext: The shared context.
+    """
+    ctx = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if cafile is not None:
+        ctx.check_hostname = False
+        ctx.load_verify_locations(cafile=cafile)
+    elif verify:
+        ctx.load_default_certs(ssl.Purpose.SERVER_AUTH)
+    else:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    # Exposed by the ssl module from Python 3.12, 0x4 is the OpenSSL value
+    ctx.options |= getattr(ssl, "OP_LEGACY_SERVER_CONNECT", 0x4)
     return ctx
 
+
+def encode_frame(frame: dict, codec: JsonCodec) -> bytes:
+    """
+    Serialize a frame ending with the CRC placeholder and sign it.
+
+    The CRC is computed over the serialized bytes and written over the
+    placeholder value, which is the last value of the frame. The frame's
+    `CRC_16` is updated too.
+    """
+    data = bytearray(codec.dumps(frame))
+
+    crc = crc16_bytes(data)
+    position = data.rfind(CRC16_PLACEHOLDER.encode("ascii"))
+    data[position : position + len(CRC16_PLACEHOLDER)] = crc.encode("ascii")
+    frame["CRC_16"] = crc
+
+    return bytes(data)
+
+
 class CommandFactory:
     def __init__(self, sender: str, pin: str) -> None:
         self._command_id = 0
         self._sender = sender
         self._pin = pin
+        self._login_id = None
 
     def get_sender(self) -> str:
         return self._sender
@@ -103,10 +212,10 @@ class CommandFactory:
             **({"PIN": self.get_pin()} if "PIN" in payload else {}),
         }
 
-    def build_command(self, cmd: str, payload_type: str, payload: dict) -> dict:
+    def _new_command(self, cmd: str, payload_type: str, payload: dict) -> dict:
         timestamp = str(int(time.time()))
 
-        command = {
+        return {
             "SENDER": self.get_sender(),
             "RECEIVER": "",
             "CMD": cmd,
@@ -114,58 +223,251 @@ class CommandFactory:
             "PAYLOAD_TYPE": payload_type,
             "PAYLOAD": self.build_payload(payload),
             "TIMESTAMP": f"{timestamp}",
-            "CRC_16": "0x0000",
+            "CRC_16": CRC16_PLACEHOLDER,
         }
 
+    def build_command(self, cmd: str, payload_type: str, payload: dict) -> dict:
+        command = self._new_command(cmd, payload_type, payload)
         command["CRC_16"] = crc16(json.dumps(command))
 
         return command
 
+    def encode_command(self, cmd: str, payload_type: str, payload: dict, codec: JsonCodec) -> tuple[dict, bytes]:
+        """
+        Build a command and serialize it exactly once, see `encode_frame`.
+
+        Returns:
+            tuple[dict, bytes]: The command and the frame to send as-is.
+        """
+        command = self._new_command(cmd, payload_type, payload)
+
+        return command, encode_frame(command, codec)
+
 class Lares4API:
-    def __init__(self, data, model: Model = Model.LARES_4):
+    def __init__(
+        self,
+        data,
+        model: Model = Model.LARES_4,
+        verify_crc: bool = False,
+        timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        max_age: float = 0,
+        queue_size: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        coalesce_window: float = 0,
+        codec: JsonCodec | None = None,
+        metrics: Metrics | None = None,
+        trace_size: int = 0,
+        executor_threshold: int = 0,
+    ):
         if not all(key in data for key in ("url", "pin", "sender")):
             raise ValueError(
                 "Missing one or more of the following keys: host, pin, sender"
             )
         self.url = data["url"]
         self.host = f"wss://{data['url']}/KseniaWsock"
+        self.verify_ssl = data.get("verify_ssl", False)
+        self.cafile = data.get("cafile")
         self.model = model
         self.command_factory = CommandFactory(data["sender"], data["pin"])
         self.is_running = False
-
+        self.verify_crc = verify_crc
+        self.codec = codec if codec is not None else get_codec()
+        self.timeout = timeout
+        self.max_age = max_age
+        # Parse READ payloads of at least this many entries in the default executor
+        self.executor_threshold = executor_threshold
+        self.metrics = metrics if metrics is not None else NOOP_METRICS
+        # Recent frames for diagnostics, PINs are redacted when read
+        self.trace = TraceBuffer(trace_size) if trace_size > 0 else None
+
+        self.session = None
+        self._owns_session = False
+        self.ws = None
         self.event_listeners: dict[EventType, list[Callable]] = {}
 
-    async def connect(self):
-        self.session = aiohttp.ClientSession()
-        self.ws = await self.session.ws_connect(
-            self.host, protocols=["KS_WSOCK"], ssl_context=get_ssl_context()
+        self._typed_listeners: set[tuple[EventType, Callable]] = set()
+        # Events registered on the current connection
+        self._registered: set[EventType] = set()
+        # Merged entries by type and ID, realtime changes of typed listeners are partial
+        self._typed_state: dict[str, dict[Any, dict]] = {}
+        self._dispatch: dict[str, list[tuple[Callable, bool]]] = {}
+        self._listener_tasks: set[asyncio.Task] = set()
+        self.coalescer = Coalescer(coalesce_window, self._dispatch_changes) if coalesce_window > 0 else None
+
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self._pending: dict[str, asyncio.Future] = {}
+        self._events = EventQueue(queue_size, overflow)
+        self._reader_task: asyncio.Task | None = None
+        self._snapshot: Snapshot | None = None
+        self._closing = False
+
+    async def connect(self, session: aiohttp.ClientSession | None = None, ssl_context: ssl.SSLContext | None = None):
+        """
+        Open the websocket to the panel.
+
+        Args:
+            session (aiohttp.ClientSession | None): Shared session to connect with,
+                it is not closed by `close()`. A new session is created by default.
+            ssl_context (ssl.SSLContext | None): SSL context to use instead of the default one.
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else aiohttp.ClientSession()
+        ws = await self.session.ws_connect(
+            self.host, protocols=["KS_WSOCK"], ssl_context=ssl_context or get_ssl_context(self.verify_ssl, self.cafile)
         )
-        print(f"Connected to {self.url}")
+        _LOGGER.debug("Host %s: Connected", self.url)
+        self._attach(ws)
+
+    def _attach(self, ws) -> None:
+        """Start the background reader on a freshly opened websocket."""
+        self.ws = ws
         self.is_running = True
-                
-    async def command(self, cmd: str, payload_type: str, payload: dict) -> dict | None:
-        send_command = asyncio.create_task(self.send_command(cmd, payload_type, payload))
-        receive_command = asyncio.create_task(self.receive_command())
-        _, response = await asyncio.gather(send_command, receive_command)
-        return response 
-        
-    async def send_command(self, cmd: str, payload_type: str, payload: dict):
+        self._registered = set()
+        self._events = EventQueue(self.queue_size, self.overflow)
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """
+        Read every inbound frame and route it.
+
+        Responses (`*_RES`) are matched by `ID` to the future of the request
+        waiting for them, everything else (e.g. REALTIME pushes) is queued
+        for `listen()` and `receive_command()`.
+        """
+        try:
+            async for msg in self.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                if self.trace is not None:
+                    self.trace.record("in", msg.data)
+
+                try:
+                    if self.metrics.enabled:
+                        parse_started = time.perf_counter()
+                        data = self.decode_frame(msg.data)
+                        self.metrics.received(
+                            self.url,
+                            data.get("CMD", "").removesuffix("_RES"),
+                            len(msg.data),
+                            time.perf_counter() - parse_started,
+                        )
+                    else:
+                        data = self.decode_frame(msg.data)
+                except ValueError as err:
+                    _LOGGER.warning("Host %s: Dropping frame, %s", self.url, err)
+                    continue
+
+                future = None
+                if data.get("CMD", "").endswith("_RES"):
+                    future = self._pending.pop(data.get("ID"), None)
+
+                if future is not None:
+                    if not future.done():
+                        future.set_result(data)
+                else:
+                    self._events.put_nowait(data)
+        finally:
+            self.is_running = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+            self._pending.clear()
+            self._events.put_nowait(None)
+
+    async def command(self, cmd: str, payload_type: str, payload: dict, timeout: float | None = None) -> dict | None:
+        """
+        Send a command and wait for the response carrying the same `ID`.
+
+        Any number of commands can be in flight at the same time.
+
+        Args:
+            cmd (str): Command, e.g. `READ` or `CMD_USR`.
+            payload_type (str): Type of the payload.
+            payload (dict): Payload of the command.
+            timeout (float | None): Seconds to wait for the response, defaults to `timeout` of the API.
+
+        Returns:
+            dict | None: The response frame.
+
+        Raises:
+            asyncio.TimeoutError: If no response arrives in time.
+            ConnectionError: If the websocket closes while waiting.
+        """
+        if not self.is_running:
+            raise Exception("WebSocket is not connected")
+
+        command, frame = self.command_factory.encode_command(cmd, payload_type, payload, self.codec)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command["ID"]] = future
+        if self.metrics.enabled:
+            self.metrics.request_started(self.url, cmd)
+            started = time.perf_counter()
+        error = None
+
+        try:
+            await self._send(command, frame)
+            return await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            error = "timeout"
+            raise
+        except BaseException as err:
+            error = type(err).__name__
+            raise
+        finally:
+            self._pending.pop(command["ID"], None)
+            if self.metrics.enabled:
+                self.metrics.request_finished(self.url, cmd, time.perf_counter() - started, error)
+
+    async def send_command(self, cmd: str, payload_type: str, payload: dict) -> dict:
+        """Send a command without waiting for its response."""
+        command, frame = self.command_factory.encode_command(cmd, payload_type, payload, self.codec)
+        await self._send(command, frame)
+        return command
+
+    async def _send(self, command: dict, frame: bytes) -> None:
         if self.ws:
-            command = self.command_factory.build_command(cmd, payload_type, payload)
-            print(f"Sending command: {command}")
-            await self.ws.send_json(command)
+            if self.metrics.enabled:
+                self.metrics.sent(self.url, command["CMD"], len(frame))
+            if self.trace is not None:
+                self.trace.record("out", frame)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Host %s: Sending %s", self.url, redact(frame.decode("utf-8")))
+            if hasattr(self.ws, "send_frame"):
+                await self.ws.send_frame(frame, aiohttp.WSMsgType.TEXT)
+            else:
+                await self.ws.send_str(frame.decode("utf-8"))
         else:
             raise Exception("WebSocket is not connected")
-        
+
     async def receive_command(self) -> dict | None:
+        """
+        Wait for the next frame that is not a response to a pending command.
+
+        Responses to `send_command()` are received here as before, but the
+        responses to `command()` are delivered to their caller instead.
+        """
         if self.ws:
-            msg = await self.ws.receive_json()
-            return msg
+            return await self._events.get()
         else:
             raise Exception("WebSocket is not connected")
-        
-    async def get(self, read_types: list[ReadType]) -> list[dict]:
-        await self.send_command(
+
+    def decode_frame(self, frame: str) -> dict:
+        if self.verify_crc and not verify_crc16(frame):
+            raise ValueError("Received frame with invalid CRC_16")
+        return self.codec.loads(frame)
+
+    async def read(self, read_types: list[ReadType]) -> dict:
+        """
+        Read the raw payload of one or more types in a single MULTI_TYPES request.
+
+        Args:
+            read_types (list[ReadType]): Types to read.
+
+        Returns:
+            dict: The response payload, with one key per requested type.
+        """
+        response = await self.command(
             "READ",
             "MULTI_TYPES",
             {
@@ -175,15 +477,21 @@ class Lares4API:
             }
         )
 
+        if not response or response["PAYLOAD"]["RESULT"] != "OK":
+            raise Exception("Failed to read " + ", ".join(read_type.value for read_type in read_types))
+
+        return response["PAYLOAD"]
+
+    async def get(self, read_types: list[ReadType]) -> list[dict]:
+        payload = await self.read(read_types)
+
         results = []
-        response = await self.receive_command()
-        
-        if response and response["PAYLOAD"]["RESULT"] == "OK":
-            for read_type in read_types:
-                print(f"Reading {read_type.value}")
-                print(ReadCallable[read_type.value])
-                callable = getattr(ksenia_lares.readers, ReadCallable[read_type.value].value)
-                results.append(callable(response["PAYLOAD"][read_type.value]))
+        for read_type in read_types:
+            reader, entries = get_reader(read_type), payload[read_type.value]
+            if 0 < self.executor_threshold <= len(entries):
+                results.append(await asyncio.get_running_loop().run_in_executor(None, reader, entries))
+            else:
+                results.append(reader(entries))
 
         return results
 
@@ -192,26 +500,129 @@ class Lares4API:
 
         if self.ws:
             for _ in range(len):
-                msg = await self.ws.receive_json()
-                print(f"Received command: {msg}")
+                msg = await self.receive_command()
+                _LOGGER.debug("Host %s: Received %s", self.url, msg)
                 results.append(msg)
             return results
         else:
             raise Exception("WebSocket is not connected")
 
     async def close(self):
+        self._closing = True
+        await self._disconnect()
+
+        tasks = list(self._listener_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _disconnect(self) -> None:
         self.is_running = False
         if self.ws:
             await self.ws.close()
-        if self.session:
+        if self._reader_task:
+            await self._reader_task
+            self._reader_task = None
+        if self.session and self._owns_session:
             await self.session.close()
 
+    async def supervise(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        initial_backoff: float = 1,
+        max_backoff: float = 60,
+    ) -> None:
+        """
+        Keep the panel connected until `close()` is called.
+
+        Connects, logs in, registers all event listeners and listens for
+        events. When the websocket drops, it reconnects with exponential
+        backoff, logs in again, replays the REALTIME registration of all
+        `event_listeners` and delivers a full READ of their types to the
+        listeners, so no state change is missed while disconnected.
+
+        Args:
+            session (aiohttp.ClientSession | None): Shared session to connect with.
+            ssl_context (ssl.SSLContext | None): SSL context to use instead of the default one.
+            initial_backoff (float): Seconds to wait before the first reconnect.
+            max_backoff (float): Maximum seconds to wait between reconnects.
+        """
+        self._closing = False
+        backoff = initial_backoff
+        resync = False
+
+        while not self._closing:
+            try:
+                await self.connect(session=session, ssl_context=ssl_context)
+                await self.login()
+                if self.event_listeners:
+                    await self._register_events(list(self.event_listeners))
+                    if resync:
+                        await self._resync()
+                    else:
+                        await self._seed_typed({event for event, _ in self._typed_listeners})
+
+                backoff = initial_backoff
+                resync = True
+                await self.listen()
+            except Exception as err:
+                _LOGGER.warning("Host %s: Connection lost, %s", self.url, err)
+            finally:
+                await self._disconnect()
+
+            if not self._closing:
+                _LOGGER.info("Host %s: Reconnecting in %s seconds", self.url, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff)
+
+    async def _register_events(self, events: list[EventType]) -> None:
+        response = await self.command(
+            "REALTIME",
+            "REGISTER",
+            {"ID_LOGIN": True, "TYPES": [event.value for event in events]},
+        )
+
+        if not response or response["PAYLOAD"]["RESULT"] != "OK":
+            raise Exception("Failed to register event listener")
+        self._registered.update(events)
+
+    async def _register_pending(self) -> None:
+        """Register the events of listeners added while not connected."""
+        pending = [event for event in self.event_listeners if event not in self._registered]
+        if pending:
+            await self._register_events(pending)
+            typed = {event for event, _ in self._typed_listeners if event in pending}
+            await self._seed_typed({event for event in typed if event.value not in self._typed_state})
+
+    async def _resync(self) -> None:
+        """Deliver the full current state of all listened types to their listeners."""
+        events = list(self.event_listeners)
+        payload = await self.read([ReadType(event.value) for event in events])
+
+        self._dispatch_changes({event.value: payload[event.value] for event in events if event.value in payload})
+
+    async def _seed_typed(self, events: set[EventType]) -> None:
+        """Read the full state of the types of typed listeners, which their partial changes are merged into."""
+        events = [event for event in events if get_reader(event) is not read_raw]
+        if not events:
+            return
+
+        payload = await self.read([ReadType(event.value) for event in events])
+        for event in events:
+            if event.value in payload:
+                self._typed_state[event.value] = {entry.get("ID"): dict(entry) for entry in payload[event.value]}
+
     async def login(self):
-        send_login = asyncio.create_task(self.send_login())
-        receive_login = asyncio.create_task(self.receive_login())
-        await asyncio.gather(send_login, receive_login)
+        response = await self.command(
+            "LOGIN",
+            "UNKNOWN" if self.model == Model.LARES_4 else "USER",
+            { "PIN": True }
+        )
+        self._set_login(response)
 
     async def send_login(self):
+        """Send the login without waiting for it, kept for compatibility, prefer `login()`."""
         await self.send_command(
             "LOGIN",
             "UNKNOWN" if self.model == Model.LARES_4 else "USER",
@@ -219,79 +630,77 @@ class Lares4API:
         )
 
     async def receive_login(self, timeout: float = 0.7):
-        if self.ws:
-            msg = await asyncio.wait_for(self.ws.receive(), timeout=timeout)
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                data = json.loads(msg.data)
-                if data["CMD"] == "LOGIN_RES":
-                    self.command_factory.set_login_id(data["PAYLOAD"]["ID_LOGIN"])
-                else:
-                    raise Exception("Login failed")
+        """Wait for the response to `send_login()`, kept for compatibility, prefer `login()`."""
+        self._set_login(await asyncio.wait_for(self.receive_command(), timeout=timeout))
+
+    def _set_login(self, response: dict | None) -> None:
+        if response and response["CMD"] == "LOGIN_RES":
+            self.command_factory.set_login_id(response["PAYLOAD"]["ID_LOGIN"])
         else:
-            raise Exception("WebSocket is not connected")
+            raise Exception("Login failed")
+
+    async def snapshot(self, types: list[ReadType] | None = None) -> Snapshot:
+        """
+        Read several types in a single round trip.
+
+        The result is kept as the latest snapshot, from which the individual
+        getters are served while it is younger than `max_age`.
+
+        Args:
+            types (list[ReadType] | None): Types to read, all types by default.
+
+        Returns:
+            Snapshot: The parsed lists, `None` for types that were not requested.
+        """
+        read_types = list(types) if types is not None else list(ReadType)
+        results = await self.get(read_types)
+
+        snapshot = Snapshot(
+            taken_at=time.monotonic(),
+            **{SNAPSHOT_FIELDS[read_type]: result for read_type, result in zip(read_types, results)},
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    async def _get_type(self, read_type: ReadType) -> list:
+        field = SNAPSHOT_FIELDS[read_type]
+        snapshot = self._snapshot
+
+        if (
+            snapshot is not None
+            and getattr(snapshot, field) is not None
+            and time.monotonic() - snapshot.taken_at < self.max_age
+        ):
+            return getattr(snapshot, field)
+
+        return (await self.get([read_type]))[0]
 
     async def get_zones(self) -> List[Zone]:
-        zones_response = await self.get([ReadType.STATUS_ZONES])
-        if zones_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_zones_status(zones_response[0]["PAYLOAD"][ReadType.STATUS_ZONES.value])
-        else:
-            raise Exception("Failed to get zones")
-    
+        return await self._get_type(ReadType.STATUS_ZONES)
+
     async def get_partitions(self) -> List[Partition]:
-        partitions_response = await self.get([ReadType.STATUS_PARTITIONS])
-        if partitions_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_partitions_status(partitions_response[0]["PAYLOAD"][ReadType.STATUS_PARTITIONS.value])
-        else:
-            raise Exception("Failed to get partitions")
+        return await self._get_type(ReadType.STATUS_PARTITIONS)
 
-    async def get_scenarios(self):
-        scenarios_response = await self.get([ReadType.SCENARIOS])
-        if scenarios_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_scenarios(scenarios_response[0]["PAYLOAD"][ReadType.SCENARIOS.value])
-        else:
-            raise Exception("Failed to get scenarios")
+    async def get_scenarios(self) -> List[Scenario]:
+        return await self._get_type(ReadType.SCENARIOS)
 
     async def get_outputs(self) -> list[Output]:
-        outputs_response = await self.get([ReadType.OUTPUTS])
-        if outputs_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_outputs(outputs_response[0]["PAYLOAD"][ReadType.OUTPUTS.value])
-        else:
-            raise Exception("Failed to get outputs")
-    
+        return await self._get_type(ReadType.OUTPUTS)
+
     async def get_peripherals(self) -> List[BusPeripheral]:
-        bus_peripherals_response = await self.get([ReadType.PERIPHERALS])
-        if bus_peripherals_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_peripherals(bus_peripherals_response[0]["PAYLOAD"][ReadType.PERIPHERALS.value])
-        else:
-            raise Exception("Failed to get bus peripherals")
-    
+        return await self._get_type(ReadType.PERIPHERALS)
+
     async def get_outputs_status(self) -> list[OutputStatus]:
-        outputs_status_response = await self.get([ReadType.STATUS_OUTPUTS])
-        if outputs_status_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_outputs_status(outputs_status_response[0]["PAYLOAD"][ReadType.STATUS_OUTPUTS.value])
-        else:
-            raise Exception("Failed to get outputs status")
-    
+        return await self._get_type(ReadType.STATUS_OUTPUTS)
+
     async def get_systems_status(self) -> list[SystemStatus]:
-        systems_status_response = await self.get([ReadType.STATUS_SYSTEMS])
-        if systems_status_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_systems_status(systems_status_response[0]["PAYLOAD"][ReadType.STATUS_SYSTEMS.value])
-        else:
-            raise Exception("Failed to get systems status")
+        return await self._get_type(ReadType.STATUS_SYSTEMS)
 
     async def get_peripherals_status(self) -> List[BusPeripheralStatus]:
-        peripherals_status_response = await self.get([ReadType.STATUS_PERIPHERALS])
-        if peripherals_status_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_peripherals_status(peripherals_status_response[0]["PAYLOAD"][ReadType.STATUS_PERIPHERALS.value])
-        else:
-            raise Exception("Failed to get peripherals status")
-    
+        return await self._get_type(ReadType.STATUS_PERIPHERALS)
+
     async def get_temperatures_status(self) -> List[TemperatureStatus]:
-        temperatures_status_response = await self.get([ReadType.STATUS_TEMPERATURES])
-        if temperatures_status_response[0]["PAYLOAD"]["RESULT"] == "OK":
-            return read_temperatures_status(temperatures_status_response[0]["PAYLOAD"][ReadType.STATUS_TEMPERATURES.value])
-        else:
-            raise Exception("Failed to get temperatures status")
+        return await self._get_type(ReadType.STATUS_TEMPERATURES)
 
     async def activate_scenario(self, scenario_id):
         scenario = await self.command(
@@ -342,42 +751,144 @@ class Lares4API:
             return set_output["PAYLOAD"]["RESULT"] == "OK"
         return False
     
-    async def add_event_listener(self, event: EventType, event_listener: Callable[[str], None]) -> None:
-        """Add event listener."""
-        register_event_response = await self.send_command(
-            "REALTIME",
-            "REGISTER",
-            {"ID_LOGIN": True, "TYPES": [event.value]},
-        )
-
-        if register_event_response and register_event_response["PAYLOAD"]["RESULT"] == "OK":
-            if event not in self.event_listeners.keys():
-                self.event_listeners[event] = []
-            self.event_listeners[event].append(event_listener)
-        else:
-            raise Exception("Failed to register event listener")
-        
-    def remove_event_listener(self, event: EventType, event_listener: Callable[[str], None]) -> None:
+    async def add_event_listener(self, event: EventType, event_listener: Callable, typed: bool = False) -> None:
+        """
+        Add event listener.
+
+        Listeners are called with the list of changes of every realtime event
+        of their type. Coroutine listeners are run concurrently as tasks, so a
+        slow listener does not hold up the others.
+
+        When not connected, the listener is only stored and its event is
+        registered once logged in, by `listen()` or `supervise()`.
+
+        Args:
+            event (EventType): Type of event to listen to.
+            event_listener (Callable): Function or coroutine function called with the changes.
+            typed (bool): Call the listener with objects parsed by the `readers`,
+                e.g. `Zone`, instead of raw dicts. Changes are only parsed when a
+                typed listener exists for their type. Realtime changes only carry
+                the changed fields, so they are merged into the state of their
+                entry, read when the first typed listener of a type is added.
+        """
+        if self.is_running:
+            await self._register_events([event])
+            if typed and event.value not in self._typed_state:
+                await self._seed_typed({event})
+
+        if event not in self.event_listeners.keys():
+            self.event_listeners[event] = []
+        self.event_listeners[event].append(event_listener)
+        if typed:
+            self._typed_listeners.add((event, event_listener))
+        self._update_dispatch(event)
+
+    def remove_event_listener(self, event: EventType, event_listener: Callable) -> None:
         """Remove event listener."""
         if event in self.event_listeners:
             self.event_listeners[event].remove(event_listener)
+            self._typed_listeners.discard((event, event_listener))
+            if not any(typed_event == event for typed_event, _ in self._typed_listeners):
+                self._typed_state.pop(event.value, None)
             if not self.event_listeners[event]:
                 del self.event_listeners[event]
+            self._update_dispatch(event)
+
+    def _update_dispatch(self, event: EventType) -> None:
+        """Precompute the listeners of an event type, keyed by the type name in the payload."""
+        listeners = self.event_listeners.get(event, [])
+        if listeners:
+            self._dispatch[event.value] = [
+                (listener, (event, listener) in self._typed_listeners) for listener in listeners
+            ]
+        else:
+            self._dispatch.pop(event.value, None)
+
+    def _dispatch_changes(self, changes_by_type: dict) -> None:
+        """Call the listeners of every type of changes in a payload."""
+        for type_value, changes in changes_by_type.items():
+            listeners = self._dispatch.get(type_value)
+            if not listeners:
+                continue
+
+            parsed = None
+            for listener, typed in listeners:
+                if typed:
+                    if parsed is None:
+                        parsed = self._parse_changes(type_value, changes)
+                    if not parsed:
+                        continue
+
+                # A failing listener must not end listen() for the others
+                try:
+                    result = listener(parsed if typed else changes)
+                except Exception:
+                    _LOGGER.exception("Host %s: Listener of %s failed", self.url, type_value)
+                    continue
+
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._listener_tasks.add(task)
+                    task.add_done_callback(functools.partial(self._listener_done, type_value))
+
+    def _listener_done(self, type_value: str, task: asyncio.Future) -> None:
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.error(
+                "Host %s: Listener of %s failed", self.url, type_value, exc_info=task.exception()
+            )
+
+    def _parse_changes(self, type_value: str, changes: list[dict]) -> list:
+        """Merge changes into the state of their entries and parse the merged entries."""
+        reader = get_reader(type_value)
+        if reader is read_raw:
+            return changes
+
+        state = self._typed_state.setdefault(type_value, {})
+        entries = []
+        for change in changes:
+            entry = state.get(change.get("ID"))
+            if entry is None:
+                entry = state[change.get("ID")] = dict(change)
+            else:
+                entry.update(change)
+            entries.append(entry)
+
+        try:
+            return reader(entries)
+        except (KeyError, ValueError):
+            pass
+
+        # Parse entry by entry, so only the entries never read in full are skipped
+        parsed = []
+        for entry in entries:
+            try:
+                parsed.extend(reader([entry]))
+            except (KeyError, ValueError) as err:
+                _LOGGER.warning("Host %s: Cannot parse %s %s, %s", self.url, type_value, entry.get("ID"), err)
+        return parsed
 
     async def listen(self) -> None:
-        """Start listening for events."""
+        """
+        Start listening for events.
+
+        Must be called after `login()`, events of listeners added before
+        connecting are registered first.
+        """
         if not self.ws:
             raise Exception("WebSocket is not connected")
-        
-        async for msg in self.ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                data = json.loads(msg.data)
-                if data["PAYLOAD_TYPE"] == "CHANGES":
-                    if self.command_factory._sender in data["PAYLOAD"].keys():
-                        for event in self.event_listeners.keys():
-                            if event.value in data["PAYLOAD"][self.command_factory._sender].keys():
-                                for listener in self.event_listeners[event]:
-                                    listener(data["PAYLOAD"][self.command_factory._sender][event.value])
+
+        await self._register_pending()
+
+        sender = self.command_factory.get_sender()
+        dispatch = self.coalescer.add if self.coalescer else self._dispatch_changes
+        try:
+            while (data := await self._events.get()) is not None:
+                if data["PAYLOAD_TYPE"] == "CHANGES" and sender in data["PAYLOAD"]:
+                    dispatch(data["PAYLOAD"][sender])
+        finally:
+            if self.coalescer:
+                self.coalescer.flush()
 
     async def logout(self) -> None:
         logout_response = await self.command(
@@ -0,0 +1,180 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class OverflowPolicy(Enum):
+    """What to do when the event queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+class EventQueue:
+    """
+    Bounded queue of inbound frames between the websocket reader and `listen()`.
+
+    When full, the oldest frame is dropped, or with `OverflowPolicy.COALESCE`
+    the changes of a new `CHANGES` frame are first merged into queued changes
+    of the same type and ID, so only the latest state of each entity is kept.
+    Frames holding merged state are never dropped: if the rest of the frame
+    still needs room, the oldest other frame is dropped, or when every frame
+    holds merged state the rest is merged into the newest of them.
+    `None` is used to signal the end of the stream and is never dropped.
+    """
+
+    def __init__(self, maxsize: int = 0, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize (int): Maximum number of queued frames, unbounded when 0.
+            overflow (OverflowPolicy): Policy applied when the queue is full.
+        """
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.coalesced = 0
+        self._frames: Deque[Optional[dict]] = deque()
+        self._available = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._frames)
+
+    def put_nowait(self, frame: Optional[dict]) -> None:
+        """Queue a frame, applying the overflow policy when full."""
+        if frame is not None and self.full():
+            if self.overflow == OverflowPolicy.COALESCE and frame.get("PAYLOAD_TYPE") == "CHANGES":
+                merged = self._coalesce(frame)
+                if self._empty(frame):
+                    return
+                if merged:
+                    self._make_room(frame, merged)
+                    return
+            self._frames.popleft()
+            self.dropped += 1
+
+        self._frames.append(frame)
+        self._available.set()
+
+    async def get(self) -> Optional[dict]:
+        """Wait for the next frame."""
+        while not self._frames:
+            self._available.clear()
+            await self._available.wait()
+        return self._frames.popleft()
+
+    def _coalesce(self, frame: dict) -> List[dict]:
+        """
+        Merge changes into queued frames, removing them from `frame`.
+
+        Changes are merged into the newest queued change of the same type and ID.
+
+        Returns:
+            List[dict]: Queued frames that received changes, oldest first.
+        """
+        queued = {}
+        for other in self._frames:
+            if other is None or other.get("PAYLOAD_TYPE") != "CHANGES":
+                continue
+            for types in other["PAYLOAD"].values():
+                for type_value, changes in types.items():
+                    for change in changes:
+                        queued[(type_value, change.get("ID"))] = (change, other)
+
+        merged = set()
+        for types in frame["PAYLOAD"].values():
+            for type_value, changes in list(types.items()):
+                left = []
+                for change in changes:
+                    target = queued.get((type_value, change.get("ID")))
+                    if target is None:
+                        left.append(change)
+                        continue
+                    target[0].update(change)
+                    merged.add(id(target[1]))
+                    self.coalesced += 1
+
+                if left:
+                    types[type_value] = left
+                else:
+                    del types[type_value]
+
+        return [other for other in self._frames if id(other) in merged]
+
+    def _make_room(self, frame: dict, merged: List[dict]) -> None:
+        """Queue what is left of a coalesced frame without dropping frames holding merged state."""
+        merged_ids = {id(other) for other in merged}
+        for index, other in enumerate(self._frames):
+            if other is not None and id(other) not in merged_ids:
+                del self._frames[index]
+                self.dropped += 1
+                self._frames.append(frame)
+                self._available.set()
+                return
+
+        newest = merged[-1]
+        for receiver, types in frame["PAYLOAD"].items():
+            for type_value, changes in types.items():
+                newest["PAYLOAD"].setdefault(receiver, {}).setdefault(type_value, []).extend(changes)
+
+    @staticmethod
+    def _empty(frame: dict) -> bool:
+        return not any(types for types in frame["PAYLOAD"].values())
+
+
+class Coalescer:
+    """
+    Collapse realtime changes of the same entity within a time window.
+
+    Changes are keyed by type and ID. The first change of a window starts a
+    timer, later changes of the same entity are merged into it, and when the
+    window ends only the latest state of each entity is delivered.
+    """
+
+    def __init__(self, window: float, deliver: Callable[[dict], None]) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            window (float): Seconds to collect changes before delivering them.
+            deliver (Callable[[dict], None]): Called with the merged changes, keyed by type.
+        """
+        self.window = window
+        self.merged = 0
+        self.delivered = 0
+        self._deliver = deliver
+        self._pending: Dict[str, Dict[Any, dict]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, changes_by_type: dict) -> None:
+        """Add the changes of a realtime event, keyed by type."""
+        for type_value, changes in changes_by_type.items():
+            entries = self._pending.setdefault(type_value, {})
+            for change in changes:
+                key = change.get("ID")
+                if key in entries:
+                    entries[key].update(change)
+                    self.merged += 1
+                else:
+                    entries[key] = dict(change)
+
+        if self._timer is None and self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        """Deliver the pending changes now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        self.delivered += sum(len(entries) for entries in pending.values())
+        self._deliver({type_value: list(entries.values()) for type_value, entries in pending.items()})
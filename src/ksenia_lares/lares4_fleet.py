@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from .lares4_api import Lares4API
+from .types_lares4 import EventType, Model
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+class FleetEvent(NamedTuple):
+    """Realtime event of one panel of a fleet."""
+
+    panel: Lares4API
+    event: EventType
+    changes: list
+
+
+class Lares4Fleet:
+    """
+    Manage the websocket connections of many Lares 4 panels.
+
+    All panels share one `aiohttp.ClientSession` and connector. Each panel
+    connects with the SSL context of its own `verify_ssl` and `cafile`
+    settings, contexts of identical settings are shared.
+    Panels are connected and logged in with bounded concurrency, and the
+    realtime events of all panels are merged into a single async iterator.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        connector_limit: int = 0,
+    ) -> None:
+        """
+        Initialize the fleet.
+
+        Args:
+            max_concurrency (int): Maximum number of panels connecting at the same time.
+            connector_limit (int): Maximum number of open connections, unlimited when 0.
+        """
+        self.panels: List[Lares4API] = []
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._connector_limit = connector_limit
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._listen_tasks: List[asyncio.Task] = []
+
+    def add(self, data: dict, model: Model = Model.LARES_4, **kwargs) -> Lares4API:
+        """
+        Add a panel to the fleet.
+
+        Args:
+            data (dict): Connection details of the panel, as for `Lares4API`.
+            model (Model): Model of the panel.
+            **kwargs: Further options of `Lares4API`.
+
+        Returns:
+            Lares4API: API of the panel, connected by `connect()`.
+        """
+        panel = Lares4API(data, model, **kwargs)
+        self.panels.append(panel)
+        return panel
+
+    async def connect(
+        self, events: Iterable[EventType] = ()
+    ) -> List[Tuple[Lares4API, BaseException]]:
+        """
+        Connect, log in and subscribe all panels that are not connected yet.
+
+        Args:
+            events (Iterable[EventType]): Events to subscribe on every panel, delivered by `events()`.
+
+        Returns:
+            List[Tuple[Lares4API, BaseException]]: Panels that failed, with their error.
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._connector_limit)
+            )
+
+        events = tuple(events)
+        panels = [panel for panel in self.panels if not panel.is_running]
+        results = await asyncio.gather(
+            *(self._connect_panel(panel, events) for panel in panels),
+            return_exceptions=True,
+        )
+
+        failures = []
+        for panel, result in zip(panels, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning("Host %s: Failed to connect, %s", panel.url, result)
+                failures.append((panel, result))
+
+        return failures
+
+    async def _connect_panel(self, panel: Lares4API, events: Tuple[EventType, ...]) -> None:
+        async with self._semaphore:
+            await panel.connect(session=self.session)
+            try:
+                await panel.login()
+                for event in events:
+                    await panel.add_event_listener(event, self._forward(panel, event))
+            except BaseException:
+                await panel.close()
+                raise
+
+        self._listen_tasks.append(asyncio.create_task(panel.listen()))
+
+    def _forward(self, panel: Lares4API, event: EventType):
+        def listener(changes: list) -> None:
+            self._events.put_nowait(FleetEvent(panel, event, changes))
+
+        return listener
+
+    async def events(self) -> AsyncIterator[FleetEvent]:
+        """Iterate over the realtime events of all panels, until the fleet is closed."""
+        while (item := await self._events.get()) is not None:
+            yield item
+
+    async def close(self) -> None:
+        """Close all panels and the shared session."""
+        await asyncio.gather(
+            *(panel.close() for panel in self.panels if panel.ws is not None),
+            return_exceptions=True,
+        )
+        await asyncio.gather(*self._listen_tasks, return_exceptions=True)
+        self._listen_tasks = []
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+        self._events.put_nowait(None)
@@ -0,0 +1,451 @@
+import argparse
+import asyncio
+import logging
+import random
+import ssl
+import time
+from typing import Dict, List, Optional, Set
+
+from aiohttp import WSMsgType, web
+
+from .codec import JsonCodec, get_codec
+from .lares4_api import CRC16_PLACEHOLDER, encode_frame, verify_crc16
+from .types_lares4 import ReadType
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8443
+DEFAULT_PIN = "123456"
+WEBSOCKET_PATH = "/KseniaWsock"
+
+
+class SimulatedPanel:
+    """
+    In-memory state of a simulated Lares 4 panel.
+
+    The state is kept as raw payloads keyed by `ReadType` value, in the
+    format read by the `readers`, so READ responses are served as-is.
+    """
+
+    def __init__(
+        self,
+        zones: int = 16,
+        outputs: int = 8,
+        partitions: int = 4,
+        scenarios: int = 4,
+        peripherals: int = 1,
+        thermostats: int = 1,
+        pin: str = DEFAULT_PIN,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the panel.
+
+        Args:
+            zones (int): Number of zones.
+            outputs (int): Number of outputs, every fourth one is a roller shutter.
+            partitions (int): Number of partitions.
+            scenarios (int): Number of scenarios.
+            peripherals (int): Number of DOMUS bus peripherals.
+            thermostats (int): Number of thermostats.
+            pin (str): PIN accepted for login and user commands.
+            seed (Optional[int]): Seed of the random realtime changes.
+        """
+        self.pin = pin
+        self.random = random.Random(seed)
+        self.state: Dict[str, List[dict]] = {
+            ReadType.OUTPUTS.value: [
+                {"ID": str(i), "DES": f"Output {i}", "CNV": "H", "CAT": "ROLL" if i % 4 == 0 else "LIGHT", "MOD": "M"}
+                for i in range(1, outputs + 1)
+            ],
+            ReadType.PERIPHERALS.value: [
+                {"ID": str(i), "TYP": "DOMUS", "DES": f"Domus {i}"} for i in range(1, peripherals + 1)
+            ],
+            ReadType.SCENARIOS.value: [
+                {"ID": str(i), "DES": f"Scenario {i}", "PIN": "P", "CAT": "ARM"} for i in range(1, scenarios + 1)
+            ],
+            ReadType.STATUS_OUTPUTS.value: [
+                {"ID": str(i), "STA": "OFF", **({"POS": "0", "TPOS": "0"} if i % 4 == 0 else {})}
+                for i in range(1, outputs + 1)
+            ],
+            ReadType.STATUS_SYSTEMS.value: [
+                {
+                    "ID": "1",
+                    "INFO": [],
+                    "TAMPER": [],
+                    "TAMPER_MEM": [],
+                    "ALARM": [],
+                    "ALARM_MEM": [],
+                    "FAULT": [],
+                    "FAULT_MEM": [],
+                    "ARM": {"D": "Disarmed", "S": "D"},
+                    "TEMP": {"IN": "21.0", "OUT": "NA"},
+                    "TIME": {"GMT": str(int(time.time())), "TZ": "1", "TZM": "0", "DAWN": "07:00", "DUSK": "18:00"},
+                }
+            ],
+            ReadType.STATUS_PERIPHERALS.value: [
+                {
+                    "ID": str(i),
+                    "TYP": "DOMUS",
+                    "STA": "OK",
+                    "BUS": "1",
+                    "LINK": {"TYPE": "BUS", "SN": f"{i:08X}", "BUS": "1"},
+                    "DOMUS": {"TEM": "21.0", "HUM": "45.0", "LHT": "100.0"},
+                }
+                for i in range(1, peripherals + 1)
+            ],
+            ReadType.STATUS_TEMPERATURES.value: [
+                {
+                    "ID": str(i),
+                    "TEMP": "21.0",
+                    "THERM": {"ACT_SEA": "WIN", "ACT_MODEL": "OFF", "OUT_STATUS": "OFF", "TEMP_THR": {"VAL": "NA"}},
+                }
+                for i in range(1, thermostats + 1)
+            ],
+            ReadType.STATUS_ZONES.value: [
+                {"ID": str(i), "STA": "R", "BYP": "NO", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": f"Zone {i}"}
+                for i in range(1, zones + 1)
+            ],
+            ReadType.STATUS_PARTITIONS.value: [
+                {"ID": str(i), "ARM": "D", "T": "N", "AST": "OK", "TST": "N"} for i in range(1, partitions + 1)
+            ],
+        }
+        self._index = {
+            type_value: {entity["ID"]: entity for entity in entities} for type_value, entities in self.state.items()
+        }
+
+    def apply(self, type_value: str, change: dict) -> dict:
+        """Merge a change into the entity with the same ID, returns the change."""
+        self._index[type_value][change["ID"]].update(change)
+        return change
+
+    def random_changes(self, count: int = 1) -> Dict[str, List[dict]]:
+        """Apply `count` random zone and output changes, returns them keyed by type."""
+        changes: Dict[str, List[dict]] = {}
+        for _ in range(count):
+            zones = self.state[ReadType.STATUS_ZONES.value]
+            outputs = self.state[ReadType.STATUS_OUTPUTS.value]
+            if outputs and (not zones or self.random.random() < 0.25):
+                output = self.random.choice(outputs)
+                change = {"ID": output["ID"], "STA": "ON" if output["STA"] == "OFF" else "OFF"}
+                type_value = ReadType.STATUS_OUTPUTS.value
+            elif zones:
+                zone = self.random.choice(zones)
+                change = {"ID": zone["ID"], "STA": "A" if zone["STA"] == "R" else "R"}
+                if self.random.random() < 0.05:
+                    change["A"] = "Y" if zone["A"] == "N" else "N"
+                type_value = ReadType.STATUS_ZONES.value
+            else:
+                break
+            changes.setdefault(type_value, []).append(self.apply(type_value, change))
+        return changes
+
+    def execute(self, payload_type: str, payload: dict) -> Dict[str, List[dict]]:
+        """
+        Execute a CMD_USR command.
+
+        Returns:
+            Dict[str, List[dict]]: The resulting changes keyed by type.
+
+        Raises:
+            ValueError: If the command or its target is unknown.
+        """
+        if payload_type == "CMD_EXE_SCENARIO":
+            if str(payload["SCENARION"]["ID"]) not in self._index[ReadType.SCENARIOS.value]:
+                raise ValueError("Unknown scenario")
+            return {}
+
+        if payload_type == "CMD_BYP_ZONE":
+            zone = payload["ZONE"]
+            if str(zone["ID"]) not in self._index[ReadType.STATUS_ZONES.value]:
+                raise ValueError("Unknown zone")
+            change = self.apply(ReadType.STATUS_ZONES.value, {"ID": str(zone["ID"]), "BYP": zone["BYP"]})
+            return {ReadType.STATUS_ZONES.value: [change]}
+
+        if payload_type == "CMD_SET_OUTPUT":
+            output = payload["OUTPUT"]
+            current = self._index[ReadType.STATUS_OUTPUTS.value].get(output["ID"])
+            if current is None:
+                raise ValueError("Unknown output")
+            if "POS" in current and output["VAL"].isdigit():
+                change = {"ID": output["ID"], "STA": "ON", "POS": output["VAL"], "TPOS": output["VAL"]}
+            else:
+                change = {"ID": output["ID"], "STA": output["VAL"]}
+            return {ReadType.STATUS_OUTPUTS.value: [self.apply(ReadType.STATUS_OUTPUTS.value, change)]}
+
+        raise ValueError(f"Unsupported command {payload_type}")
+
+
+class _Connection:
+    """State of one client websocket."""
+
+    def __init__(self, ws: web.WebSocketResponse) -> None:
+        self.ws = ws
+        self.sender = ""
+        self.login_id: Optional[str] = None
+        self.types: Set[str] = set()
+
+
+class Lares4Simulator:
+    """
+    Websocket server speaking the KS_WSOCK protocol of Lares 4 panels.
+
+    It answers LOGIN, LOGOUT, READ MULTI_TYPES, REALTIME REGISTER and CMD_USR
+    commands from the state of a `SimulatedPanel`, and pushes CHANGES frames
+    to the registered clients, both for user commands and for random changes
+    generated at `event_rate`. All frames carry a valid CRC_16. Every
+    connection is served from the same panel, so one simulator can load
+    test thousands of clients.
+    """
+
+    def __init__(
+        self,
+        panel: Optional[SimulatedPanel] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        latency: float = 0,
+        event_rate: float = 0,
+        changes_per_event: int = 1,
+        codec: Optional[JsonCodec] = None,
+    ) -> None:
+        """
+        Initialize the simulator.
+
+        Args:
+            panel (Optional[SimulatedPanel]): Panel state, a default panel when None.
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 for a free port.
+            ssl_context (Optional[ssl.SSLContext]): Server context, `Lares4API` only connects over TLS.
+            latency (float): Seconds to wait before answering each command.
+            event_rate (float): Random realtime events pushed per second, none when 0.
+            changes_per_event (int): Entities changed by each random event.
+            codec (Optional[JsonCodec]): JSON codec for frames, the fastest installed one by default.
+        """
+        self.panel = panel or SimulatedPanel()
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.latency = latency
+        self.event_rate = event_rate
+        self.changes_per_event = changes_per_event
+        self.codec = codec or get_codec()
+        self.connections: Set[_Connection] = set()
+        self.frames_in = 0
+        self.frames_out = 0
+        self._login_id = 0
+        self._runner: Optional[web.AppRunner] = None
+        self._generator: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start serving, `port` is updated when a free port was requested."""
+        app = web.Application()
+        app.router.add_get(WEBSOCKET_PATH, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, ssl_context=self.ssl_context, backlog=4096)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+        if self.event_rate > 0:
+            self._generator = asyncio.create_task(self._generate())
+
+    async def stop(self) -> None:
+        """Stop the event generator, close all connections and the server."""
+        if self._generator is not None:
+            self._generator.cancel()
+            await asyncio.gather(self._generator, return_exceptions=True)
+            self._generator = None
+
+        await asyncio.gather(
+            *(connection.ws.close() for connection in list(self.connections)),
+            return_exceptions=True,
+        )
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "Lares4Simulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=["KS_WSOCK"])
+        await ws.prepare(request)
+        connection = _Connection(ws)
+        self.connections.add(connection)
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                self.frames_in += 1
+                if not verify_crc16(msg.data):
+                    _LOGGER.warning("Dropping frame with invalid CRC")
+                    continue
+                await self._reply(connection, self.codec.loads(msg.data))
+        finally:
+            self.connections.discard(connection)
+
+        return ws
+
+    async def _reply(self, connection: _Connection, command: dict) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        connection.sender = command["SENDER"]
+        payload = command.get("PAYLOAD", {})
+        cmd = command["CMD"]
+        changes = {}
+
+        if cmd == "LOGIN":
+            if payload.get("PIN") == self.panel.pin:
+                self._login_id += 1
+                connection.login_id = str(self._login_id)
+                result = {"RESULT": "OK", "ID_LOGIN": connection.login_id}
+            else:
+                result = {"RESULT": "FAIL", "RESULT_DETAIL": "LOGIN_KO"}
+        elif payload.get("ID_LOGIN") != connection.login_id or connection.login_id is None:
+            result = {"RESULT": "FAIL", "RESULT_DETAIL": "NOT_LOGGED_IN"}
+        elif cmd == "LOGOUT":
+            connection.login_id = None
+            connection.types.clear()
+            result = {"RESULT": "OK"}
+        elif cmd == "READ":
+            result = {"RESULT": "OK", "ID_READ": payload.get("ID_READ")}
+            for type_value in payload.get("TYPES", []):
+                if type_value in self.panel.state:
+                    result[type_value] = self.panel.state[type_value]
+        elif cmd == "REALTIME":
+            connection.types.update(payload.get("TYPES", []))
+            result = {"RESULT": "OK"}
+        elif cmd == "CMD_USR":
+            if payload.get("PIN") != self.panel.pin:
+                result = {"RESULT": "FAIL", "RESULT_DETAIL": "PIN_KO"}
+            else:
+                try:
+                    changes = self.panel.execute(command["PAYLOAD_TYPE"], payload)
+                    result = {"RESULT": "OK"}
+                except (KeyError, ValueError) as err:
+                    result = {"RESULT": "FAIL", "RESULT_DETAIL": str(err)}
+        else:
+            result = {"RESULT": "FAIL", "RESULT_DETAIL": "UNKNOWN_CMD"}
+
+        await self._send(
+            connection,
+            self._frame(connection.sender, f"{cmd}_RES", command["ID"], command["PAYLOAD_TYPE"], result),
+        )
+        if changes:
+            await self.push(changes)
+
+    def _frame(self, receiver: str, cmd: str, command_id: str, payload_type: str, payload: dict) -> str:
+        frame = {
+            "SENDER": "panel",
+            "RECEIVER": receiver,
+            "CMD": cmd,
+            "ID": command_id,
+            "PAYLOAD_TYPE": payload_type,
+            "PAYLOAD": payload,
+            "TIMESTAMP": str(int(time.time())),
+            "CRC_16": CRC16_PLACEHOLDER,
+        }
+        return encode_frame(frame, self.codec).decode("utf-8")
+
+    async def _send(self, connection: _Connection, frame: str) -> None:
+        if connection.ws.closed:
+            return
+        try:
+            await connection.ws.send_str(frame)
+            self.frames_out += 1
+        except ConnectionError:
+            pass
+
+    async def push(self, changes_by_type: Dict[str, List[dict]]) -> None:
+        """
+        Push realtime changes to every client registered for their type.
+
+        A frame is encoded once per sender and set of types, not per client.
+        """
+        frames: Dict[tuple, str] = {}
+        sends = []
+        for connection in list(self.connections):
+            changes = {
+                type_value: changes for type_value, changes in changes_by_type.items() if type_value in connection.types
+            }
+            if not changes:
+                continue
+            key = (connection.sender, tuple(changes))
+            if key not in frames:
+                frames[key] = self._frame("", "REALTIME", "1", "CHANGES", {connection.sender: changes})
+            sends.append(self._send(connection, frames[key]))
+
+        await asyncio.gather(*sends)
+
+    async def _generate(self) -> None:
+        """Push random changes at `event_rate`, catching up after slow pushes."""
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.event_rate
+        next_at = loop.time()
+        while True:
+            next_at += interval
+            await asyncio.sleep(max(next_at - loop.time(), 0))
+            await self.push(self.panel.random_changes(self.changes_per_event))
+
+
+async def serve(simulator: Lares4Simulator) -> None:
+    """Run a simulator until cancelled."""
+    async with simulator:
+        _LOGGER.info("Simulating a Lares 4 panel on wss://%s:%s%s", simulator.host, simulator.port, WEBSOCKET_PATH)
+        await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point, `python -m ksenia_lares.lares4_simulator --help`."""
+    parser = argparse.ArgumentParser(description="Simulate a Lares 4 panel for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--certfile", required=True, help="PEM file with the server certificate and key")
+    parser.add_argument("--keyfile", help="PEM file with the key, if not in the certificate file")
+    parser.add_argument("--pin", default=DEFAULT_PIN)
+    parser.add_argument("--zones", type=int, default=16)
+    parser.add_argument("--outputs", type=int, default=8)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--scenarios", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0, help="seconds before each response")
+    parser.add_argument("--event-rate", type=float, default=0, help="random realtime events per second")
+    parser.add_argument("--changes-per-event", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(args.certfile, args.keyfile)
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = Lares4Simulator(
+        SimulatedPanel(
+            zones=args.zones,
+            outputs=args.outputs,
+            partitions=args.partitions,
+            scenarios=args.scenarios,
+            pin=args.pin,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+        ssl_context=ssl_context,
+        latency=args.latency,
+        event_rate=args.event_rate,
+        changes_per_event=args.changes_per_event,
+    )
+    try:
+        asyncio.run(serve(simulator))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from functools import partial
+from typing import Any, Iterable, Optional
+
+from .lares4_api import Lares4API
+from .readers import get_reader
+from .types_lares4 import EventType, ReadType
+
+
+class Lares4State:
+    """
+    In-memory copy of the realtime state of a Lares 4 panel.
+
+    The store is seeded once with a MULTI_TYPES read and then kept current by
+    applying the `CHANGES` pushed by the panel. Entries are indexed by ID per
+    `EventType`, so lookups never hit the panel. Every seed or applied change
+    increments `version`, which lets readers cheaply detect updates.
+    """
+
+    def __init__(self, events: Iterable[EventType] = tuple(EventType)) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            events (Iterable[EventType]): Event types to track, all by default.
+        """
+        self.events = tuple(events)
+        self.version = 0
+        self._entries: dict[EventType, dict[int, dict]] = {event: {} for event in self.events}
+        self._parsed: dict[EventType, dict[int, Any]] = {event: {} for event in self.events}
+
+    async def sync(self, api: Lares4API) -> None:
+        """
+        Register for changes of all tracked events and seed the store.
+
+        Listeners are registered before the read, so no change is lost in
+        between. `api.listen()` must be running for changes to be applied.
+
+        Args:
+            api (Lares4API): Connected and logged in API.
+        """
+        for event in self.events:
+            await api.add_event_listener(event, partial(self.apply, event))
+
+        payload = await api.read([ReadType(event.value) for event in self.events])
+        self.seed(payload)
+
+    def seed(self, payload: dict) -> None:
+        """
+        Replace the stored state with the payload of a READ response.
+
+        Args:
+            payload (dict): Response payload keyed by type, e.g. `STATUS_ZONES`.
+        """
+        for event in self.events:
+            if event.value in payload:
+                self._entries[event] = {int(entry["ID"]): dict(entry) for entry in payload[event.value]}
+                self._parsed[event] = {}
+
+        self.version += 1
+
+    def apply(self, event: EventType, changes: list[dict]) -> None:
+        """
+        Merge the `CHANGES` of a realtime event into the store.
+
+        Args:
+            event (EventType): Type of the event.
+            changes (list[dict]): Changed entries, each with at least an `ID`.
+        """
+        if event not in self._entries:
+            return
+
+        entries = self._entries[event]
+        parsed = self._parsed[event]
+
+        for change in changes:
+            entry_id = int(change["ID"])
+            if entry_id in entries:
+                entries[entry_id].update(change)
+            else:
+                entries[entry_id] = dict(change)
+            parsed.pop(entry_id, None)
+
+        self.version += 1
+
+    def get(self, event: EventType, entry_id: int) -> Optional[Any]:
+        """
+        Get the typed state of a single entry.
+
+        Args:
+            event (EventType): Type of the entry.
+            entry_id (int): ID of the entry.
+
+        Returns:
+            Optional[Any]: The parsed entry, e.g. a `Zone`, or None if unknown or
+                only known from partial changes, see `get_raw()`.
+        """
+        parsed = self._parsed[event]
+        if entry_id in parsed:
+            return parsed[entry_id]
+
+        entry = self._entries[event].get(entry_id)
+        if entry is None:
+            return None
+
+        try:
+            parsed[entry_id] = get_reader(event)([entry])[0]
+        except (KeyError, ValueError):
+            # New entries pushed by the panel carry only their changed fields until the next seed
+            return None
+        return parsed[entry_id]
+
+    def get_all(self, event: EventType) -> list:
+        """
+        Get the typed state of all entries of a type.
+
+        Args:
+            event (EventType): Type of the entries.
+
+        Returns:
+            list: Parsed entries ordered by ID, without entries only known from partial changes.
+        """
+        entries = (self.get(event, entry_id) for entry_id in sorted(self._entries[event]))
+        return [entry for entry in entries if entry is not None]
+
+    def get_raw(self, event: EventType, entry_id: int) -> Optional[dict]:
+        """Get the raw merged payload of a single entry."""
+        return self._entries[event].get(entry_id)
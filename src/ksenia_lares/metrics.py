@@ -0,0 +1,200 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Metrics:
+    """
+    Metrics sink of the APIs, this base class discards everything.
+
+    Requests are labelled by panel (`host:port` or URL) and endpoint: the
+    document path for `IpAPI`, the CMD for `Lares4API` and `REALTIME` for
+    pushed frames. Request time covers the whole round trip, parse time only
+    decoding the response, so network time is their difference.
+
+    The APIs only call the sink when `enabled` is true, so the default sink
+    costs an attribute check per request. Subclasses set `enabled` and
+    override the methods they need.
+    """
+
+    enabled = False
+
+    def request_started(self, panel: str, endpoint: str) -> None:
+        """A request was sent and is in flight."""
+
+    def request_finished(self, panel: str, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        A request completed.
+
+        Args:
+            panel (str): Panel of the request.
+            endpoint (str): Endpoint of the request.
+            seconds (float): Time from sending to the parsed response.
+            error (Optional[str]): Kind of failure, e.g. `timeout`, None on success.
+        """
+
+    def sent(self, panel: str, endpoint: str, size: int) -> None:
+        """Bytes were sent to a panel."""
+
+    def received(self, panel: str, endpoint: str, size: int, parse_seconds: float) -> None:
+        """A response or pushed frame was received and parsed."""
+
+
+NOOP_METRICS = Metrics()
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed buckets."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Counts of values up to each bucket bound, in the `le` format of Prometheus."""
+        result, total = [], 0
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class InMemoryMetrics(Metrics):
+    """
+    Keep metrics in memory, per panel and endpoint.
+
+    `render()` exports them in the Prometheus text format, to be served
+    from any HTTP endpoint without further dependencies.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the metrics.
+
+        Args:
+            buckets (Sequence[float]): Upper bounds of the histogram buckets in seconds.
+        """
+        self.request_seconds: Dict[Tuple[str, str], Histogram] = defaultdict(lambda: Histogram(buckets))
+        self.parse_seconds: Dict[Tuple[str, str], Histogram] = defaultdict(lambda: Histogram(buckets))
+        self.bytes_sent: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.bytes_received: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def request_started(self, panel: str, endpoint: str) -> None:
+        self.in_flight[panel, endpoint] += 1
+
+    def request_finished(self, panel: str, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        self.in_flight[panel, endpoint] -= 1
+        self.request_seconds[panel, endpoint].observe(seconds)
+        if error is not None:
+            self.errors[panel, endpoint, error] += 1
+
+    def sent(self, panel: str, endpoint: str, size: int) -> None:
+        self.bytes_sent[panel, endpoint] += size
+
+    def received(self, panel: str, endpoint: str, size: int, parse_seconds: float) -> None:
+        self.bytes_received[panel, endpoint] += size
+        self.parse_seconds[panel, endpoint].observe(parse_seconds)
+
+    def render(self, prefix: str = "ksenia_lares") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, histograms in (("request_seconds", self.request_seconds), ("parse_seconds", self.parse_seconds)):
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for (panel, endpoint), histogram in histograms.items():
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{prefix}_{name}_bucket{_labels(panel=panel, endpoint=endpoint, le=bound)} {count}")
+                lines.append(f"{prefix}_{name}_sum{_labels(panel=panel, endpoint=endpoint)} {histogram.sum}")
+                lines.append(f"{prefix}_{name}_count{_labels(panel=panel, endpoint=endpoint)} {histogram.count}")
+
+        for name, kind, values in (
+            ("sent_bytes_total", "counter", self.bytes_sent),
+            ("received_bytes_total", "counter", self.bytes_received),
+            ("requests_in_flight", "gauge", self.in_flight),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for (panel, endpoint), value in values.items():
+                lines.append(f"{prefix}_{name}{_labels(panel=panel, endpoint=endpoint)} {value}")
+
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        for (panel, endpoint, error), value in self.errors.items():
+            lines.append(f"{prefix}_errors_total{_labels(panel=panel, endpoint=endpoint, error=error)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusMetrics(Metrics):
+    """Record metrics with `prometheus_client`, for an existing Prometheus registry."""
+
+    enabled = True
+
+    def __init__(self, registry=None, prefix: str = "ksenia_lares", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the metrics.
+
+        Args:
+            registry: `prometheus_client` registry, the default registry when None.
+            prefix (str): Prefix of the metric names.
+            buckets (Sequence[float]): Upper bounds of the histogram buckets in seconds.
+
+        Raises:
+            ImportError: If `prometheus_client` is not installed.
+        """
+        if prometheus_client is None:
+            raise ImportError("PrometheusMetrics requires prometheus_client, install prometheus-client")
+
+        options = {"registry": registry} if registry is not None else {}
+        labels = ("panel", "endpoint")
+        self._request_seconds = prometheus_client.Histogram(
+            f"{prefix}_request_seconds", "Time from request to parsed response", labels, buckets=buckets, **options
+        )
+        self._parse_seconds = prometheus_client.Histogram(
+            f"{prefix}_parse_seconds", "Time spent parsing responses", labels, buckets=buckets, **options
+        )
+        self._sent = prometheus_client.Counter(f"{prefix}_sent_bytes", "Bytes sent", labels, **options)
+        self._received = prometheus_client.Counter(f"{prefix}_received_bytes", "Bytes received", labels, **options)
+        self._errors = prometheus_client.Counter(f"{prefix}_errors", "Failed requests", (*labels, "error"), **options)
+        self._in_flight = prometheus_client.Gauge(f"{prefix}_requests_in_flight", "Requests in flight", labels, **options)
+
+    def request_started(self, panel: str, endpoint: str) -> None:
+        self._in_flight.labels(panel, endpoint).inc()
+
+    def request_finished(self, panel: str, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        self._in_flight.labels(panel, endpoint).dec()
+        self._request_seconds.labels(panel, endpoint).observe(seconds)
+        if error is not None:
+            self._errors.labels(panel, endpoint, error).inc()
+
+    def sent(self, panel: str, endpoint: str, size: int) -> None:
+        self._sent.labels(panel, endpoint).inc(size)
+
+    def received(self, panel: str, endpoint: str, size: int, parse_seconds: float) -> None:
+        self._received.labels(panel, endpoint).inc(size)
+        self._parse_seconds.labels(panel, endpoint).observe(parse_seconds)
@@ -1,5 +1,7 @@
 import datetime
-from ksenia_lares.types_lares4 import BusPeripheral, BusPeripheralStatus, BusPeripheralType, DomusStatus, LinkStatus, Output, OutputStatus, Partition, Scenario, SystemArmStatus, SystemStatus, SystemTemperatureStatus, SystemTimeStatus, TemperatureStatus, ThermostatMode, ThermostatSeason, ThermostatStatus, Zone, ZoneBypass, ZoneStatus
+from typing import Callable
+from ksenia_lares.interning import intern, intern_all
+from ksenia_lares.types_lares4 import EventType, ReadType, BusPeripheral, BusPeripheralStatus, BusPeripheralType, DomusStatus, LinkStatus, Output, OutputStatus, Partition, Scenario, SystemArmStatus, SystemStatus, SystemTemperatureStatus, SystemTimeStatus, TemperatureStatus, ThermostatMode, ThermostatSeason, ThermostatStatus, Zone, ZoneBypass, ZoneStatus
 
 
 def read_zones_status(payload: dict) -> list[Zone]:  
@@ -8,11 +10,11 @@ def read_zones_status(payload: dict) -> list[Zone]:
             id=int(zone["ID"]),
             status=ZoneStatus(zone["STA"]),
             bypass=ZoneBypass(zone["BYP"]),
-            tamper=zone["T"],
-            alarm=zone["A"],
-            ohm=zone["OHM"],
-            vas=zone["VAS"],
-            label=zone["LBL"],
+            tamper=intern(zone["T"]),
+            alarm=intern(zone["A"]),
+            ohm=intern(zone["OHM"]),
+            vas=intern(zone["VAS"]),
+            label=intern(zone["LBL"]),
         )
         for zone in payload
     ]
@@ -21,10 +23,10 @@ def read_partitions_status(payload: dict) -> list[Partition]:
     return [
         Partition(
             id=int(partition["ID"]),
-            armed=partition["ARM"],
-            tamper=partition["T"],
-            alarm=partition["AST"],
-            test=partition["TST"],
+            armed=intern(partition["ARM"]),
+            tamper=intern(partition["T"]),
+            alarm=intern(partition["AST"]),
+            test=intern(partition["TST"]),
         )
         for partition in payload
     ]
@@ -33,10 +35,10 @@ def read_outputs(payload: dict) -> list[Output]:
     return [
         Output(
             id=int(output["ID"]),
-            description=output["DES"],
-            cnv=output["CNV"],
-            category=output["CAT"],
-            mode=output["MOD"],
+            description=intern(output["DES"]),
+            cnv=intern(output["CNV"]),
+            category=intern(output["CAT"]),
+            mode=intern(output["MOD"]),
         )
         for output in payload
     ]
@@ -46,7 +48,7 @@ def read_peripherals(payload: dict) -> list[BusPeripheral]:
         BusPeripheral(
             id=int(peripheral["ID"]),
             type=BusPeripheralType(peripheral["TYP"]),
-            description=peripheral["DES"]
+            description=intern(peripheral["DES"])
             )
         for peripheral in payload
     ]
@@ -55,7 +57,7 @@ def read_outputs_status(payload: dict) -> list[OutputStatus]:
     return [
         OutputStatus(
             id=int(output["ID"]),
-            status=output["STA"],
+            status=intern(output["STA"]),
             position=(int(output["POS"]) if "POS" in output.keys()  else None),
             target_position=(int(output["TPOS"]) if "TPOS" in output.keys() else None),
         )
@@ -71,16 +73,16 @@ def read_systems_status(payload: dict) -> list[SystemStatus]:
         systems_status.append(
             SystemStatus(
                 id=int(system["ID"]),
-                informations=system["INFO"],
-                tamper=system["TAMPER"],
-                tamper_memory=system["TAMPER_MEM"],
-                alarm=system["ALARM"],
-                alarm_memory=system["ALARM_MEM"],
-                fault=system["FAULT"],
-                fault_memory=system["FAULT_MEM"],
+                informations=intern_all(system["INFO"]),
+                tamper=intern_all(system["TAMPER"]),
+                tamper_memory=intern_all(system["TAMPER_MEM"]),
+                alarm=intern_all(system["ALARM"]),
+                alarm_memory=intern_all(system["ALARM_MEM"]),
+                fault=intern_all(system["FAULT"]),
+                fault_memory=intern_all(system["FAULT_MEM"]),
                 arm=SystemArmStatus(
-                    mode=system["ARM"]["D"],
-                    status=system["ARM"]["S"],
+                    mode=intern(system["ARM"]["D"]),
+                    status=intern(system["ARM"]["S"]),
                 ),
                 temperature=SystemTemperatureStatus(
                     inside=float(system["TEMP"]["IN"]) if (system["TEMP"]["IN"] != 'NA') else None,
@@ -109,10 +111,10 @@ def read_peripherals_status(payload: dict) -> list[BusPeripheralStatus]:
         BusPeripheralStatus(
             id=int(peripheral["ID"]),
             type=BusPeripheralType(peripheral["TYP"]),
-            status=peripheral["STA"],
+            status=intern(peripheral["STA"]),
             bus=int(peripheral["BUS"]),
             link=LinkStatus(
-                type=peripheral["LINK"]["TYPE"],
+                type=intern(peripheral["LINK"]["TYPE"]),
                 serial_number=peripheral["LINK"]["SN"],
                 bus=int(peripheral["LINK"]["BUS"]),
             ),
@@ -139,7 +141,7 @@ def read_temperatures_status(payload: dict) -> list[TemperatureStatus]:
                 thermostat=ThermostatStatus(
                     season=ThermostatSeason(temperature["THERM"]["ACT_SEA"]),
                     mode=ThermostatMode(temperature["THERM"]["ACT_MODEL"]),
-                    output=temperature["THERM"]["OUT_STATUS"],
+                    output=intern(temperature["THERM"]["OUT_STATUS"]),
                     timer=datetime.time(
                         hour=int(thermostat_timer[0]),
                         minute=int(thermostat_timer[1])
@@ -155,9 +157,41 @@ def read_scenarios(payload: dict) -> list[Scenario]:
     return [
         Scenario(
             id=int(scenario["ID"]),
-            description=scenario["DES"],
-            pin=scenario["PIN"],
-            category=scenario["CAT"],
+            description=intern(scenario["DES"]),
+            pin=intern(scenario["PIN"]),
+            category=intern(scenario["CAT"]),
         )
         for scenario in payload
-    ]
\ No newline at end of file
+    ]
+
+def read_raw(payload: list) -> list:
+    """Reader of types without a registered reader, the payload is returned as-is."""
+    return payload
+
+# Readers keyed by the type name used in READ responses and realtime changes,
+# which is the value of both `ReadType` and `EventType`
+READERS: dict[str, Callable[[list], list]] = {
+    ReadType.OUTPUTS.value: read_outputs,
+    ReadType.PERIPHERALS.value: read_peripherals,
+    ReadType.SCENARIOS.value: read_scenarios,
+    ReadType.STATUS_OUTPUTS.value: read_outputs_status,
+    ReadType.STATUS_SYSTEMS.value: read_systems_status,
+    ReadType.STATUS_PERIPHERALS.value: read_peripherals_status,
+    ReadType.STATUS_TEMPERATURES.value: read_temperatures_status,
+    ReadType.STATUS_ZONES.value: read_zones_status,
+    ReadType.STATUS_PARTITIONS.value: read_partitions_status,
+}
+
+def register_reader(read_type: ReadType | EventType | str, reader: Callable[[list], list]) -> None:
+    """
+    Register the reader of a type, replacing the existing one.
+
+    Args:
+        read_type (ReadType | EventType | str): The type, or its name for types unknown to this library.
+        reader (Callable[[list], list]): Called with the list of entries of the type.
+    """
+    READERS[read_type if isinstance(read_type, str) else read_type.value] = reader
+
+def get_reader(read_type: ReadType | EventType | str) -> Callable[[list], list]:
+    """Get the reader of a type, `read_raw` if none is registered."""
+    return READERS.get(read_type if isinstance(read_type, str) else read_type.value, read_raw)
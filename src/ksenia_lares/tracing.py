@@ -0,0 +1,59 @@
+import re
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple
+
+# PIN of Lares 4 frames (`"PIN": "123456"`) and of IP command URLs (`&pin=123456`)
+_PIN = re.compile(r'("PIN"\s*:\s*")[^"]*"|([?&]pin=)[^&]*')
+
+
+def redact(text: str) -> str:
+    """Replace the PINs in a frame or URL with `***`."""
+    return _PIN.sub(lambda match: f'{match[1]}***"' if match[1] else f"{match[2]}***", text)
+
+
+class TraceEntry(NamedTuple):
+    """Frame sent to or received from a panel."""
+
+    time: float
+    direction: str
+    frame: str
+
+
+class TraceBuffer:
+    """
+    Ring buffer of the most recent frames of a panel, for diagnostics.
+
+    Recording only appends the raw frame, PINs are redacted when the
+    entries are read.
+    """
+
+    def __init__(self, size: int = 100) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            size (int): Number of frames to keep.
+        """
+        self._entries: Deque[tuple] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, direction: str, frame: str | bytes) -> None:
+        """Record a frame, `direction` is `in` or `out`."""
+        self._entries.append((time.time(), direction, frame))
+
+    def entries(self) -> List[TraceEntry]:
+        """Get the recorded frames, oldest first, with PINs redacted."""
+        return [
+            TraceEntry(
+                timestamp,
+                direction,
+                redact(frame.decode("utf-8") if isinstance(frame, bytes) else frame),
+            )
+            for timestamp, direction, frame in self._entries
+        ]
+
+    def clear(self) -> None:
+        self._entries.clear()
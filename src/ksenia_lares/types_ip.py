@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, TypedDict
+from typing import List, Optional, TypedDict, Union
 
 class AlarmInfo(TypedDict):
     mac: Optional[str]
@@ -26,7 +26,7 @@ class ZoneBypass(Enum):
     OFF = "UN_BYPASS"
     ON = "BYPASS"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Zone:
     """Alarm zone."""
 
@@ -51,7 +51,7 @@ class PartitionStatus(Enum):
     ALARM = "ALARM"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Partition:
     """Alarm partition."""
 
@@ -64,7 +64,7 @@ class Partition:
         return self.description is not None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Scenario:
     """Alarm scenario."""
 
@@ -74,6 +74,23 @@ class Scenario:
     no_pin: bool
 
 
+@dataclass(slots=True)
+class Snapshot:
+    """Zones, partitions and scenarios fetched together."""
+
+    zones: List[Zone]
+    partitions: List[Partition]
+    scenarios: List[Scenario]
+
+
+@dataclass(slots=True)
+class Change:
+    """Change of a zone or partition between two polls."""
+
+    previous: Optional[Union[Zone, Partition]]
+    current: Union[Zone, Partition]
+
+
 class Command(Enum):
     "Alarm commands."
 
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum
 from sqlite3 import Time
-from typing import Optional
+from typing import List, Optional
 
 class ZoneStatus(Enum):
     """Bypass of alarm zone."""
@@ -58,6 +58,8 @@ class ReadType(Enum):
     STATUS_PARTITIONS = "STATUS_PARTITIONS"
 
 class ReadCallable(Enum):
+    """Names of the readers of each type, superseded by `readers.READERS`."""
+
     OUTPUTS = "read_outputs"
     BUS_HAS = "read_peripherals"
     SCENARIOS = "read_scenarios"
@@ -68,7 +70,7 @@ class ReadCallable(Enum):
     STATUS_ZONES = "read_zones_status"
     STATUS_PARTITIONS = "read_partitions_status"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Zone:
     """Alarm zone."""
 
@@ -85,7 +87,7 @@ class Zone:
     def enabled(self):
         return self.status == ZoneStatus.ARMED
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Partition:
     """Alarm partition."""
 
@@ -99,7 +101,7 @@ class Partition:
     def enabled(self):
         return self.armed != "D"
     
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Scenario:
     """Alarm scenario."""
 
@@ -108,7 +110,7 @@ class Scenario:
     pin: str
     category: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Output:
     """Output."""
     id: int
@@ -117,14 +119,14 @@ class Output:
     category: str
     mode: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BusPeripheral:
     """Bus peripheral."""
     id: int
     description: str
     type: BusPeripheralType
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OutputStatus:
     """Output status."""
     id: int
@@ -132,19 +134,19 @@ class OutputStatus:
     position: Optional[int] = None
     target_position: Optional[int] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemArmStatus:
     """System status."""
     mode: str
     status: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemTemperatureStatus:
     """System status."""
     inside: Optional[float] = None
     outside: Optional[float] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemTimeStatus:
     """System status."""
     gmt: int
@@ -153,34 +155,34 @@ class SystemTimeStatus:
     dawn: Time
     dusk: Time
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemStatus:
     """System status."""
     id: int
-    informations: list
-    tamper: list
-    tamper_memory: list
-    alarm: list
-    alarm_memory: list
-    fault: list
-    fault_memory: list
+    informations: tuple
+    tamper: tuple
+    tamper_memory: tuple
+    alarm: tuple
+    alarm_memory: tuple
+    fault: tuple
+    fault_memory: tuple
     arm: SystemArmStatus
     temperature: SystemTemperatureStatus
     time: SystemTimeStatus
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LinkStatus:
     type: str
     serial_number: str
     bus: int
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DomusStatus:
     temperature: float
     humidity: float
     light: float
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BusPeripheralStatus:
     """Bus peripheral status."""
     id: int
@@ -190,7 +192,7 @@ class BusPeripheralStatus:
     link: LinkStatus
     domus: Optional[DomusStatus] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ThermostatStatus:
     """Thermostat status."""
     season: ThermostatSeason
@@ -198,9 +200,23 @@ class ThermostatStatus:
     output: str
     timer: Optional[Time] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TemperatureStatus:
     """Temperature status."""
     id: int
     temperature: float
-    thermostat: ThermostatStatus
\ No newline at end of file
+    thermostat: ThermostatStatus
+
+@dataclass(slots=True)
+class Snapshot:
+    """Result of a batched read, `None` for types that were not requested."""
+    taken_at: float
+    outputs: Optional[List[Output]] = None
+    peripherals: Optional[List[BusPeripheral]] = None
+    scenarios: Optional[List[Scenario]] = None
+    outputs_status: Optional[List[OutputStatus]] = None
+    systems_status: Optional[List[SystemStatus]] = None
+    peripherals_status: Optional[List[BusPeripheralStatus]] = None
+    temperatures_status: Optional[List[TemperatureStatus]] = None
+    zones: Optional[List[Zone]] = None
+    partitions: Optional[List[Partition]] = None
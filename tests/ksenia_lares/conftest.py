@@ -0,0 +1,189 @@
+import asyncio
+import json
+import pytest
+from aiohttp import WSMessage, WSMsgType
+from ksenia_lares.lares4_api import verify_crc16
+
+
+class FakeWebSocket:
+    """Minimal stand-in for an aiohttp websocket, answering like a panel."""
+
+    def __init__(self, responder=None):
+        self.sent = []
+        self.closed = False
+        self._inbound = asyncio.Queue()
+        self._responder = responder or (lambda command: {"RESULT": "OK"})
+
+    async def send_str(self, frame):
+        command = json.loads(frame)
+        assert verify_crc16(frame)
+        self.sent.append(command)
+        payload = self._responder(command)
+        if payload is not None:
+            self.push(
+                {
+                    "SENDER": "panel",
+                    "RECEIVER": command["SENDER"],
+                    "CMD": f"{command['CMD']}_RES",
+                    "ID": command["ID"],
+                    "PAYLOAD_TYPE": command["PAYLOAD_TYPE"],
+                    "PAYLOAD": payload,
+                    "TIMESTAMP": command["TIMESTAMP"],
+                    "CRC_16": "0x0000",
+                }
+            )
+
+    def push(self, frame):
+        self._inbound.put_nowait(WSMessage(WSMsgType.TEXT, json.dumps(frame), None))
+
+    async def close(self):
+        self.closed = True
+        self._inbound.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self._inbound.get()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+
+def make_realtime_frame(sender, event, changes):
+    return {
+        "SENDER": "panel",
+        "RECEIVER": "",
+        "CMD": "REALTIME",
+        "ID": "1",
+        "PAYLOAD_TYPE": "CHANGES",
+        "PAYLOAD": {sender: {event.value: changes}},
+        "TIMESTAMP": "1700000000",
+        "CRC_16": "0x0000",
+    }
+
+
+@pytest.fixture
+def fake_websocket():
+    return FakeWebSocket
+
+
+@pytest.fixture
+def realtime_frame():
+    return make_realtime_frame
+
+
+@pytest.fixture
+def lares4_config():
+    return {"url": "192.168.1.2", "pin": "123456", "sender": "abc"}
+
+
+@pytest.fixture
+def mock_config():
+    return {
+        "username": "test_user",
+        "password": "test_pass",
+        "host": "192.168.1.1",
+        "port": 8080,
+    }
+
+
+@pytest.fixture
+def mock_xml_responses():
+    return {
+        "info/generalInfo.xml": """
+        <generalInfo>
+            <productName>Mock Alarm 128IP</productName>
+            <info1>Mock Info</info1>
+            <productHighRevision>1.0</productHighRevision>
+            <productLowRevision>2</productLowRevision>
+            <productBuildRevision>3</productBuildRevision>
+        </generalInfo>
+        """,
+        "zones/zonesStatus128IP.xml": """
+        <zonesStatus>
+            <zone>
+                <status>NORMAL</status>
+                <bypass>UN_BYPASS</bypass>
+            </zone>
+            <zone>
+                <status>ALARM</status>
+                <bypass>BYPASS</bypass>
+            </zone>
+            <zone>
+                <status>NOT_USED</status>
+                <bypass>UN_BYPASS</bypass>
+            </zone>
+        </zonesStatus>
+        """,
+        "zones/zonesDescription128IP.xml": """
+        <zonesDescription>
+            <zone>Description 1</zone>
+            <zone>Description 2</zone>
+            <zone></zone>
+        </zonesDescription>
+        """,
+        "partitionsDescription.xml": """
+        <partitionsDescription>
+            <partition>Description 1</partition>
+            <partition></partition>
+        </partitionsDescription>
+        """,
+        "partitionsStatus.xml": """
+        <partitionsStatus>
+            <partition>ARMED</partition>
+            <partition>DISARMED</partition>
+        </partitionsStatus>
+        """,
+        "scenariosDescription.xml": """
+        <scenariosDescription>
+            <scenario>Turn off</scenario>
+            <scenario>Alarm on</scenario>
+            <scenario>Scenario</scenario>
+        </scenariosDescription>
+        """,
+        "scenariosOptions.xml": """
+        <scenariosOptions>
+            <scenario>
+                <abil>TRUE</abil>
+                <nopin>TRUE</nopin>
+            </scenario>
+            <scenario>
+                <abil>TRUE</abil>
+                <nopin>FALSE</nopin>
+            </scenario>
+            <scenario>
+                <abil>FALSE</abil>
+                <nopin>FALSE</nopin>
+            </scenario>
+        </scenariosOptions>
+        """,
+        "zones/zonesStatus16IP.xml": """
+        <zonesStatus>
+            <zone><status>NORMAL</status><bypass>UN_BYPASS</bypass></zone>
+            <zone><status>{status}</status><bypass>UN_BYPASS</bypass></zone>
+        </zonesStatus>
+        """,
+        "zones/zonesDescription16IP.xml": """
+        <zonesDescription>
+            <zone>Door</zone>
+            <zone>Window</zone>
+        </zonesDescription>
+        """,
+        "partitions/partitionsStatus16IP.xml": """
+        <partitionsStatus>
+            <partition>DISARMED</partition>
+        </partitionsStatus>
+        """,
+        "partitions/partitionsDescription16IP.xml": """
+        <partitionsDescription>
+            <partition>House</partition>
+        </partitionsDescription>
+        """,
+        "CommandSuccess": """
+        <cmd>cmdSent</cmd>        
+        """,
+        "CommandFailed": """
+        <cmd>Command failed, error error error</cmd>        
+        """,
+    }
@@ -0,0 +1,171 @@
+import asyncio
+import time
+import pytest
+from aioresponses import aioresponses
+from ksenia_lares import IpAPI
+from ksenia_lares import cache as cache_module
+from ksenia_lares.cache import CacheEntry, DescriptionCache, InfoCache, JsonFileCache, JsonFileInfoCache
+
+
+def test_ttl_marks_entries_stale():
+    cache = DescriptionCache(ttl=60)
+
+    assert cache.is_fresh(CacheEntry(descriptions=[], stored_at=time.time()))
+    assert not cache.is_fresh(CacheEntry(descriptions=[], stored_at=time.time() - 61))
+    assert DescriptionCache().is_fresh(CacheEntry(descriptions=[], stored_at=0))
+
+
+def test_invalidate_by_prefix():
+    cache = DescriptionCache()
+    cache.set("a:80/zones.xml", CacheEntry(descriptions=["a"], stored_at=0))
+    cache.set("b:80/zones.xml", CacheEntry(descriptions=["b"], stored_at=0))
+
+    cache.invalidate("a:80/")
+
+    assert cache.get("a:80/zones.xml") is None
+    assert cache.get("b:80/zones.xml") is not None
+
+
+def test_json_file_cache_persists(tmp_path):
+    path = str(tmp_path / "descriptions.json")
+    cache = JsonFileCache(path)
+    cache.set("a:80/zones.xml", CacheEntry(descriptions=["Door", None], stored_at=1, etag='"1"'))
+
+    reloaded = JsonFileCache(path)
+
+    assert reloaded.get("a:80/zones.xml") == CacheEntry(descriptions=["Door", None], stored_at=1, etag='"1"')
+
+
+@pytest.mark.asyncio
+async def test_json_file_cache_batches_writes_on_the_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "descriptions.json")
+    writes = []
+    save_json = cache_module._save_json
+    monkeypatch.setattr(cache_module, "_save_json", lambda *args: writes.append(args) or save_json(*args))
+    cache = JsonFileCache(path, flush_delay=0.01)
+
+    for index in range(100):
+        cache.set(f"a{index}:80/zones.xml", CacheEntry(descriptions=["Door"], stored_at=1))
+    assert writes == []
+
+    await asyncio.sleep(0.05)
+    assert len(writes) == 1
+    assert len(JsonFileCache(path).get("a99:80/zones.xml").descriptions) == 1
+
+    cache.invalidate("a1")
+    cache.flush()
+    assert len(writes) == 2
+    assert JsonFileCache(path).get("a1:80/zones.xml") is None
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_cache_writes(tmp_path, mock_config):
+    path = str(tmp_path / "descriptions.json")
+    cache = JsonFileCache(path, flush_delay=60)
+    api = IpAPI(mock_config, description_cache=cache)
+    cache.set("a:80/zones.xml", CacheEntry(descriptions=["Door"], stored_at=1))
+
+    await api.close()
+
+    assert JsonFileCache(path).get("a:80/zones.xml").descriptions == ["Door"]
+
+
+@pytest.mark.asyncio
+async def test_stale_descriptions_are_revalidated(mock_config, mock_xml_responses):
+    cache = DescriptionCache(ttl=60)
+    cache.set(
+        "192.168.1.1:8080/scenarios/scenariosDescription.xml",
+        CacheEntry(descriptions=["Cached", "Alarm on", "Scenario"], stored_at=time.time() - 120, etag='"v1"'),
+    )
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/scenarios/scenariosOptions.xml",
+            body=mock_xml_responses["scenariosOptions.xml"],
+            content_type="text/xml",
+        )
+        mocked.get(
+            "http://192.168.1.1:8080/xml/scenarios/scenariosDescription.xml",
+            status=304,
+        )
+
+        async with IpAPI(mock_config, description_cache=cache) as api:
+            result = await api.get_scenarios()
+
+        calls = next(calls for (_, url), calls in mocked.requests.items() if url.path.endswith("Description.xml"))
+        assert calls[0].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    entry = cache.get("192.168.1.1:8080/scenarios/scenariosDescription.xml")
+    assert result[0].description == "Cached"
+    assert entry.etag == '"v1"'
+    assert cache.is_fresh(entry)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_descriptions_downloads_again(mock_config, mock_xml_responses):
+    cache = DescriptionCache()
+    cache.set(
+        "192.168.1.1:8080/scenarios/scenariosDescription.xml",
+        CacheEntry(descriptions=["Cached"], stored_at=time.time()),
+    )
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/scenarios/scenariosOptions.xml",
+            body=mock_xml_responses["scenariosOptions.xml"],
+            content_type="text/xml",
+        )
+        mocked.get(
+            "http://192.168.1.1:8080/xml/scenarios/scenariosDescription.xml",
+            body=mock_xml_responses["scenariosDescription.xml"],
+            content_type="text/xml",
+        )
+
+        async with IpAPI(mock_config, description_cache=cache) as api:
+            api.invalidate_descriptions()
+            result = await api.get_scenarios()
+
+    assert result[0].description == "Turn off"
+
+
+def test_json_file_info_cache_persists(tmp_path):
+    path = str(tmp_path / "info.json")
+    info = {"mac": None, "host": "a:80", "name": "Lares 48IP", "info": "", "version": "1", "revision": "2", "build": "3"}
+    JsonFileInfoCache(path).set("a:80", info)
+
+    assert JsonFileInfoCache(path).get("a:80") == info
+
+
+@pytest.mark.asyncio
+async def test_model_from_info_cache_skips_info(mock_config):
+    cache = InfoCache()
+    cache.set("192.168.1.1:8080", {"mac": None, "host": "192.168.1.1:8080", "name": "Lares 48IP", "info": "", "version": "1", "revision": "2", "build": "3"})
+
+    with aioresponses():
+        async with IpAPI(mock_config, info_cache=cache) as api:
+            assert await api.get_model() == "48IP"
+
+
+@pytest.mark.asyncio
+async def test_info_fills_info_cache(mock_config, mock_xml_responses):
+    cache = InfoCache()
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/info/generalInfo.xml",
+            body=mock_xml_responses["info/generalInfo.xml"],
+            content_type="text/xml",
+        )
+
+        async with IpAPI({**mock_config, "resolve_mac": False}, info_cache=cache) as api:
+            info = await api.info()
+
+    assert info["mac"] is None
+    assert cache.get("192.168.1.1:8080")["name"] == "Mock Alarm 128IP"
+
+
+@pytest.mark.asyncio
+async def test_configured_model_skips_info(mock_config):
+    with aioresponses():
+        async with IpAPI({**mock_config, "model": "128IP"}) as api:
+            assert await api.get_model() == "128IP"
@@ -0,0 +1,101 @@
+import pytest
+
+from ksenia_lares import columnar
+from ksenia_lares.columnar import NO_POSITION, OutputTable, ZoneTable
+from ksenia_lares.types_ip import Zone as ZoneIP, ZoneBypass as ZoneBypassIP, ZoneStatus as ZoneStatusIP
+from ksenia_lares.types_lares4 import OutputStatus, Zone, ZoneBypass, ZoneStatus
+
+
+def lares4_zone(id, alarm="N"):
+    return Zone(id, ZoneStatus.READY, ZoneBypass.OFF, "N", alarm, "NA", "F", f"Zone {id}")
+
+
+def ip_zone(id, status=ZoneStatusIP.NORMAL):
+    return ZoneIP(id, f"Zone {id}", status, ZoneBypassIP.OFF)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(columnar, "numpy", None)
+    else:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def test_zones_in_alarm_across_panels(backend):
+    fleet = ZoneTable.concat(
+        [
+            ZoneTable.from_zones([lares4_zone(1), lares4_zone(2, alarm="Y")], panel="panel-a"),
+            ZoneTable.from_zones([ip_zone(1, ZoneStatusIP.ALARM), ip_zone(2)], panel="panel-b"),
+        ]
+    )
+
+    rows = fleet.in_alarm()
+
+    assert [(record["panel"], record["id"]) for record in fleet.records(rows)] == [
+        ("panel-a", 2),
+        ("panel-b", 1),
+    ]
+    assert fleet.where(fleet.isin("panel", ["panel-b"]), fleet.isin("status", ["NORMAL"])) == [3]
+
+
+def test_string_columns_are_dictionary_encoded():
+    table = ZoneTable.from_zones([lares4_zone(id) for id in range(1, 49)])
+
+    assert table.categories["status"] == [None, "R"]
+    assert table.columns["status"].tobytes() == b"\x01" * 48
+    assert table.buffers()["id"].nbytes == 48 * table.columns["id"].itemsize
+
+
+def test_outputs_without_position():
+    table = OutputTable.from_outputs([OutputStatus(1, "ON"), OutputStatus(2, "OFF", 40, 100)], panel="panel-a")
+
+    assert list(table.columns["position"]) == [NO_POSITION, 40]
+    assert table.records([1]) == [
+        {"panel": "panel-a", "id": 2, "status": "OFF", "position": 40, "target_position": 100}
+    ]
+
+
+def test_numpy_export_shares_memory():
+    numpy = pytest.importorskip("numpy")
+    table = ZoneTable.from_zones([lares4_zone(1), lares4_zone(2)], panel="panel-a")
+
+    ids = table.to_numpy_column("id")
+    table.columns["id"][0] = 7
+
+    assert ids.tolist() == [7, 2]
+    assert table.to_numpy()["id"].tolist() == [7, 2]
+    assert numpy.shares_memory(ids, table.to_numpy_column("id"))
+
+
+def test_arrow_export():
+    pytest.importorskip("pyarrow")
+    table = ZoneTable.from_zones([lares4_zone(1), lares4_zone(2, alarm="Y")], panel="panel-a")
+
+    exported = table.to_arrow()
+
+    assert exported.column("id").to_pylist() == [1, 2]
+    assert exported.column("alarm").to_pylist() == ["N", "Y"]
+    assert exported.column("panel").to_pylist() == ["panel-a", "panel-a"]
+
+
+def test_table_is_frozen_while_views_exist():
+    pytest.importorskip("numpy")
+    table = ZoneTable.from_zones([lares4_zone(1), lares4_zone(2)], panel="panel-a")
+
+    ids = table.to_numpy_column("id")
+    with pytest.raises(BufferError):
+        table.add([lares4_zone(3, alarm="Y")], panel="panel-b")
+
+    assert {name: len(column) for name, column in table.columns.items()} == dict.fromkeys(table.columns, 2)
+    assert table.panels == ["panel-a"]
+    assert table.categories["alarm"] == [None, "N"]
+
+    del ids
+    table.add([lares4_zone(3, alarm="Y")], panel="panel-b")
+    assert [(record["panel"], record["id"], record["alarm"]) for record in table.records()] == [
+        ("panel-a", 1, "N"),
+        ("panel-a", 2, "N"),
+        ("panel-b", 3, "Y"),
+    ]
@@ -1,100 +1,12 @@
+import asyncio
 from unittest.mock import patch
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession
 import pytest
 from aioresponses import aioresponses
 from ksenia_lares import IpAPI
 from ksenia_lares.types_ip import PartitionStatus, Scenario, Zone, ZoneBypass, ZoneStatus
 
 
-@pytest.fixture
-def mock_config():
-    return {
-        "username": "test_user",
-        "password": "test_pass",
-        "host": "192.168.1.1",
-        "port": 8080,
-    }
-
-
-@pytest.fixture
-def mock_xml_responses():
-    return {
-        "info/generalInfo.xml": """
-        <generalInfo>
-            <productName>Mock Alarm 128IP</productName>
-            <info1>Mock Info</info1>
-            <productHighRevision>1.0</productHighRevision>
-            <productLowRevision>2</productLowRevision>
-            <productBuildRevision>3</productBuildRevision>
-        </generalInfo>
-        """,
-        "zones/zonesStatus128IP.xml": """
-        <zonesStatus>
-            <zone>
-                <status>NORMAL</status>
-                <bypass>UN_BYPASS</bypass>
-            </zone>
-            <zone>
-                <status>ALARM</status>
-                <bypass>BYPASS</bypass>
-            </zone>
-            <zone>
-                <status>NOT_USED</status>
-                <bypass>UN_BYPASS</bypass>
-            </zone>
-        </zonesStatus>
-        """,
-        "zones/zonesDescription128IP.xml": """
-        <zonesDescription>
-            <zone>Description 1</zone>
-            <zone>Description 2</zone>
-            <zone></zone>
-        </zonesDescription>
-        """,
-        "partitionsDescription.xml": """
-        <partitionsDescription>
-            <partition>Description 1</partition>
-            <partition></partition>
-        </partitionsDescription>
-        """,
-        "partitionsStatus.xml": """
-        <partitionsStatus>
-            <partition>ARMED</partition>
-            <partition>DISARMED</partition>
-        </partitionsStatus>
-        """,
-        "scenariosDescription.xml": """
-        <scenariosDescription>
-            <scenario>Turn off</scenario>
-            <scenario>Alarm on</scenario>
-            <scenario>Scenario</scenario>
-        </scenariosDescription>
-        """,
-        "scenariosOptions.xml": """
-        <scenariosOptions>
-            <scenario>
-                <abil>TRUE</abil>
-                <nopin>TRUE</nopin>
-            </scenario>
-            <scenario>
-                <abil>TRUE</abil>
-                <nopin>FALSE</nopin>
-            </scenario>
-            <scenario>
-                <abil>FALSE</abil>
-                <nopin>FALSE</nopin>
-            </scenario>
-        </scenariosOptions>
-        """,
-        "CommandSuccess": """
-        <cmd>cmdSent</cmd>        
-        """,
-        "CommandFailed": """
-        <cmd>Command failed, error error error</cmd>        
-        """,
-    }
-
-
 @pytest.mark.asyncio
 async def test_info_standard_response(mock_config, mock_xml_responses):
     with aioresponses() as mocked:
@@ -456,3 +368,103 @@ async def test_bypass_zone_failed(mock_config, mock_xml_responses):
 
         mocked.assert_called
         assert result == False
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused(mock_config, mock_xml_responses):
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/info/generalInfo.xml",
+            body=mock_xml_responses["info/generalInfo.xml"],
+            content_type="text/xml",
+            repeat=True,
+        )
+
+        async with IpAPI(mock_config) as api:
+            await api.info()
+            session = api._session
+            await api.info()
+
+            assert api._session is session
+            assert not session.closed
+
+        assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_shared_session_is_not_closed(mock_config):
+    async with ClientSession() as session:
+        api = IpAPI(mock_config, session=session)
+        await api.close()
+
+        assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_connection_error(mock_config):
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/info/generalInfo.xml",
+            exception=asyncio.TimeoutError(),
+        )
+
+        async with IpAPI(mock_config) as api:
+            with pytest.raises(ConnectionError):
+                await api.info()
+
+
+@pytest.mark.asyncio
+async def test_get_all_successfull(mock_config, mock_xml_responses):
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/info/generalInfo.xml",
+            body=mock_xml_responses["info/generalInfo.xml"],
+            content_type="text/xml",
+        )
+        for path, body in (
+            ("zones/zonesStatus128IP.xml", "zones/zonesStatus128IP.xml"),
+            ("zones/zonesDescription128IP.xml", "zones/zonesDescription128IP.xml"),
+            ("partitions/partitionsStatus128IP.xml", "partitionsStatus.xml"),
+            ("partitions/partitionsDescription128IP.xml", "partitionsDescription.xml"),
+            ("scenarios/scenariosOptions.xml", "scenariosOptions.xml"),
+            ("scenarios/scenariosDescription.xml", "scenariosDescription.xml"),
+        ):
+            mocked.get(
+                f"http://192.168.1.1:8080/xml/{path}",
+                body=mock_xml_responses[body],
+                content_type="text/xml",
+            )
+
+        async with IpAPI(mock_config) as api:
+            result = await api.get_all()
+
+        assert len(result.zones) == 3
+        assert len(result.partitions) == 2
+        assert len(result.scenarios) == 3
+        assert result.zones[1].status == ZoneStatus.ALARM
+
+
+@pytest.mark.asyncio
+async def test_get_zones_large_document(mock_config):
+    zone = "<zone><status>NORMAL</status><bypass>UN_BYPASS</bypass></zone>"
+    description = "<zone>Zone description</zone>"
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "http://192.168.1.1:8080/xml/zones/zonesStatus128IP.xml",
+            body=f"<zonesStatus>{zone * 128}</zonesStatus>",
+            content_type="text/xml",
+        )
+        mocked.get(
+            "http://192.168.1.1:8080/xml/zones/zonesDescription128IP.xml",
+            body=f"<zonesDescription>{description * 128}</zonesDescription>",
+            content_type="text/xml",
+        )
+
+        async with IpAPI({**mock_config, "model": "128IP"}) as api:
+            zones = await api.get_zones()
+
+        assert len(zones) == 128
+        assert zones[127].id == 127
+        assert zones[127].description == "Zone description"
+        assert zones[127].status == ZoneStatus.NORMAL
@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+from aioresponses import aioresponses
+from lxml import etree
+from ksenia_lares import IpAPI
+from ksenia_lares.ip_poller import IpPoller, PollScheduler
+from ksenia_lares.types_ip import Change, Partition, PartitionStatus, ZoneStatus
+
+
+@pytest.fixture
+def mock_config(mock_config):
+    return {**mock_config, "model": "16IP"}
+
+
+@pytest.fixture
+def mock_panel(mock_xml_responses):
+    def mock(mocked, zone_status="NORMAL"):
+        for path in (
+            "zones/zonesStatus16IP.xml",
+            "zones/zonesDescription16IP.xml",
+            "partitions/partitionsStatus16IP.xml",
+            "partitions/partitionsDescription16IP.xml",
+        ):
+            mocked.get(
+                f"http://192.168.1.1:8080/xml/{path}",
+                body=mock_xml_responses[path].format(status=zone_status),
+                content_type="text/xml",
+            )
+
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_first_poll_reports_everything(mock_config, mock_panel):
+    with aioresponses() as mocked:
+        mock_panel(mocked)
+
+        async with IpAPI(mock_config) as api:
+            changes = await IpPoller(api).poll()
+
+    assert len(changes) == 3
+    assert all(change.previous is None for change in changes)
+    assert changes[2].current.status == PartitionStatus.DISARMED
+
+
+@pytest.mark.asyncio
+async def test_unchanged_documents_report_nothing(mock_config, mock_panel):
+    with aioresponses() as mocked:
+        mock_panel(mocked)
+        mock_panel(mocked)
+
+        async with IpAPI(mock_config) as api:
+            poller = IpPoller(api)
+            await poller.poll()
+            zones = poller.zones
+            changes = await poller.poll()
+
+    assert changes == []
+    assert poller.zones is zones
+
+
+@pytest.mark.asyncio
+async def test_changed_zone_is_reported_to_listeners(mock_config, mock_panel):
+    received = []
+
+    with aioresponses() as mocked:
+        mock_panel(mocked)
+        mock_panel(mocked, zone_status="ALARM")
+
+        async with IpAPI(mock_config) as api:
+            poller = IpPoller(api)
+            await poller.poll()
+            poller.add_listener(received.append)
+            await poller.poll()
+
+    assert len(received) == 1
+    assert received[0].previous.status == ZoneStatus.NORMAL
+    assert received[0].current.status == ZoneStatus.ALARM
+    assert received[0].current.description == "Window"
+
+
+def test_next_interval_adapts_to_partition_status(mock_config):
+    scheduler = PollScheduler(interval=5, active_interval=1, idle_interval=30)
+    poller = scheduler.add(IpAPI(mock_config))
+    poller.partitions = [Partition(id=0, description="House", status=PartitionStatus.DISARMED)]
+
+    assert scheduler.next_interval(poller, []) == 30
+    assert scheduler.next_interval(poller, [Change(previous=None, current=poller.partitions[0])]) == 5
+
+    poller.partitions = [Partition(id=0, description="House", status=PartitionStatus.ARMED)]
+    assert scheduler.next_interval(poller, []) == 5
+
+    poller.partitions = [Partition(id=0, description="House", status=PartitionStatus.ARMING)]
+    assert scheduler.next_interval(poller, []) == 1
+
+
+def test_backoff_interval_is_capped():
+    scheduler = PollScheduler(interval=5, max_backoff=60)
+
+    assert scheduler.backoff_interval(1) == 10
+    assert scheduler.backoff_interval(2) == 20
+    assert scheduler.backoff_interval(10) == 60
+
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_and_backs_off(mock_config):
+    scheduler = PollScheduler(interval=0.01, active_interval=0.01, idle_interval=0.01, jitter=0)
+    poller = scheduler.add(IpAPI(mock_config))
+    calls = []
+
+    async def failing_poll():
+        calls.append(None)
+        raise ConnectionError("unreachable")
+
+    poller.poll = failing_poll
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    # Backoff doubles the delay after every failure, so only a few polls fit
+    assert 1 <= len(calls) <= 4
+
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_polling_after_malformed_documents(mock_config, caplog):
+    scheduler = PollScheduler(interval=0.01, active_interval=0.01, idle_interval=0.01, max_backoff=0.01, jitter=0)
+    poller = scheduler.add(IpAPI(mock_config))
+    calls = []
+
+    async def poll():
+        calls.append(None)
+        if len(calls) == 1:
+            raise etree.XMLSyntaxError("truncated", None, 1, 1)
+        return []
+
+    poller.poll = poll
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert len(calls) > 2
+    assert "Poll failed (truncated" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_scheduler_logs_programming_errors(mock_config, caplog):
+    scheduler = PollScheduler(interval=0.01, jitter=0)
+    poller = scheduler.add(IpAPI(mock_config))
+
+    async def poll():
+        raise AttributeError("bug")
+
+    poller.poll = poll
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert "Polling stopped by unexpected error" in caplog.text
@@ -0,0 +1,96 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from ksenia_lares import IpAPI
+from ksenia_lares.cache import DescriptionCache
+from ksenia_lares.ip_simulator import IpSimulator, SimulatedIpPanel
+from ksenia_lares.types_ip import PartitionStatus, ZoneBypass, ZoneStatus
+
+
+@pytest.fixture
+async def simulator():
+    async with IpSimulator([SimulatedIpPanel("48IP", seed=1)], port=0) as simulator:
+        yield simulator
+
+
+async def test_get_all(simulator):
+    async with IpAPI(simulator.configs()[0]) as api:
+        snapshot = await api.get_all()
+
+        assert await api.get_model() == "48IP"
+
+    assert len(snapshot.zones) == 48
+    assert snapshot.zones[0].description == "Zone 1"
+    assert len(snapshot.partitions) == 8
+    assert snapshot.partitions[0].status == PartitionStatus.DISARMED
+    assert len(snapshot.scenarios) == 32
+
+
+async def test_zone_changes_and_bypass(simulator):
+    panel = simulator.panels[0]
+    panel.zones[2]["status"] = "ALARM"
+    panel.invalidate()
+
+    async with IpAPI(simulator.configs()[0]) as api:
+        assert await api.bypass_zone(1, "123456", ZoneBypass.ON)
+        assert not await api.bypass_zone(1, "000000", ZoneBypass.OFF)
+        zones = await api.get_zones()
+
+    assert zones[2].status == ZoneStatus.ALARM
+    assert zones[1].bypass == ZoneBypass.ON
+
+
+async def test_descriptions_are_revalidated(simulator):
+    async with IpAPI(simulator.configs()[0], description_cache=DescriptionCache(ttl=0)) as api:
+        await api.get_zones()
+        await api.get_zones()
+
+    assert simulator.not_modified == 1
+
+
+def test_documents_are_rendered_once_per_change():
+    panel = SimulatedIpPanel("16IP", seed=1)
+
+    status = panel.document("zones/zonesStatus16IP.xml")
+    descriptions = panel.document("zones/zonesDescription16IP.xml")
+    assert panel.document("zones/zonesStatus16IP.xml") is status
+    assert panel.document("unknown.xml") is None
+
+    panel.random_changes()
+
+    assert panel.document("zones/zonesStatus16IP.xml") != status
+    assert panel.document("zones/zonesDescription16IP.xml") is descriptions
+
+
+async def test_wrong_credentials(simulator):
+    config = {**simulator.configs()[0], "password": "wrong"}
+
+    async with IpAPI(config) as api:
+        with pytest.raises(aiohttp.ClientResponseError) as err:
+            await api.get_zones()
+
+    assert err.value.status == 401
+
+
+async def test_error_injection(simulator):
+    simulator.error_rate = 1
+
+    async with IpAPI(simulator.configs()[0]) as api:
+        with pytest.raises(aiohttp.ClientResponseError):
+            await api.get_zones()
+
+    assert simulator.errors > 0
+
+
+async def test_fleet():
+    panels = [SimulatedIpPanel(model) for model in ("16IP", "48IP", "128IP") for _ in range(10)]
+
+    async with IpSimulator(panels, port=0) as simulator:
+        assert len(set(simulator.ports)) == 30
+        async with aiohttp.ClientSession() as session:
+            apis = [IpAPI(config, session=session) for config in simulator.configs()]
+            zones = await asyncio.gather(*(api.get_zones() for api in apis))
+
+    assert sorted({len(panel_zones) for panel_zones in zones}) == [16, 48, 128]
@@ -0,0 +1,439 @@
+import asyncio
+import json
+import os
+import ssl
+import pytest
+from ksenia_lares.codec import CODECS, get_codec
+from ksenia_lares.lares4_api import CommandFactory, Lares4API, crc16, crc16_bytes, get_ssl_context, verify_crc16
+from ksenia_lares.types_lares4 import EventType, ReadType, ZoneBypass, ZoneStatus
+
+
+READ_FRAME = (
+    '{"SENDER": "abc", "RECEIVER": "", "CMD": "READ", "ID": "1", "PAYLOAD_TYPE": "MULTI_TYPES", '
+    '"PAYLOAD": {"ID_LOGIN": "7", "ID_READ": "1", "TYPES": ["STATUS_ZONES"]}, '
+    '"TIMESTAMP": "1700000000", "CRC_16": "0x0000"}'
+)
+
+UNICODE_FRAME = '{"SENDER":"abc","PAYLOAD":{"DES":"Cucina è aperta ✓"},"CRC_16":"0x0000"}'
+
+
+def test_crc16_matches_reference_values():
+    assert crc16(READ_FRAME) == "0x40d2"
+    assert crc16(UNICODE_FRAME) == "0x3c79"
+
+
+def test_crc16_bytes_matches_text():
+    assert crc16_bytes(UNICODE_FRAME.encode("utf-8")) == crc16(UNICODE_FRAME)
+
+
+def test_crc16_ignores_crc_value():
+    assert crc16(READ_FRAME) == crc16(READ_FRAME.replace("0x0000", "0xffff"))
+
+
+def test_crc16_missing_field():
+    with pytest.raises(ValueError):
+        crc16('{"CMD": "READ"}')
+
+
+def test_verify_crc16():
+    factory = CommandFactory("abc", "123456")
+    factory.set_login_id("7")
+    frame = json.dumps(factory.build_command("READ", "MULTI_TYPES", {"ID_LOGIN": True}))
+
+    assert verify_crc16(frame)
+    assert verify_crc16(frame.encode("utf-8"))
+    assert not verify_crc16(frame.replace('"READ"', '"REED"'))
+    assert not verify_crc16('{"CMD": "READ"}')
+
+
+@pytest.mark.asyncio
+async def test_login_sets_login_id(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket(lambda command: {"RESULT": "OK", "ID_LOGIN": "42"})
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+
+    await api.login()
+
+    assert api.command_factory.get_login_id() == "42"
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_send_and_receive_login(lares4_config, fake_websocket):
+    ws = fake_websocket(lambda command: {"RESULT": "OK", "ID_LOGIN": "42"})
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+
+    await api.send_login()
+    await api.receive_login()
+
+    assert api.command_factory.get_login_id() == "42"
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_are_matched_by_id(lares4_config, fake_websocket, realtime_frame):
+    held = []
+
+    def responder(command):
+        held.append(command)
+        return None
+
+    ws = fake_websocket(responder)
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+
+    first = asyncio.create_task(api.command("CMD_USR", "CMD_SET_OUTPUT", {"VAL": "1"}))
+    second = asyncio.create_task(api.command("CMD_USR", "CMD_SET_OUTPUT", {"VAL": "2"}))
+    await asyncio.sleep(0)
+    assert len(held) == 2
+
+    # Answer out of order, with a realtime push in between
+    for command in reversed(held):
+        ws.push({**command, "CMD": "CMD_USR_RES", "PAYLOAD": {"VAL": command["PAYLOAD"]["VAL"]}})
+        ws.push(realtime_frame("abc", EventType.ZONES, []))
+
+    assert (await first)["PAYLOAD"]["VAL"] == "1"
+    assert (await second)["PAYLOAD"]["VAL"] == "2"
+    assert (await api.receive_command())["CMD"] == "REALTIME"
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_command_timeout(lares4_config, fake_websocket, realtime_frame):
+    api = Lares4API(lares4_config)
+    api._attach(fake_websocket(lambda command: None))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await api.command("CMD_USR", "CMD_SET_OUTPUT", {}, timeout=0.01)
+
+    assert api._pending == {}
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_close_fails_pending_commands(lares4_config, fake_websocket, realtime_frame):
+    api = Lares4API(lares4_config)
+    api._attach(fake_websocket(lambda command: None))
+
+    pending = asyncio.create_task(api.command("CMD_USR", "CMD_SET_OUTPUT", {}))
+    await asyncio.sleep(0)
+    await api.close()
+
+    with pytest.raises(ConnectionError):
+        await pending
+
+
+@pytest.mark.asyncio
+async def test_listen_dispatches_changes(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    received = []
+
+    await api.add_event_listener(EventType.ZONES, received.append)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1", "STA": "A"}]))
+    ws.push(realtime_frame("abc", EventType.OUTPUTS, [{"ID": "2", "STA": "ON"}]))
+    await ws.close()
+    await api.listen()
+
+    assert received == [[{"ID": "1", "STA": "A"}]]
+
+
+@pytest.fixture
+def read_responder():
+    payloads = {
+        "STATUS_ZONES": [{"ID": "1", "STA": "R", "BYP": "NO", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": ""}],
+        "STATUS_OUTPUTS": [{"ID": "1", "STA": "ON"}],
+        "STATUS_PARTITIONS": [{"ID": "1", "ARM": "D", "T": "N", "AST": "OK", "TST": "N"}],
+    }
+
+    def responder(command):
+        if command["CMD"] != "READ":
+            return {"RESULT": "OK"}
+        return {"RESULT": "OK", **{key: payloads[key] for key in command["PAYLOAD"]["TYPES"]}}
+
+    return responder
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_in_one_round_trip(lares4_config, fake_websocket, read_responder):
+    ws = fake_websocket(read_responder)
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+
+    snapshot = await api.snapshot([ReadType.STATUS_ZONES, ReadType.STATUS_OUTPUTS, ReadType.STATUS_PARTITIONS])
+
+    assert len(ws.sent) == 1
+    assert snapshot.zones[0].status == ZoneStatus.READY
+    assert snapshot.outputs_status[0].status == "ON"
+    assert snapshot.partitions[0].enabled is False
+    assert snapshot.scenarios is None
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_getters_use_fresh_snapshot(lares4_config, fake_websocket, read_responder):
+    ws = fake_websocket(read_responder)
+    api = Lares4API(lares4_config, max_age=60)
+    api._attach(ws)
+
+    await api.snapshot([ReadType.STATUS_ZONES])
+    zones = await api.get_zones()
+    outputs = await api.get_outputs_status()
+
+    assert zones[0].id == 1
+    assert outputs[0].id == 1
+    assert [command["PAYLOAD"]["TYPES"] for command in ws.sent] == [["STATUS_ZONES"], ["STATUS_OUTPUTS"]]
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_getters_without_max_age_always_read(lares4_config, fake_websocket, read_responder, monkeypatch):
+    # A coarse clock returns the same time for consecutive reads
+    monkeypatch.setattr("ksenia_lares.lares4_api.time.monotonic", lambda: 100.0)
+    ws = fake_websocket(read_responder)
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+
+    await api.snapshot([ReadType.STATUS_ZONES])
+    await api.get_zones()
+
+    assert len(ws.sent) == 2
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_supervise_reconnects_and_resyncs(lares4_config, fake_websocket):
+    zones = [{"ID": "1", "STA": "A"}]
+
+    def responder(command):
+        if command["CMD"] == "LOGIN":
+            return {"RESULT": "OK", "ID_LOGIN": "9"}
+        if command["CMD"] == "READ":
+            return {"RESULT": "OK", "STATUS_ZONES": zones}
+        return {"RESULT": "OK"}
+
+    websockets = [fake_websocket(responder), fake_websocket(responder)]
+    connected = asyncio.Queue()
+
+    class FakeSession:
+        async def ws_connect(self, url, **kwargs):
+            ws = websockets.pop(0)
+            connected.put_nowait(ws)
+            return ws
+
+    api = Lares4API(lares4_config)
+    received = []
+    await api.add_event_listener(EventType.ZONES, received.append)
+    supervisor = asyncio.create_task(api.supervise(session=FakeSession(), initial_backoff=0))
+
+    first = await connected.get()
+    await asyncio.sleep(0.01)
+    await first.close()
+    second = await connected.get()
+    await asyncio.sleep(0.01)
+    await api.close()
+    await supervisor
+
+    assert [command["CMD"] for command in first.sent] == ["LOGIN", "REALTIME"]
+    assert [command["CMD"] for command in second.sent] == ["LOGIN", "REALTIME", "READ"]
+    assert second.sent[1]["PAYLOAD"]["TYPES"] == ["STATUS_ZONES"]
+    assert received == [zones]
+
+
+PANEL_PEM = os.path.join(os.path.dirname(__file__), "panel.pem")
+
+
+def test_ssl_context_is_cached():
+    assert get_ssl_context() is get_ssl_context()
+    assert get_ssl_context().verify_mode == ssl.CERT_NONE
+    assert get_ssl_context(cafile=PANEL_PEM).verify_mode == ssl.CERT_REQUIRED
+    assert get_ssl_context(verify=True).check_hostname
+
+
+@pytest.mark.asyncio
+async def test_ssl_context_resumes_sessions():
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(PANEL_PEM)
+
+    async def handle(reader, writer):
+        await reader.read(1)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=server_context)
+    port = server.sockets[0].getsockname()[1]
+    reused = []
+
+    for _ in range(2):
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", port, ssl=get_ssl_context(cafile=PANEL_PEM), server_hostname="127.0.0.1"
+        )
+        writer.write(b"x")
+        await reader.read()
+        reused.append(writer.get_extra_info("ssl_object").session_reused)
+        writer.close()
+
+    server.close()
+    await server.wait_closed()
+    assert reused == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_listen_typed_merges_partial_changes(lares4_config, fake_websocket, realtime_frame, caplog):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    api._typed_state["STATUS_ZONES"] = {
+        "1": {"ID": "1", "STA": "R", "BYP": "NO", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": "Door"}
+    }
+    typed = []
+
+    await api.add_event_listener(EventType.ZONES, typed.append, typed=True)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1", "STA": "A"}]))
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1", "BYP": "YES"}, {"ID": "9", "STA": "A"}]))
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "9", "STA": "R"}]))
+    await ws.close()
+    await api.listen()
+
+    assert [[(zone.id, zone.status, zone.bypass, zone.label) for zone in changes] for changes in typed] == [
+        [(1, ZoneStatus.ARMED, ZoneBypass.OFF, "Door")],
+        [(1, ZoneStatus.ARMED, ZoneBypass.ON, "Door")],
+    ]
+    assert "Cannot parse STATUS_ZONES 9" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_listen_registers_listeners_added_before_connecting(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    received = []
+    await api.add_event_listener(EventType.ZONES, received.append)
+
+    api._attach(ws)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1"}]))
+    listening = asyncio.create_task(api.listen())
+    await asyncio.sleep(0.01)
+    await ws.close()
+    await listening
+
+    registers = [command for command in ws.sent if command["CMD"] == "REALTIME"]
+    assert [command["PAYLOAD"]["TYPES"] for command in registers] == [["STATUS_ZONES"]]
+    assert received == [[{"ID": "1"}]]
+
+
+@pytest.mark.asyncio
+async def test_failing_listeners_do_not_stop_listen(lares4_config, fake_websocket, realtime_frame, caplog):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    received = []
+
+    def failing(changes):
+        raise RuntimeError("sync boom")
+
+    async def failing_async(changes):
+        raise RuntimeError("async boom")
+
+    await api.add_event_listener(EventType.ZONES, failing)
+    await api.add_event_listener(EventType.ZONES, failing_async)
+    await api.add_event_listener(EventType.ZONES, received.append)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1"}]))
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "2"}]))
+    await ws.close()
+    await api.listen()
+    await asyncio.gather(*api._listener_tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert received == [[{"ID": "1"}], [{"ID": "2"}]]
+    errors = [str(record.exc_info[1]) for record in caplog.records if record.exc_info]
+    assert sorted(errors) == ["async boom", "async boom", "sync boom", "sync boom"]
+    assert not api._listener_tasks
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_listener_tasks(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    started = asyncio.Event()
+
+    async def slow_listener(changes):
+        started.set()
+        await asyncio.sleep(60)
+
+    await api.add_event_listener(EventType.ZONES, slow_listener)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1"}]))
+    listening = asyncio.create_task(api.listen())
+    await started.wait()
+    tasks = list(api._listener_tasks)
+
+    await api.close()
+    await listening
+
+    assert tasks and all(task.cancelled() for task in tasks)
+    assert not api._listener_tasks
+
+
+@pytest.mark.asyncio
+async def test_listen_typed_and_async_listeners(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    typed = []
+    received = asyncio.Event()
+
+    async def slow_listener(changes):
+        await asyncio.sleep(0)
+        received.set()
+
+    await api.add_event_listener(EventType.OUTPUTS, typed.append, typed=True)
+    await api.add_event_listener(EventType.OUTPUTS, slow_listener)
+    ws.push(realtime_frame("abc", EventType.OUTPUTS, [{"ID": "2", "STA": "ON"}]))
+    await ws.close()
+    await api.listen()
+    await received.wait()
+
+    assert typed[0][0].id == 2
+    assert typed[0][0].status == "ON"
+
+
+@pytest.mark.asyncio
+async def test_listen_coalesces_bursts(lares4_config, fake_websocket, realtime_frame):
+    ws = fake_websocket()
+    api = Lares4API(lares4_config, coalesce_window=60)
+    api._attach(ws)
+    received = []
+
+    await api.add_event_listener(EventType.ZONES, received.append)
+    for status in ("R", "A", "R", "A"):
+        ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "1", "STA": status}]))
+    await ws.close()
+    await api.listen()
+
+    assert received == [[{"ID": "1", "STA": "A"}]]
+    assert api.coalescer.merged == 3
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_encode_command_serializes_once_with_valid_crc(name):
+    factory = CommandFactory("abc", "123456")
+    factory.set_login_id("7")
+
+    command, frame = factory.encode_command("READ", "MULTI_TYPES", {"ID_LOGIN": True, "DES": "Cucina è"}, get_codec(name))
+
+    assert verify_crc16(frame)
+    assert json.loads(frame) == command
+    assert command["PAYLOAD"]["ID_LOGIN"] == "7"
+
+
+def test_encode_command_matches_build_command():
+    command, frame = CommandFactory("abc", "1").encode_command("READ", "MULTI_TYPES", {}, get_codec("json"))
+
+    assert frame == json.dumps(command).encode("utf-8")
+    assert command["CRC_16"] == crc16(frame.decode("utf-8"))
+
+
+def test_get_codec_unknown():
+    with pytest.raises(ValueError):
+        get_codec("yaml")
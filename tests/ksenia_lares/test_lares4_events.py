@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from ksenia_lares.lares4_events import Coalescer, EventQueue, OverflowPolicy
+
+
+def changes(*entries):
+    return {"CMD": "REALTIME", "PAYLOAD_TYPE": "CHANGES", "PAYLOAD": {"abc": {"STATUS_ZONES": list(entries)}}}
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_when_full():
+    queue = EventQueue(maxsize=2)
+    for index in range(3):
+        queue.put_nowait(changes({"ID": str(index)}))
+
+    assert queue.dropped == 1
+    assert (await queue.get())["PAYLOAD"]["abc"]["STATUS_ZONES"] == [{"ID": "1"}]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_changes_of_same_id():
+    queue = EventQueue(maxsize=1, overflow=OverflowPolicy.COALESCE)
+    queue.put_nowait(changes({"ID": "1", "STA": "R", "A": "N"}))
+    queue.put_nowait(changes({"ID": "1", "STA": "A"}))
+
+    assert len(queue) == 1
+    assert queue.coalesced == 1
+    assert queue.dropped == 0
+    assert (await queue.get())["PAYLOAD"]["abc"]["STATUS_ZONES"] == [{"ID": "1", "STA": "A", "A": "N"}]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_new_ids():
+    queue = EventQueue(maxsize=1, overflow=OverflowPolicy.COALESCE)
+    queue.put_nowait(changes({"ID": "1", "STA": "R"}))
+    queue.put_nowait(changes({"ID": "1", "STA": "A"}, {"ID": "2", "STA": "A"}))
+
+    assert len(queue) == 1
+    assert queue.dropped == 0
+    assert (await queue.get())["PAYLOAD"]["abc"]["STATUS_ZONES"] == [{"ID": "1", "STA": "A"}, {"ID": "2", "STA": "A"}]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_drops_frames_without_merged_state():
+    queue = EventQueue(maxsize=2, overflow=OverflowPolicy.COALESCE)
+    queue.put_nowait(changes({"ID": "1", "STA": "R"}))
+    queue.put_nowait(changes({"ID": "2", "STA": "R"}))
+    queue.put_nowait(changes({"ID": "1", "STA": "A"}, {"ID": "3", "STA": "A"}))
+
+    assert queue.dropped == 1
+    assert (await queue.get())["PAYLOAD"]["abc"]["STATUS_ZONES"] == [{"ID": "1", "STA": "A"}]
+    assert (await queue.get())["PAYLOAD"]["abc"]["STATUS_ZONES"] == [{"ID": "3", "STA": "A"}]
+
+
+@pytest.mark.asyncio
+async def test_end_of_stream_is_never_dropped():
+    queue = EventQueue(maxsize=1)
+    queue.put_nowait(changes({"ID": "1"}))
+    queue.put_nowait(None)
+
+    assert (await queue.get()) is not None
+    assert (await queue.get()) is None
+
+
+@pytest.mark.asyncio
+async def test_coalescer_delivers_latest_state_per_entity():
+    delivered = []
+    coalescer = Coalescer(0.01, delivered.append)
+
+    coalescer.add({"STATUS_ZONES": [{"ID": "1", "STA": "R", "A": "N"}, {"ID": "2", "STA": "R"}]})
+    coalescer.add({"STATUS_ZONES": [{"ID": "1", "STA": "A"}], "STATUS_OUTPUTS": [{"ID": "1", "STA": "ON"}]})
+    coalescer.add({"STATUS_ZONES": [{"ID": "1", "A": "Y"}]})
+    assert delivered == []
+
+    await asyncio.sleep(0.02)
+
+    assert delivered == [
+        {
+            "STATUS_ZONES": [{"ID": "1", "STA": "A", "A": "Y"}, {"ID": "2", "STA": "R"}],
+            "STATUS_OUTPUTS": [{"ID": "1", "STA": "ON"}],
+        }
+    ]
+    assert coalescer.merged == 2
+    assert coalescer.delivered == 3
+
+
+@pytest.mark.asyncio
+async def test_coalescer_flush():
+    delivered = []
+    coalescer = Coalescer(60, delivered.append)
+
+    coalescer.add({"STATUS_ZONES": [{"ID": "1"}]})
+    coalescer.flush()
+    coalescer.flush()
+
+    assert delivered == [{"STATUS_ZONES": [{"ID": "1"}]}]
@@ -0,0 +1,86 @@
+import ssl
+
+import pytest
+from ksenia_lares.lares4_fleet import Lares4Fleet
+from ksenia_lares.types_lares4 import EventType
+
+
+class FakeSession:
+    def __init__(self, websockets):
+        self.closed = False
+        self.websockets = websockets
+        self.contexts = {}
+
+    async def ws_connect(self, url, **kwargs):
+        self.contexts[url] = kwargs.get("ssl_context")
+        return self.websockets[url]
+
+    async def close(self):
+        self.closed = True
+
+
+def responder(command):
+    if command["CMD"] == "LOGIN":
+        return {"RESULT": "OK", "ID_LOGIN": "1"}
+    return {"RESULT": "OK"}
+
+
+@pytest.mark.asyncio
+async def test_fleet_connects_panels_and_merges_events(fake_websocket, realtime_frame):
+    websockets = {
+        "wss://10.0.0.1/KseniaWsock": fake_websocket(responder),
+        "wss://10.0.0.2/KseniaWsock": fake_websocket(responder),
+    }
+    fleet = Lares4Fleet(max_concurrency=1)
+    first = fleet.add({"url": "10.0.0.1", "pin": "1", "sender": "abc"})
+    second = fleet.add({"url": "10.0.0.2", "pin": "1", "sender": "abc"})
+    fleet.session = session = FakeSession(websockets)
+
+    failures = await fleet.connect(events=[EventType.ZONES])
+
+    assert failures == []
+    assert first.session is second.session is session
+
+    websockets["wss://10.0.0.2/KseniaWsock"].push(realtime_frame("abc", EventType.ZONES, [{"ID": "3"}]))
+    event = await fleet.events().__anext__()
+
+    assert event.panel is second
+    assert event.event == EventType.ZONES
+    assert event.changes == [{"ID": "3"}]
+
+    await fleet.close()
+    assert session.closed
+    assert not first.is_running
+
+
+@pytest.mark.asyncio
+async def test_fleet_reports_failed_panels(fake_websocket):
+    websockets = {"wss://10.0.0.1/KseniaWsock": fake_websocket(lambda command: {"RESULT": "FAIL"})}
+    fleet = Lares4Fleet()
+    panel = fleet.add({"url": "10.0.0.1", "pin": "1", "sender": "abc"})
+    fleet.session = FakeSession(websockets)
+
+    failures = await fleet.connect()
+
+    assert [failed for failed, _ in failures] == [panel]
+    await fleet.close()
+
+
+@pytest.mark.asyncio
+async def test_fleet_keeps_ssl_settings_of_each_panel(fake_websocket):
+    websockets = {
+        "wss://10.0.0.1/KseniaWsock": fake_websocket(responder),
+        "wss://10.0.0.2/KseniaWsock": fake_websocket(responder),
+    }
+    fleet = Lares4Fleet()
+    fleet.add({"url": "10.0.0.1", "pin": "1", "sender": "abc", "verify_ssl": True})
+    fleet.add({"url": "10.0.0.2", "pin": "1", "sender": "abc"})
+    fleet.session = session = FakeSession(websockets)
+
+    assert await fleet.connect() == []
+
+    verified = session.contexts["wss://10.0.0.1/KseniaWsock"]
+    assert verified.verify_mode == ssl.CERT_REQUIRED
+    assert verified.check_hostname
+    assert session.contexts["wss://10.0.0.2/KseniaWsock"].verify_mode == ssl.CERT_NONE
+    await fleet.close()
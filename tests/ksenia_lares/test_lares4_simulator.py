@@ -0,0 +1,115 @@
+import asyncio
+import os
+import ssl
+
+import pytest
+
+from ksenia_lares.lares4_api import Lares4API, get_ssl_context
+from ksenia_lares.lares4_simulator import Lares4Simulator, SimulatedPanel
+from ksenia_lares.types_lares4 import EventType, ReadType, ZoneStatus
+
+CERTIFICATE = os.path.join(os.path.dirname(__file__), "panel.pem")
+
+
+@pytest.fixture
+async def simulator():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(CERTIFICATE)
+    async with Lares4Simulator(SimulatedPanel(zones=48, outputs=8, seed=1), port=0, ssl_context=context) as simulator:
+        yield simulator
+
+
+async def connect(simulator, pin="123456", sender="abc"):
+    api = Lares4API({"url": f"127.0.0.1:{simulator.port}", "pin": pin, "sender": sender}, verify_crc=True)
+    await api.connect(ssl_context=get_ssl_context())
+    return api
+
+
+async def test_login_and_snapshot(simulator):
+    api = await connect(simulator)
+    await api.login()
+
+    snapshot = await api.snapshot([ReadType.STATUS_ZONES, ReadType.STATUS_OUTPUTS, ReadType.STATUS_SYSTEMS])
+
+    assert len(snapshot.zones) == 48
+    assert snapshot.zones[0].status == ZoneStatus.READY
+    assert len(snapshot.outputs_status) == 8
+    assert snapshot.outputs_status[3].position == 0
+    assert len(snapshot.systems_status) == 1
+    await api.close()
+
+
+async def test_wrong_pin_is_refused(simulator):
+    api = await connect(simulator, pin="000000")
+
+    response = await api.command("LOGIN", "UNKNOWN", {"PIN": True})
+
+    assert response["PAYLOAD"]["RESULT"] == "FAIL"
+    with pytest.raises(Exception):
+        await api.read([ReadType.STATUS_ZONES])
+    await api.close()
+
+
+async def test_commands_push_changes(simulator):
+    api = await connect(simulator)
+    await api.login()
+    received = asyncio.Queue()
+    await api.add_event_listener(EventType.OUTPUTS, received.put_nowait, typed=True)
+    listening = asyncio.create_task(api.listen())
+
+    assert await api.setOutput(2, "ON")
+    changes = await asyncio.wait_for(received.get(), 1)
+
+    assert [(output.id, output.status) for output in changes] == [(2, "ON")]
+    assert simulator.panel.state["STATUS_OUTPUTS"][1]["STA"] == "ON"
+    await api.close()
+    await listening
+
+
+async def test_typed_listeners_receive_partial_changes_merged(simulator):
+    api = await connect(simulator)
+    await api.login()
+    received = asyncio.Queue()
+    await api.add_event_listener(EventType.ZONES, received.put_nowait, typed=True)
+    listening = asyncio.create_task(api.listen())
+
+    await simulator.push({ReadType.STATUS_ZONES.value: [simulator.panel.apply("STATUS_ZONES", {"ID": "3", "STA": "A"})]})
+    changes = await asyncio.wait_for(received.get(), 1)
+
+    assert [(zone.id, zone.status, zone.label) for zone in changes] == [(3, ZoneStatus.ARMED, "Zone 3")]
+    await api.close()
+    await listening
+
+
+async def test_random_events_reach_many_clients(simulator):
+    clients = await asyncio.gather(*(connect(simulator, sender=f"client{i}") for i in range(20)))
+    received = []
+    for api in clients:
+        await api.login()
+        await api.add_event_listener(EventType.ZONES, received.append)
+    listening = [asyncio.create_task(api.listen()) for api in clients]
+
+    await simulator.push(simulator.panel.random_changes(10))
+    await asyncio.sleep(0.1)
+
+    assert len(received) == 20
+    await asyncio.gather(*(api.close() for api in clients))
+    await asyncio.gather(*listening)
+
+
+async def test_event_rate(simulator):
+    simulator.event_rate = 200
+    simulator.panel.state["STATUS_OUTPUTS"] = []
+    api = await connect(simulator)
+    await api.login()
+    received = []
+    await api.add_event_listener(EventType.ZONES, received.append)
+    listening = asyncio.create_task(api.listen())
+    generator = asyncio.create_task(simulator._generate())
+
+    await asyncio.sleep(0.2)
+    generator.cancel()
+
+    assert 10 <= len(received) <= 60
+    await api.close()
+    await listening
@@ -0,0 +1,82 @@
+import pytest
+from ksenia_lares.lares4_api import Lares4API
+from ksenia_lares.lares4_state import Lares4State
+from ksenia_lares.types_lares4 import EventType, ZoneStatus
+
+
+def zone(id, status="R"):
+    return {"ID": str(id), "STA": status, "BYP": "NO", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": ""}
+
+
+@pytest.fixture
+def seed_payload():
+    return {
+        "RESULT": "OK",
+        "STATUS_ZONES": [zone(1), zone(2)],
+        "STATUS_OUTPUTS": [{"ID": "1", "STA": "OFF"}],
+    }
+
+
+def test_seed_and_lookup(seed_payload):
+    state = Lares4State()
+    state.seed(seed_payload)
+
+    assert state.version == 1
+    assert state.get(EventType.ZONES, 2).status == ZoneStatus.READY
+    assert state.get(EventType.OUTPUTS, 1).status == "OFF"
+    assert state.get(EventType.ZONES, 3) is None
+    assert [item.id for item in state.get_all(EventType.ZONES)] == [1, 2]
+
+
+def test_apply_merges_changes(seed_payload):
+    state = Lares4State()
+    state.seed(seed_payload)
+    before = state.get(EventType.ZONES, 1)
+
+    state.apply(EventType.ZONES, [{"ID": "1", "STA": "A"}])
+
+    assert state.version == 2
+    assert before.status == ZoneStatus.READY
+    assert state.get(EventType.ZONES, 1).status == ZoneStatus.ARMED
+    assert state.get_raw(EventType.ZONES, 1)["LBL"] == ""
+
+
+def test_partial_change_of_unseen_entry(seed_payload):
+    state = Lares4State()
+    state.seed(seed_payload)
+
+    state.apply(EventType.ZONES, [{"ID": "3", "STA": "A"}])
+
+    assert state.get(EventType.ZONES, 3) is None
+    assert state.get_raw(EventType.ZONES, 3) == {"ID": "3", "STA": "A"}
+    assert [item.id for item in state.get_all(EventType.ZONES)] == [1, 2]
+
+
+def test_apply_ignores_untracked_events(seed_payload):
+    state = Lares4State(events=[EventType.ZONES])
+    state.seed(seed_payload)
+
+    state.apply(EventType.OUTPUTS, [{"ID": "1", "STA": "ON"}])
+
+    assert state.version == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_seeds_and_follows_changes(lares4_config, fake_websocket, realtime_frame, seed_payload):
+    def responder(command):
+        if command["CMD"] == "READ":
+            return seed_payload
+        return {"RESULT": "OK"}
+
+    ws = fake_websocket(responder)
+    api = Lares4API(lares4_config)
+    api._attach(ws)
+    state = Lares4State(events=[EventType.ZONES, EventType.OUTPUTS])
+
+    await state.sync(api)
+    ws.push(realtime_frame("abc", EventType.ZONES, [{"ID": "2", "STA": "A"}]))
+    await ws.close()
+    await api.listen()
+
+    assert state.get(EventType.ZONES, 2).status == ZoneStatus.ARMED
+    assert state.version == 2
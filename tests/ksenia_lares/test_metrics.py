@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from ksenia_lares import IpAPI
+from ksenia_lares.ip_simulator import IpSimulator, SimulatedIpPanel
+from ksenia_lares.lares4_api import Lares4API
+from ksenia_lares.metrics import Histogram, InMemoryMetrics, PrometheusMetrics
+from ksenia_lares.types_ip import ZoneBypass
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+
+
+async def test_lares4_command_metrics(lares4_config, fake_websocket):
+    metrics = InMemoryMetrics()
+    api = Lares4API(lares4_config, metrics=metrics, timeout=0.05)
+    api._attach(fake_websocket(lambda command: {"RESULT": "OK"} if command["CMD"] == "READ" else None))
+
+    await api.command("READ", "MULTI_TYPES", {"ID_LOGIN": True, "TYPES": []})
+    with pytest.raises(asyncio.TimeoutError):
+        await api.command("LOGOUT", "USER", {"ID_LOGIN": True})
+
+    assert metrics.request_seconds["192.168.1.2", "READ"].count == 1
+    assert metrics.parse_seconds["192.168.1.2", "READ"].count == 1
+    assert metrics.bytes_sent["192.168.1.2", "READ"] > 0
+    assert metrics.bytes_received["192.168.1.2", "READ"] > 0
+    assert metrics.errors["192.168.1.2", "LOGOUT", "timeout"] == 1
+    assert metrics.in_flight["192.168.1.2", "READ"] == 0
+    await api.close()
+
+
+async def test_ip_metrics():
+    metrics = InMemoryMetrics()
+
+    async with IpSimulator([SimulatedIpPanel("16IP")], port=0) as simulator:
+        config = simulator.configs(model="16IP")[0]
+        panel = f"127.0.0.1:{config['port']}"
+        async with IpAPI(config, metrics=metrics) as api:
+            await api.get_zones()
+            await api.bypass_zone(0, "123456", ZoneBypass.ON)
+        async with IpAPI({**config, "password": "wrong"}, metrics=metrics) as api:
+            with pytest.raises(Exception):
+                await api.get_partitions()
+
+    assert metrics.request_seconds[panel, "zones/zonesStatus16IP.xml"].count == 1
+    assert metrics.bytes_received[panel, "zones/zonesDescription16IP.xml"] > 0
+    assert metrics.request_seconds[panel, "cmd/cmdOk.xml"].count == 1
+    assert metrics.errors[panel, "partitions/partitionsStatus16IP.xml", "http_401"] == 1
+
+    rendered = metrics.render()
+    assert f'ksenia_lares_request_seconds_count{{panel="{panel}",endpoint="zones/zonesStatus16IP.xml"}} 1' in rendered
+    assert "123456" not in rendered
+
+
+def test_prometheus_adapter():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    metrics = PrometheusMetrics(registry)
+
+    metrics.request_started("panel", "READ")
+    metrics.request_finished("panel", "READ", 0.2, "timeout")
+
+    labels = {"panel": "panel", "endpoint": "READ"}
+    assert registry.get_sample_value("ksenia_lares_request_seconds_count", labels) == 1
+    assert registry.get_sample_value("ksenia_lares_errors_total", {**labels, "error": "timeout"}) == 1
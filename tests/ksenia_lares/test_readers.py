@@ -0,0 +1,77 @@
+import pytest
+from ksenia_lares import readers
+from ksenia_lares.lares4_api import Lares4API
+from ksenia_lares.readers import get_reader, read_raw, read_systems_status, read_zones_status, register_reader
+from ksenia_lares.types_lares4 import EventType, ReadType, Zone
+
+
+def zones_payload():
+    return [
+        {"ID": "1", "STA": "R", "BYP": "NO", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": "Front" + " door"},
+        {"ID": "2", "STA": "A", "BYP": "YES", "T": "N", "A": "N", "OHM": "NA", "VAS": "F", "LBL": "Front" + " door"},
+    ]
+
+
+def test_zones_are_slotted_frozen_and_hashable():
+    first, second = read_zones_status(zones_payload())
+
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.label = "Back door"
+    assert first == read_zones_status(zones_payload())[0]
+    assert len({first, second, read_zones_status(zones_payload())[0]}) == 2
+
+
+def test_labels_are_interned():
+    first, _ = read_zones_status(zones_payload())
+    again, _ = read_zones_status(zones_payload())
+
+    assert first.label is again.label
+
+
+def test_systems_status_is_hashable():
+    payload = [
+        {
+            "ID": "1",
+            "INFO": ["OK"],
+            "TAMPER": [],
+            "TAMPER_MEM": [],
+            "ALARM": [],
+            "ALARM_MEM": [],
+            "FAULT": [],
+            "FAULT_MEM": [],
+            "ARM": {"D": "Disarmed", "S": "D"},
+            "TEMP": {"IN": "21.5", "OUT": "NA"},
+            "TIME": {"GMT": "1700000000", "TZ": "1", "TZM": "0", "DAWN": "07:10", "DUSK": "17:45"},
+        }
+    ]
+
+    system = read_systems_status(payload)[0]
+
+    assert system.informations == ("OK",)
+    assert system.temperature.outside is None
+    assert hash(system) == hash(read_systems_status(payload)[0])
+
+
+def test_every_type_has_a_reader():
+    assert all(get_reader(read_type) is not read_raw for read_type in ReadType)
+    assert get_reader(EventType.ZONES) is read_zones_status
+    assert get_reader("STATUS_UNKNOWN")([{"ID": "1"}]) == [{"ID": "1"}]
+
+
+def test_register_custom_reader(monkeypatch):
+    monkeypatch.setattr(readers, "READERS", dict(readers.READERS))
+    register_reader("STATUS_DOORS", lambda payload: [int(entry["ID"]) for entry in payload])
+
+    assert get_reader("STATUS_DOORS")([{"ID": "3"}]) == [3]
+
+
+@pytest.mark.parametrize("executor_threshold", [0, 1])
+async def test_get_parses_with_registered_readers(lares4_config, fake_websocket, executor_threshold):
+    api = Lares4API(lares4_config, executor_threshold=executor_threshold)
+    api._attach(fake_websocket(lambda command: {"RESULT": "OK", "STATUS_ZONES": zones_payload()}))
+
+    (zones,) = await api.get([ReadType.STATUS_ZONES])
+
+    assert all(isinstance(zone, Zone) for zone in zones)
+    await api.close()
@@ -0,0 +1,34 @@
+import logging
+
+from ksenia_lares.lares4_api import Lares4API
+from ksenia_lares.tracing import TraceBuffer, redact
+
+
+def test_redact():
+    assert redact('{"PAYLOAD": {"PIN": "123456"}, "CRC_16": "0x1234"}') == '{"PAYLOAD": {"PIN": "***"}, "CRC_16": "0x1234"}'
+    assert redact("cmd/cmdOk.xml?cmd=setMacro&macroId=1&pin=123456") == "cmd/cmdOk.xml?cmd=setMacro&macroId=1&pin=***"
+    assert redact("zones/zonesStatus128IP.xml") == "zones/zonesStatus128IP.xml"
+
+
+def test_trace_buffer_keeps_recent_frames():
+    trace = TraceBuffer(2)
+    for index in range(3):
+        trace.record("in", f'{{"ID": "{index}"}}')
+
+    assert [entry.frame for entry in trace.entries()] == ['{"ID": "1"}', '{"ID": "2"}']
+
+
+async def test_lares4_trace_and_logging(lares4_config, fake_websocket, capsys, caplog):
+    api = Lares4API(lares4_config, trace_size=10)
+    api._attach(fake_websocket(lambda command: {"RESULT": "OK", "ID_LOGIN": "42"}))
+
+    with caplog.at_level(logging.DEBUG, logger="ksenia_lares.lares4_api"):
+        await api.login()
+
+    sent, received = api.trace.entries()
+    assert (sent.direction, received.direction) == ("out", "in")
+    assert "123456" not in sent.frame and "***" in sent.frame
+    assert "LOGIN_RES" in received.frame
+    assert "123456" not in caplog.text and "***" in caplog.text
+    assert capsys.readouterr().out == ""
+    await api.close()